@@ -1,6 +1,6 @@
 # admin.py
 from django.contrib import admin
-from .models import Name, AppUser, UseCaseCategory, UseCaseTag, UseCase, ArchivedName, Subscription, PlanModel, AcquiredName, SavedName, ExtensionDropInfo, PublicInquiry, NewsLetter, IdeaOfTheDay, UploadedFile, TargetMarket
+from .models import Name, AppUser, UseCaseCategory, UseCaseTag, UseCase, ArchivedName, Subscription, PlanModel, AcquiredName, SavedName, ExtensionDropInfo, PublicInquiry, NewsLetter, IdeaOfTheDay, UploadedFile, TargetMarket, DailyDropStat, ApiUsage
 
 from django_celery_beat.admin import PeriodicTaskAdmin, CrontabScheduleAdmin
 from django_celery_beat.models import PeriodicTask, CrontabSchedule
@@ -193,6 +193,15 @@ class PlanModelAdmin(admin.ModelAdmin):
     
 
 
+@admin.register(ApiUsage)
+class ApiUsageAdmin(admin.ModelAdmin):
+    list_display = ('user', 'date', 'request_count', 'updated_at')
+    search_fields = ('user__clerk_id', 'user__email')
+    date_hierarchy = 'date'
+    readonly_fields = ('user', 'date', 'request_count', 'updated_at')
+    
+
+
 
 @admin.register(AcquiredName)
 class AcquiredNameAdmin(admin.ModelAdmin):
@@ -231,6 +240,14 @@ class ArchivedNameAdmin(admin.ModelAdmin):
 
 
 
+@admin.register(DailyDropStat)
+class DailyDropStatAdmin(admin.ModelAdmin):
+    list_display = ('drop_date', 'extension', 'domain_list', 'status', 'name_count', 'updated_at')
+    list_filter = ('extension', 'domain_list', 'status')
+    date_hierarchy = 'drop_date'
+
+
+
 @admin.register(NewsLetter)
 class NewsLetterAdmin(admin.ModelAdmin):
     list_display = ('email', 'created_at')
@@ -7,3 +7,5 @@ class ApiConfig(AppConfig):
     def ready(self):
         # import signals (after patching)
         import api.signals
+        # register custom lookups (field__any)
+        import api.lookups
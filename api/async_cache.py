@@ -0,0 +1,62 @@
+import asyncio
+import weakref
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.cache import cache
+
+
+#===================================
+# Async Redis cache access (ASGI views)
+#====================================
+# django_redis only has a blocking client; calling it from an async view would stall the event
+# loop for every round trip. These helpers talk to the same Redis database through redis.asyncio
+# and read/write exactly what django_redis does:
+#   - keys are built with cache.make_key() (same KEY_PREFIX / version scheme)
+#   - values are encoded/decoded by django_redis' own client (plain ints raw, everything else pickled)
+# so sync and async code share cache entries (data versions, search pages, ...).
+#
+# redis.asyncio connections belong to the event loop that opened them, so there is one client
+# per running loop (uvicorn runs one loop per worker process).
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+        _clients[loop] = client
+    return client
+
+
+def _codec():
+    # django_redis' client: encode()/decode() are pure functions, no I/O
+    return cache.client
+
+
+async def get(key, default=None, version=None):
+    value = await get_client().get(cache.make_key(key, version=version))
+    return default if value is None else _codec().decode(value)
+
+
+async def get_many(keys, version=None):
+    """{key: value} for the keys that exist, like cache.get_many()."""
+    if not keys:
+        return {}
+    values = await get_client().mget([cache.make_key(key, version=version) for key in keys])
+    codec = _codec()
+    return {key: codec.decode(value) for key, value in zip(keys, values) if value is not None}
+
+
+async def set(key, value, timeout=None, version=None):
+    """timeout in seconds; None keeps the key forever."""
+    await get_client().set(cache.make_key(key, version=version), _codec().encode(value), ex=timeout)
+
+
+async def add(key, value, timeout=None, version=None):
+    """Set only if the key doesn't exist yet; True if it was set."""
+    return bool(await get_client().set(
+        cache.make_key(key, version=version), _codec().encode(value), ex=timeout, nx=True
+    ))
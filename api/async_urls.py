@@ -0,0 +1,27 @@
+from django.urls import path
+
+from . import async_views, views
+from .urls import urlpatterns as sync_urlpatterns
+
+
+# URLconf of the ASGI deployment (see nametrackerapi/asgi_urls.py): built from api/urls.py, with
+# the hot read endpoints' views swapped for their async versions. Same paths, names and order, so
+# e.g. names/export still matches before names/<slug>, and a route added to api/urls.py shows up
+# here too (api/tests.py checks the two stay aligned).
+ASYNC_VIEWS = {
+    views.NameDetailAPIView: async_views.AsyncNameDetailView,
+    views.TopRatedNamesAPIView: async_views.AsyncTopRatedNamesView,
+    views.DailyDropAPIView: async_views.AsyncDailyDropView,
+    views.NameSearchView: async_views.AsyncNameSearchView,
+    views.IdeaOfTheDayView: async_views.AsyncIdeaOfTheDayView,
+}
+
+
+def _async_pattern(pattern):
+    view_class = getattr(pattern.callback, "view_class", None)
+    if view_class not in ASYNC_VIEWS:
+        return pattern
+    return path(str(pattern.pattern), ASYNC_VIEWS[view_class].as_view(), name=pattern.name)
+
+
+urlpatterns = [_async_pattern(pattern) for pattern in sync_urlpatterns]
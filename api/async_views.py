@@ -0,0 +1,197 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from .conditional import async_data_version_condition
+from .fieldsets import NameFieldsetMixin
+from .models import Name
+from .pagination import StandardResultsSetPagination
+from .renderers import dumps
+from .search import normalize_query, name_search_queryset, aget_cached_search_page, cache_search_page
+from .serializers import DashboardNameValuesSerializer, NameSearchValuesSerializer, NameSerializer, IdeaOfTheDaySerializer
+from .views import (
+    TopRatedNamesAPIView, DailyDropAPIView, IdeaOfTheDayView,
+    _dashboard_versions, _idea_of_the_day_versions,
+)
+
+
+#===================================
+# Async (ASGI) versions of the hot read endpoints
+#====================================
+# Served only by the ASGI deployment (nametrackerapi/asgi.py -> nametrackerapi/asgi_urls.py), on
+# the same paths and with the same params, payloads, errors and ETag/304 handling as the DRF views:
+#   /api/dashboard/top-rated-names, /api/dashboard/daily-drop, /api/ideas/idea-of-the-day,
+#   /api/names/<slug>, /api/search/names
+#
+# The point is requests per worker: while a request waits on Postgres or Redis the event loop
+# serves others, instead of a gunicorn thread sitting blocked.
+#   - Redis (data versions for 304s, search page cache): redis.asyncio via api/async_cache.py
+#   - Postgres: Django's async ORM (aget/afirst/async for). Django still runs each query on a
+#     thread under the hood, but only for the query itself
+#   - Blocking leftovers run in sync_to_async: Clerk token verification + AppUser sync, nested
+#     DRF serializers that may follow relations, and a search cache miss (count + page queries)
+# Query building is shared with the sync views, so the two can't drift apart.
+
+
+class AsyncAPIView(View):
+    """
+    Small async counterpart of APIView for read-only JSON endpoints:
+    - authenticates with the DRF authentication classes and requires a user (IsAuthenticated default)
+    - maps DRF exceptions and Http404 to the same JSON error responses DRF sends
+    - self.request is a DRF Request, so query_params and the existing helpers work unchanged
+    Views return self.json_response(data) (orjson, same encoding as api/renderers.py).
+    """
+    http_method_names = ["get", "head", "options"]
+    replica_reads = True  # See api/db_routers.py
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            # Resolving .user verifies the token and syncs the AppUser (blocking: JWKS fetch + ORM)
+            user = await sync_to_async(lambda: self.request.user)()
+            if not user.is_authenticated:
+                raise NotAuthenticated()
+            response = await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404, PermissionDenied) as exc:
+            response = self.handle_exception(exc)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            # Like APIView: ClerkJWTAuthentication sends no WWW-Authenticate header, so 401 becomes 403
+            exc.status_code = 403
+        response = exception_handler(exc, {"view": self, "args": self.args, "kwargs": self.kwargs, "request": self.request})
+        return self.json_response(response.data, status=response.status_code)
+
+    @staticmethod
+    def json_response(data, status=200):
+        return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+
+
+#===================================
+# Dashboard
+#====================================
+async def _dashboard_payload(today_qs, yesterday_qs):
+    serializer = DashboardNameValuesSerializer()
+    today_rows = [row async for row in serializer.rows(today_qs)]
+    yesterday_rows = [row async for row in serializer.rows(yesterday_qs)]
+    return {
+        "pending_delete": serializer.to_representation(today_rows),
+        "deleted": serializer.to_representation(yesterday_rows),
+    }
+
+
+@method_decorator(async_data_version_condition(_dashboard_versions), name='get')
+class AsyncTopRatedNamesView(AsyncAPIView):
+    """Async TopRatedNamesAPIView."""
+
+    async def get(self, request, *args, **kwargs):
+        today_qs, yesterday_qs = TopRatedNamesAPIView.day_querysets(self.request.query_params)
+        return self.json_response(await _dashboard_payload(today_qs, yesterday_qs))
+
+
+@method_decorator(async_data_version_condition(_dashboard_versions), name='get')
+class AsyncDailyDropView(AsyncAPIView):
+    """Async DailyDropAPIView."""
+
+    async def get(self, request, *args, **kwargs):
+        today_qs, yesterday_qs = DailyDropAPIView.day_querysets(self.request.query_params)
+        return self.json_response(await _dashboard_payload(today_qs, yesterday_qs))
+
+
+
+
+#===================================
+# Idea of the day
+#====================================
+@method_decorator(async_data_version_condition(_idea_of_the_day_versions), name='get')
+class AsyncIdeaOfTheDayView(AsyncAPIView):
+    """Async IdeaOfTheDayView."""
+
+    async def get(self, request):
+        date_str = self.request.query_params.get("date")
+        if date_str:
+            try:
+                drop_date = timezone.datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                return self.json_response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
+        else:
+            drop_date = timezone.now().date()
+
+        today_qs, yesterday_qs = IdeaOfTheDayView.entry_querysets(drop_date)
+        today_obj = await today_qs.afirst()
+        yesterday_obj = await yesterday_qs.afirst()
+
+        # The nested use case serializer reads tags/markets/domain status from the database
+        return self.json_response(await sync_to_async(self.serialize)(drop_date, today_obj, yesterday_obj))
+
+    def serialize(self, drop_date, today_obj, yesterday_obj):
+        return {
+            "date": drop_date,
+            "pending_delete": IdeaOfTheDaySerializer(today_obj).data if today_obj else None,
+            "deleted": IdeaOfTheDaySerializer(yesterday_obj).data if yesterday_obj else None,
+        }
+
+
+
+
+#===================================
+# Name detail
+#====================================
+class AsyncNameDetailView(NameFieldsetMixin, AsyncAPIView):
+    """Async NameDetailAPIView (same ?fields= / ?expand= params)."""
+
+    async def get(self, request, slug):
+        queryset = self.apply_fieldset(Name.objects.all())
+        try:
+            # Prefetches requested by the fieldset run inside aget()
+            name = await queryset.aget(domain_name=slug)
+        except Name.DoesNotExist:
+            raise Http404("No Name matches the given query.")  # Same message as get_object_or_404
+        return self.json_response(await sync_to_async(self.serialize)(name))
+
+    def serialize(self, name):
+        return NameSerializer(name, context={'request': self.request, 'fields': self.get_requested_fields()}).data
+
+
+
+
+#===================================
+# Name search
+#====================================
+class AsyncNameSearchView(AsyncAPIView):
+    """Async NameSearchView. Cached pages are served without leaving the event loop."""
+
+    async def get(self, request):
+        query = normalize_query(self.request.query_params.get("q", ""))
+
+        if not query:
+            return self.json_response({"results": []})
+
+        paginator = StandardResultsSetPagination()
+
+        cached_response = await aget_cached_search_page("names", query, self.request, paginator)
+        if cached_response is not None:
+            return self.json_response(cached_response.data)
+
+        return self.json_response(await sync_to_async(self.search_page)(query, paginator))
+
+    def search_page(self, query, paginator):
+        # Cache miss: count + page queries through the paginator, exactly like NameSearchView
+        serializer = NameSearchValuesSerializer()
+        page = paginator.paginate_queryset(serializer.rows(name_search_queryset(query)), self.request, view=self)
+        results = serializer.to_representation(page)
+        cache_search_page("names", query, self.request, paginator, results)
+        return paginator.get_paginated_response(results).data
@@ -1,18 +1,151 @@
+import hashlib
+import threading
+import time
+
 import jwt
-from jwt import PyJWKClient
+from jwt import PyJWKSet, PyJWKClientError
 from django.conf import settings
-from django.core.cache import caches
+from django.core.cache import cache, caches
+from django.db import DEFAULT_DB_ALIAS, transaction
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import AppUser
+from .tasks import backfill_clerk_created_at_task
 import logging
 
-from django.utils.dateparse import parse_datetime
 import requests
 
 logger = logging.getLogger(__name__)
 
 
+#===================================
+# Process-wide JWKS + verified token caches
+#====================================
+# DRF builds a new authenticator per request, so anything cached on the instance is lost after
+# one request. Both caches below live at module level instead (one per process, thread-safe):
+#
+#   - ClerkJWKS: Clerk's signing keys by kid. The key set is shared through Redis, so one
+#     fetch serves every process. A token whose kid is unknown (key rotation) triggers a refresh:
+#     first from Redis (another process may have the new set already), then from Clerk.
+#   - VerifiedTokens: claims of tokens that passed full verification, keyed by the token's
+#     SHA-256, until the token expires or CLERK_TOKEN_CACHE_TTL passes (whichever is first).
+#     Repeat requests with the same session token skip the RS256 check: one hash + dict lookup.
+
+JWKS_CACHE_KEY = "clerk_jwks"
+
+
+class ClerkJWKS:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}          # kid -> key usable by jwt.decode
+        self._loaded_at = 0.0    # monotonic
+        self._fetched_at = None  # monotonic time of the last request to Clerk
+
+    def signing_key(self, kid):
+        if time.monotonic() - self._loaded_at < settings.CLERK_JWKS_CACHE_TTL:
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            key = self._keys.get(kid)
+            if key is None or time.monotonic() - self._loaded_at >= settings.CLERK_JWKS_CACHE_TTL:
+                self._refresh(kid)
+                key = self._keys.get(kid)
+        if key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def _refresh(self, kid):
+        jwks = cache.get(JWKS_CACHE_KEY)
+        if jwks is None or kid not in self._kids(jwks):
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at < settings.CLERK_JWKS_MIN_REFETCH_INTERVAL:
+                if jwks is None:
+                    return  # Keep what we have; a real rotation is picked up after the interval
+            else:
+                self._fetched_at = time.monotonic()
+                response = requests.get(settings.CLERK_JWKS_URL, timeout=10)
+                response.raise_for_status()
+                jwks = response.json()
+                cache.set(JWKS_CACHE_KEY, jwks, settings.CLERK_JWKS_CACHE_TTL)
+        self._keys = {key.key_id: key.key for key in PyJWKSet.from_dict(jwks).keys}
+        self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _kids(jwks):
+        return {key.get("kid") for key in jwks.get("keys", [])}
+
+
+class VerifiedTokens:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # sha256(token) -> (claims, valid_until epoch seconds); insertion ordered
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token):
+        entry = self._entries.get(self._digest(token))
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def add(self, token, claims):
+        valid_until = min(time.time() + settings.CLERK_TOKEN_CACHE_TTL, claims.get("exp", 0))
+        if valid_until <= time.time():
+            return
+        with self._lock:
+            now = time.time()
+            if len(self._entries) >= settings.CLERK_TOKEN_CACHE_MAX_ENTRIES:
+                # Drop expired entries first, then the oldest ones
+                self._entries = {digest: entry for digest, entry in self._entries.items() if entry[1] > now}
+                while len(self._entries) >= settings.CLERK_TOKEN_CACHE_MAX_ENTRIES:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[self._digest(token)] = (claims, valid_until)
+
+
+clerk_jwks = ClerkJWKS()
+verified_tokens = VerifiedTokens()
+
+
+
+
+#===================================
+# Authenticated user cache
+#====================================
+# Steady state: one Redis read per request - no lock, no query, no write. The entry holds the
+# AppUser row plus a fingerprint of the claims (email, name) it was synced from. The full sync
+# (lock + get_or_create + profile update) only runs for new users, when the claims changed, or
+# once the entry expired. Any AppUser save/delete drops the entry (api/signals.py).
+
+APP_USER_CACHE_KEY = "app_user:{clerk_id}"
+_APP_USER_FIELDS = tuple(field.attname for field in AppUser._meta.concrete_fields)
+
+
+def claims_fingerprint(email, full_name):
+    return hashlib.sha1(f"{email}\x00{full_name}".encode("utf-8")).hexdigest()
+
+
+def get_cached_user(clerk_id, fingerprint):
+    """The cached AppUser, or None if missing or synced from different claims."""
+    entry = cache.get(APP_USER_CACHE_KEY.format(clerk_id=clerk_id))
+    if entry is None or entry[0] != fingerprint:
+        return None
+    return AppUser.from_db(DEFAULT_DB_ALIAS, _APP_USER_FIELDS, entry[1])
+
+
+def cache_user(user, fingerprint):
+    values = tuple(getattr(user, attname) for attname in _APP_USER_FIELDS)
+    cache.set(APP_USER_CACHE_KEY.format(clerk_id=user.pk), (fingerprint, values), settings.APP_USER_CACHE_TTL)
+
+
+def forget_user(clerk_id):
+    cache.delete(APP_USER_CACHE_KEY.format(clerk_id=clerk_id))
+
+
+
+
 class ClerkJWTAuthentication(BaseAuthentication):
     """
     Production-ready JWT Authentication for Clerk with:
@@ -22,13 +155,6 @@ class ClerkJWTAuthentication(BaseAuthentication):
     """
 
     def __init__(self):
-        # Initialize JWKS client with caching
-        self.jwks_client = PyJWKClient(
-            settings.CLERK_JWKS_URL,
-            cache_keys=True,
-            lifespan=3600,  # Cache keys for 1 hour
-            timeout=10
-        )
         # Use Django's default cache (can be Redis or LocMem)
         self.cache = caches['default']
 
@@ -49,29 +175,11 @@ class ClerkJWTAuthentication(BaseAuthentication):
             if not token:  # Additional check for empty token
                 return None
 
-            # Get the signing key from Clerk
-            signing_key = self.jwks_client.get_signing_key_from_jwt(token).key
-
-            # Build decoding arguments dynamically based on settings
-            decode_kwargs = {
-                "key": signing_key,
-                "algorithms": ["RS256"],
-                "issuer": settings.CLERK_ISSUER,
-                "options": {
-                    "verify_exp": True,
-                    "verify_iss": True,
-                    "verify_aud": False,  # Default to False
-                },
-                "leeway": 5 
-            }
-
-            # Only verify audience if explicitly configured
-            if settings.CLERK_AUDIENCE:
-                decode_kwargs["audience"] = settings.CLERK_AUDIENCE
-                decode_kwargs["options"]["verify_aud"] = True
-
-            # Decode and validate token
-            payload = jwt.decode(token, **decode_kwargs)
+            # Same token seen recently: its claims were already verified
+            payload = verified_tokens.get(token)
+            if payload is None:
+                payload = self.verify_token(token)
+                verified_tokens.add(token, payload)
 
             # Sync and return user
             user = self.get_user(payload)
@@ -91,6 +199,33 @@ class ClerkJWTAuthentication(BaseAuthentication):
             raise AuthenticationFailed("Authentication failed")
 
 
+    def verify_token(self, token):
+        """Full RS256 verification against Clerk's signing keys; returns the claims."""
+        # Get the signing key from Clerk (process-wide JWKS cache)
+        signing_key = clerk_jwks.signing_key(jwt.get_unverified_header(token).get("kid"))
+
+        # Build decoding arguments dynamically based on settings
+        decode_kwargs = {
+            "key": signing_key,
+            "algorithms": ["RS256"],
+            "issuer": settings.CLERK_ISSUER,
+            "options": {
+                "verify_exp": True,
+                "verify_iss": True,
+                "verify_aud": False,  # Default to False
+            },
+            "leeway": 5 
+        }
+
+        # Only verify audience if explicitly configured
+        if settings.CLERK_AUDIENCE:
+            decode_kwargs["audience"] = settings.CLERK_AUDIENCE
+            decode_kwargs["options"]["verify_aud"] = True
+
+        # Decode and validate token
+        return jwt.decode(token, **decode_kwargs)
+
+
 
     def get_user(self, payload):
         """
@@ -101,19 +236,30 @@ class ClerkJWTAuthentication(BaseAuthentication):
         email = payload.get('email', f"{clerk_id}@temp.clerk")
         full_name = payload.get('name', '')
 
-        return self._get_or_create_user(clerk_id, email, full_name)
+        # Steady state: served from the user cache
+        fingerprint = claims_fingerprint(email, full_name)
+        user = get_cached_user(clerk_id, fingerprint)
+        if user is None:
+            user = self._get_or_create_user(clerk_id, email, full_name, fingerprint)
+        return user
 
 
 
 
     
-    def _get_or_create_user(self, clerk_id, email, full_name):
+    def _get_or_create_user(self, clerk_id, email, full_name, fingerprint):
         """
         Thread-safe user sync. Uses cache locking if supported.
+        Only runs on a user cache miss (new user, changed claims, expired entry).
         """
         cache_key = f"user_sync_{clerk_id}"
 
         def sync_user():
+            # A concurrent request may have synced while we waited for the lock
+            user = get_cached_user(clerk_id, fingerprint)
+            if user is not None:
+                return user
+
             user, created = AppUser.objects.get_or_create(
                 clerk_id=clerk_id,
                 defaults={'email': email, 'full_name': full_name}
@@ -129,37 +275,24 @@ class ClerkJWTAuthentication(BaseAuthentication):
                 user.full_name = full_name
                 update_fields.append('full_name')
 
-            # ✅ Fetch true created_at from Clerk if user was newly created
-            if created:
-                try:
-                    response = requests.get(
-                        f"{settings.CLERK_API_BASE_URL}/users/{clerk_id}",
-                        headers={"Authorization": f"Bearer {settings.CLERK_SECRET_KEY}"}
-                    )
-                    logger.debug(f"Clerk Management API status: {response.status_code}")
-                    response.raise_for_status()
-                    data = response.json()
-
-                    created_raw = data.get("created_at")
-                    logger.debug(f"Clerk created_at raw: {created_raw}")
-
-                    true_created = parse_datetime(created_raw)
-                    if true_created:
-                        user.created_at = true_created
-                        update_fields.append("created_at")
-                    else:
-                        logger.warning("Failed to parse Clerk created_at")
-
-                except Exception as e:
-                    logger.warning(f"Could not fetch true created_at from Clerk: {str(e)}")
-
-            # Save updates and split name
+            # Split name in the same save (only when the name changed or was never split)
+            if user.full_name and (created or 'full_name' in update_fields or not user.first_name):
+                split_before = (user.first_name, user.last_name)
+                user.split_full_name(save=False)
+                update_fields.extend(
+                    field for field, before in zip(('first_name', 'last_name'), split_before)
+                    if getattr(user, field) != before
+                )
+
             if update_fields:
                 user.save(update_fields=update_fields)
 
-            if not user.first_name or not user.last_name:
-                user.split_full_name()
+            # ✅ True created_at comes from Clerk in the background (not on the request path)
+            if created:
+                transaction.on_commit(lambda: self._queue_created_at_backfill(clerk_id))
 
+            # After the signal's own on_commit invalidation, and never for a rolled back row
+            transaction.on_commit(lambda: cache_user(user, fingerprint))
             return user
 
         try:
@@ -172,6 +305,14 @@ class ClerkJWTAuthentication(BaseAuthentication):
             logger.error(f"User sync failed: {str(e)}")
             raise AuthenticationFailed("User synchronization error")
 
+    @staticmethod
+    def _queue_created_at_backfill(clerk_id):
+        try:
+            backfill_clerk_created_at_task.delay(clerk_id)
+        except Exception as e:
+            # Not worth failing the login over; created_at keeps the first-seen time
+            logger.warning(f"Could not queue created_at backfill for {clerk_id}: {str(e)}")
+
     # def _get_or_create_user(self, clerk_id, email, full_name):
     #     """
     #     Thread-safe user sync with cache lock to avoid race conditions.
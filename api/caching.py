@@ -0,0 +1,137 @@
+import logging
+import math
+import random
+import time
+
+from django.core.cache import cache
+from redis.exceptions import LockError
+
+logger = logging.getLogger(__name__)
+
+
+#===================================
+# Stampede-protected cache (single-flight + early refresh + stale-while-revalidate)
+#====================================
+# The plain cache.get -> compute -> cache.set pattern lets every worker that sees a miss
+# recompute the same payload at once (thundering herd on Postgres when a hot key expires).
+# get_or_compute() avoids that with three things:
+#
+#   1. Early refresh (XFetch): each entry stores how long it took to compute. As the soft
+#      expiry approaches, readers randomly decide to refresh it early - the more expensive the
+#      payload and the closer the expiry, the more likely. Usually one reader refreshes it
+#      before it ever expires.
+#   2. Single flight: only the reader holding the per-key Redis lock recomputes.
+#   3. Stale-while-revalidate: the entry outlives its soft expiry by `stale_ttl`; while one
+#      reader recomputes, everybody else keeps being served the previous value. If the
+#      recompute fails the stale value is served too.
+#
+# Only a fully cold key (first use, Redis flush, or idle longer than ttl + stale_ttl) makes
+# readers wait, and then they poll for the leader's result instead of querying themselves.
+
+CACHE_KEY_PREFIX = "swr"
+DEFAULT_STALE_TTL = 60 * 5      # How long an expired value may still be served while refreshing
+DEFAULT_LOCK_TIMEOUT = 60       # Upper bound on one recompute; the lock frees itself after this
+DEFAULT_WAIT_TIMEOUT = 5        # Cold key: how long followers wait for the leader
+XFETCH_BETA = 1.0               # > 1 refreshes earlier, < 1 later
+_WAIT_POLL_INTERVAL = 0.05
+
+
+def _entry_key(key):
+    # Own namespace: entries are (value, delta, expiry) tuples, not raw values
+    return f"{CACHE_KEY_PREFIX}:{key}"
+
+
+def _lock_key(key):
+    return f"{CACHE_KEY_PREFIX}:lock:{key}"
+
+
+def _store(key, compute, ttl, version, stale_ttl):
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    cache.set(_entry_key(key), (value, delta, time.time() + ttl), ttl + stale_ttl, version=version)
+    return value
+
+
+def _should_refresh_early(delta, expiry, beta):
+    # XFetch: now - delta * beta * ln(u) >= expiry, with u uniform in (0, 1]
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def _acquire(key, version, lock_timeout):
+    lock = cache.lock(_lock_key(key), version=version, timeout=lock_timeout)
+    return lock if lock.acquire(blocking=False) else None
+
+
+def _release(lock):
+    try:
+        lock.release()
+    except LockError:
+        # Recompute outlived lock_timeout and someone else took over - nothing to release
+        pass
+
+
+def get_or_compute(
+    key,
+    compute,
+    ttl,
+    *,
+    version=None,
+    stale_ttl=DEFAULT_STALE_TTL,
+    lock_timeout=DEFAULT_LOCK_TIMEOUT,
+    wait_timeout=DEFAULT_WAIT_TIMEOUT,
+    beta=XFETCH_BETA,
+):
+    """
+    Return the cached value for `key`, computing it with `compute()` when needed.
+
+    ttl        -- seconds the value counts as fresh
+    version    -- passed through to the cache (e.g. the search cache version)
+    stale_ttl  -- extra seconds an expired value may be served while one caller refreshes it
+    compute() must return something picklable; None is cached like any other value.
+    """
+    entry = cache.get(_entry_key(key), version=version)
+
+    if entry is not None:
+        value, delta, expiry = entry
+        if not _should_refresh_early(delta, expiry, beta):
+            return value
+
+        # Due (or nearly due): one caller refreshes, everyone else keeps the current value
+        lock = _acquire(key, version, lock_timeout)
+        if lock is None:
+            return value
+        try:
+            return _store(key, compute, ttl, version, stale_ttl)
+        except Exception:
+            logger.exception(f"Refreshing cache key {key} failed; serving the stale value")
+            return value
+        finally:
+            _release(lock)
+
+    # Cold key: the lock holder computes, followers wait for its result
+    lock = _acquire(key, version, lock_timeout)
+    if lock is not None:
+        try:
+            return _store(key, compute, ttl, version, stale_ttl)
+        finally:
+            _release(lock)
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(_WAIT_POLL_INTERVAL)
+        entry = cache.get(_entry_key(key), version=version)
+        if entry is not None:
+            return entry[0]
+
+    # Leader is too slow (or died) - compute without storing rather than fail the request
+    logger.warning(f"Timed out waiting for cache key {key}; computing without the lock")
+    return compute()
+
+
+def refresh_cached(key, compute, ttl, *, version=None, stale_ttl=DEFAULT_STALE_TTL):
+    """
+    Unconditionally recompute and store `key` (for periodic tasks that keep a key warm).
+    Readers keep getting the previous value until the new one is written.
+    """
+    return _store(key, compute, ttl, version, stale_ttl)
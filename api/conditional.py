@@ -0,0 +1,147 @@
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.core.cache import cache
+from django.views.decorators.http import condition
+
+from . import async_cache
+from .db_routers import note_write
+
+
+#===================================
+# Data versions for conditional GET (ETag / Last-Modified)
+#====================================
+# Dashboards and idea-of-the-day endpoints are polled far more often than their data changes.
+# Instead of rendering the response to find out whether it changed, every write path records a
+# "data version" in Redis per (scope, drop_date):
+#
+#   data_version:names:2025-07-01   -> bumped when names dropping on that date change
+#   data_version:ideas:2025-07-01   -> bumped when that date's IdeaOfTheDay rows change
+#   data_version:<scope>:all        -> bumped on every change in the scope (list endpoints)
+#
+# The value is the time of the last change in microseconds, so it doubles as Last-Modified.
+# Deciding on a 304 is one Redis round trip - no query, no serialization.
+
+NAMES = "names"
+IDEAS = "ideas"
+ALL = "all"
+
+DATA_VERSION_KEY = "data_version:{scope}:{key}"
+
+
+def _now_version():
+    return time.time_ns() // 1000
+
+
+def _version_key(scope, key):
+    key = key.isoformat() if hasattr(key, "isoformat") else key
+    return DATA_VERSION_KEY.format(scope=scope, key=key)
+
+
+def bump_data_version(scope, *dates):
+    """Mark the given drop dates (and the scope-wide 'all' version) as changed now."""
+    version = _now_version()
+    keys = [_version_key(scope, drop_date) for drop_date in dates] + [_version_key(scope, ALL)]
+    cache.set_many({key: version for key in keys}, timeout=None)
+    note_write()  # Replicas must catch up before serving reads again (see db_routers.py)
+
+
+def get_data_versions(pairs):
+    """
+    Versions for a list of (scope, date or ALL) pairs, in order.
+    A missing version (first use, or evicted) is initialised to "now", so clients
+    re-download once rather than risk a stale 304.
+    """
+    keys = [_version_key(scope, key) for scope, key in pairs]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        version = _now_version()
+        for key in missing:
+            cache.add(key, version, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+async def aget_data_versions(pairs):
+    """get_data_versions() for async views (same keys, through the async Redis client)."""
+    keys = [_version_key(scope, key) for scope, key in pairs]
+    found = await async_cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        version = _now_version()
+        for key in missing:
+            await async_cache.add(key, version)
+        found.update(await async_cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def _version_state(request, pairs, versions):
+    # (ETag, Last-Modified) for a response depending on `pairs` at `versions`
+    fingerprint = "|".join([
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+        *(f"{scope}:{key}={version}" for (scope, key), version in zip(pairs, versions)),
+    ])
+    return (
+        hashlib.sha1(fingerprint.encode("utf-8")).hexdigest(),
+        datetime.fromtimestamp(max(versions) / 1_000_000, tz=dt_timezone.utc),
+    )
+
+
+def data_version_condition(version_pairs_func):
+    """
+    Decorator for a view's get() (use with method_decorator) adding ETag/Last-Modified
+    and 304 handling based on data versions.
+
+    version_pairs_func(request, *args, **kwargs) returns the (scope, date) pairs the response
+    depends on, or None to skip conditional handling (e.g. invalid params -> let the view 400).
+    The ETag also covers the full URL and Accept header, so each representation gets its own tag.
+    """
+
+    def _state(request, *args, **kwargs):
+        # etag_func and last_modified_func are both called per request - resolve versions once
+        state = getattr(request, "_data_version_state", False)
+        if state is not False:
+            return state
+
+        pairs = version_pairs_func(request, *args, **kwargs)
+        state = None if pairs is None else _version_state(request, pairs, get_data_versions(pairs))
+        request._data_version_state = state
+        return state
+
+    def etag_func(request, *args, **kwargs):
+        state = _state(request, *args, **kwargs)
+        return state[0] if state else None
+
+    def last_modified_func(request, *args, **kwargs):
+        state = _state(request, *args, **kwargs)
+        return state[1] if state else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def async_data_version_condition(version_pairs_func):
+    """
+    data_version_condition() for async views (e.g. a View's `async def get`, via method_decorator).
+    The versions are fetched with the async Redis client up front; Django's condition() then
+    finds them already resolved on the request and never calls the blocking client.
+    """
+
+    def decorator(func):
+        conditional = data_version_condition(version_pairs_func)(func)
+
+        @wraps(func)
+        async def inner(request, *args, **kwargs):
+            if not hasattr(request, "_data_version_state"):
+                pairs = version_pairs_func(request, *args, **kwargs)
+                request._data_version_state = (
+                    None if pairs is None else _version_state(request, pairs, await aget_data_versions(pairs))
+                )
+            return await conditional(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
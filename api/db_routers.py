@@ -0,0 +1,276 @@
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, DatabaseError
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+
+logger = logging.getLogger(__name__)
+
+
+#===================================
+# Read replica routing
+#====================================
+# Reads of views marked `replica_reads = True` (lists, dashboards, search, ideas, details) go to a
+# read replica; everything else - writes, admin, auth, Celery tasks, management commands - stays
+# on the primary ("default"). With no replicas configured the router always answers "default".
+#
+# A replica is only used when it already has every write the response could depend on:
+#   - Each process checks every replica's replication lag at most every REPLICA_LAG_CHECK_INTERVAL
+#     seconds. A replica that's unreachable or more than REPLICA_MAX_LAG_SECONDS behind is skipped.
+#     The check also gives the point in time the replica has replayed up to.
+#   - Cache version bumps (search, data versions, reference tables) record a global "last write"
+#     time in Redis, and a request that wrote records one for its user. A replica is only picked
+#     when it has replayed past the newer of the two; otherwise the read goes to the primary.
+#     This keeps versioned caches from storing old rows under a new version, and lets a user's GET
+#     right after their POST see the change.
+#   - Within a request: once it has written (INSERT/UPDATE/DELETE on the primary), or inside a
+#     transaction.atomic() block, its reads stay on the primary.
+# When no replica qualifies the request simply reads from the primary.
+#
+# Local testing: point DATABASE_REPLICA_URLS at a streaming replica of the local database
+# (e.g. a second Postgres instance started from pg_basebackup -R).
+
+PRIMARY = "default"
+REPLICAS = tuple(settings.DATABASE_REPLICAS)
+
+LAST_WRITE_KEY = "db_last_write:all"
+USER_LAST_WRITE_KEY = "db_last_write:user:{user_id}"
+USER_LAST_WRITE_TTL = 60 * 10   # Longer than any lag a replica may have and still be used
+
+# Extra distance a replica must be past the last write: covers WAL still in flight at check
+# time and small clock differences between app servers
+CLOCK_MARGIN = 1.0
+
+_WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+# Data-modifying CTEs (WITH ... INSERT/DELETE ...), e.g. api/saved_names.py
+_CTE_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_replay_lsn() >= pg_last_wal_receive_lsn() THEN 0  -- Replayed all it received
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_state = contextvars.ContextVar("db_routing_state", default=None)
+
+
+def note_write():
+    """Record that shared data changed now (replicas must replay past this before serving reads)."""
+    if REPLICAS:
+        cache.set(LAST_WRITE_KEY, time.time(), timeout=None)
+
+
+
+
+#===================================
+# Replica lag tracking (per process)
+#====================================
+class ReplicaStatus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = {}  # alias -> (replayed_until or None when unusable, checked_at monotonic)
+
+    def replayed_until(self, alias):
+        """Wall-clock time the replica has replayed up to, or None if it shouldn't be used."""
+        status = self._status.get(alias)
+        if status is not None and time.monotonic() - status[1] < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return status[0]
+        with self._lock:
+            status = self._status.get(alias)
+            if status is None or time.monotonic() - status[1] >= settings.REPLICA_LAG_CHECK_INTERVAL:
+                status = (self._check(alias), time.monotonic())
+                self._status[alias] = status
+        return status[0]
+
+    def _check(self, alias):
+        checked_at = time.time()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.warning(f"Replica {alias} unavailable, reading from the primary: {e}")
+            return None
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning(f"Replica {alias} is {lag:.1f}s behind, reading from the primary")
+            return None
+        return checked_at - lag
+
+
+replica_status = ReplicaStatus()
+
+
+
+
+#===================================
+# Per-request state
+#====================================
+def _user_id(request):
+    # DRF stores the authenticated user on the underlying request. Don't touch the lazy user
+    # AuthenticationMiddleware puts there first: evaluating it would query the session table.
+    user = request.__dict__.get("user")
+    if user is None or isinstance(user, SimpleLazyObject) or not getattr(user, "is_authenticated", False):
+        return None
+    return user.pk
+
+
+class RoutingState:
+    __slots__ = ("request", "_replica_reads", "wrote", "alias")
+
+    def __init__(self, request):
+        self.request = request
+        self._replica_reads = None
+        self.wrote = False
+        self.alias = None  # Decided on the first read, then kept for the whole request
+
+    @property
+    def replica_reads(self):
+        # Resolved on the first read: by then URL resolution has picked the view
+        if self._replica_reads is None:
+            match = getattr(self.request, "resolver_match", None)
+            if match is None:
+                return False  # Middleware running before the view - don't cache the answer
+            view = getattr(match.func, "view_class", match.func)
+            self._replica_reads = self.request.method in _SAFE_METHODS and getattr(view, "replica_reads", False)
+        return self._replica_reads
+
+    def read_alias(self):
+        if self.alias is None:
+            self.alias = self._choose_replica()
+        return self.alias
+
+    def _choose_replica(self):
+        keys = [LAST_WRITE_KEY]
+        user_id = _user_id(self.request)
+        if user_id is not None:
+            keys.append(USER_LAST_WRITE_KEY.format(user_id=user_id))
+        try:
+            last_write = max(cache.get_many(keys).values(), default=0)
+        except Exception as e:
+            logger.warning(f"Could not read last write times, reading from the primary: {e}")
+            return PRIMARY
+
+        candidates = [
+            alias for alias in REPLICAS
+            if (replica_status.replayed_until(alias) or 0) >= last_write + CLOCK_MARGIN
+        ]
+        return random.choice(candidates) if candidates else PRIMARY
+
+
+
+
+#===================================
+# Write tracking
+#====================================
+# Installed on every primary connection when it's opened (rather than per request with
+# connection.execute_wrapper), so it also covers async requests, whose queries run on
+# sync_to_async threads with their own connections. Outside a request it does nothing.
+def _is_write(sql):
+    head = sql.lstrip()[:6].upper()
+    if head in _WRITE_STATEMENTS:
+        return True
+    return head.startswith("WITH") and _CTE_WRITE.search(sql) is not None
+
+
+def _track_writes(execute, sql, params, many, context):
+    state = _state.get()
+    if state is not None and not state.wrote and _is_write(sql):
+        state.wrote = True
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def _install_write_tracking(sender, connection, **kwargs):
+    if REPLICAS and connection.alias == PRIMARY and _track_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_writes)
+
+
+
+
+#===================================
+# Router + middleware
+#====================================
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY  # Reads inside a transaction must see its own writes
+        return state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Replicas are copies of the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sets up the routing state for each request and records per-user writes afterwards.
+    Views opt in with a `replica_reads = True` class attribute (safe methods only).
+    Runs natively under both WSGI and ASGI (api/async_views.py).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not REPLICAS:
+            return self.get_response(request)
+
+        state = RoutingState(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            self._note_user_write(request)
+        return response
+
+    async def __acall__(self, request):
+        if not REPLICAS:
+            return await self.get_response(request)
+
+        # Queries run in sync_to_async threads, which copy this context: the router and
+        # _track_writes see the same state object
+        state = RoutingState(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            await sync_to_async(self._note_user_write)(request)
+        return response
+
+    def _note_user_write(self, request):
+        user_id = _user_id(request)
+        if user_id is not None:
+            cache.set(USER_LAST_WRITE_KEY.format(user_id=user_id), time.time(), USER_LAST_WRITE_TTL)
@@ -0,0 +1,87 @@
+import csv
+from datetime import date, datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from .renderers import dumps
+
+
+#===================================
+# Streaming name export (NDJSON / CSV)
+#====================================
+# Rows are read with a server-side cursor (.iterator) and written out as they arrive,
+# so memory stays flat no matter how many names match.
+#
+# Under ASGI, Django would consume a sync iterator with sync_to_async(list) - the whole export in
+# memory before the first byte. There the stream is wrapped by as_async_stream(), which pulls one
+# batch of lines per thread hop instead.
+
+EXPORT_FIELDS = (
+    'domain_name', 'extension', 'domain_list', 'status', 'score', 'length', 'syllables',
+    'is_top_rated', 'is_idea_of_the_day', 'drop_date', 'drop_time', 'created_at',
+)
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    # format: (content type, file extension)
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+
+def _export_rows(queryset):
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(queryset):
+    """One JSON object per line, encoded exactly like the API's JSON responses."""
+    for row in _export_rows(queryset):
+        yield dumps(dict(zip(EXPORT_FIELDS, row))) + b"\n"
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line straight back to the generator."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(queryset):
+    """Header row, then one CSV row per name (spreadsheet friendly)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _export_rows(queryset):
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+EXPORT_STREAMS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
+
+
+def _next_lines(stream):
+    return list(islice(stream, EXPORT_CHUNK_SIZE))
+
+
+async def as_async_stream(stream):
+    """
+    Async version of an export stream (ASGI): one sync_to_async hop per EXPORT_CHUNK_SIZE lines,
+    joined into one chunk. Thread-sensitive, so the server-side cursor stays on the request's
+    database connection.
+    """
+    next_lines = sync_to_async(_next_lines, thread_sensitive=True)
+    while True:
+        lines = await next_lines(stream)
+        if not lines:
+            break
+        yield lines[0][:0].join(lines)  # str (CSV) or bytes (NDJSON)
@@ -0,0 +1,108 @@
+import hashlib
+
+from django.db import connections
+from django.db.models import F
+
+from .caching import get_or_compute
+from .conditional import get_data_versions
+from .reference import category_name
+
+
+#===================================
+# Facet counts (filter sidebar counts)
+#====================================
+# Counts for every facet of a filtered name / use case set in ONE query:
+#
+#   SELECT facet_extension, facet_status, ..., GROUPING(facet_extension), ..., COUNT(*)
+#   FROM (<filtered queryset>) facet_rows
+#   GROUP BY GROUPING SETS ((facet_extension), (facet_status), ...)
+#
+# Each output row belongs to exactly one grouping set; GROUPING(col) = 0 marks the facet it counts
+# (so a real NULL value - e.g. an unscored name - is still told apart from "not this facet").
+#
+# Results are cached per (filters, data version) through get_or_compute, so a change to the
+# underlying names/use cases gives a new key instead of having to find and delete old ones.
+
+FACETS_CACHE_TTL = 60 * 10
+
+# Output facet -> (ORM lookup, optional converter for the raw value)
+NAME_FACETS = {
+    "extension": ("extension", None),
+    "status": ("status", None),
+    "length": ("length", None),
+    "score": ("score", None),
+}
+
+IDEA_FACETS = {
+    "category": ("category_id", category_name),  # Category names come from the reference cache
+    "business_model": ("business_model", None),
+    "competition": ("competition", None),
+    "difficulty": ("difficulty", None),
+}
+
+# Query params that don't change which rows are counted
+_IGNORED_PARAMS = {"page", "page_size", "ordering", "fields", "expand", "format"}
+
+
+def _bucket_sort_key(bucket):
+    # Ascending by value (scores/lengths read naturally), missing values last
+    return (bucket["value"] is None, bucket["value"])
+
+
+def facet_counts(queryset, facets):
+    """
+    {facet: [{"value": ..., "count": n}, ...]} for the rows of `queryset`, in a single query.
+    """
+    aliases = {name: f"facet_{name}" for name in facets}
+    rows_qs = (
+        queryset.order_by()
+        .annotate(**{aliases[name]: F(lookup) for name, (lookup, _) in facets.items()})
+        .values(*aliases.values())
+    )
+    sql, params = rows_qs.query.sql_with_params()
+
+    connection = connections[queryset.db]
+    columns = [connection.ops.quote_name(alias) for alias in aliases.values()]
+    facet_sql = (
+        f"SELECT {', '.join(columns)}, "
+        f"{', '.join(f'GROUPING({column})' for column in columns)}, COUNT(*) "
+        f"FROM ({sql}) facet_rows "
+        f"GROUP BY GROUPING SETS ({', '.join(f'({column})' for column in columns)})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(facet_sql, params)
+        rows = cursor.fetchall()
+
+    names = list(facets)
+    width = len(names)
+    result = {name: [] for name in names}
+    for row in rows:
+        values, grouping, count = row[:width], row[width:2 * width], row[-1]
+        position = grouping.index(0)
+        name = names[position]
+        value = values[position]
+        converter = facets[name][1]
+        if converter is not None and value is not None:
+            value = converter(value)
+        result[name].append({"value": value, "count": count})
+
+    for buckets in result.values():
+        buckets.sort(key=_bucket_sort_key)
+    return result
+
+
+def cached_facet_counts(kind, queryset, facets, query_params, version_pairs):
+    """
+    facet_counts() cached per filter set. version_pairs are conditional.py (scope, date) pairs the
+    counts depend on; their current versions are part of the key, so data changes invalidate it.
+    """
+    filters = sorted(
+        (key, value)
+        for key in query_params
+        if key not in _IGNORED_PARAMS
+        for value in query_params.getlist(key)
+    )
+    versions = get_data_versions(version_pairs)
+    fingerprint = "|".join([repr(filters), *map(str, versions)])
+    key = f"facets:{kind}:{hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()}"
+    return get_or_compute(key, lambda: facet_counts(queryset, facets), FACETS_CACHE_TTL)
@@ -0,0 +1,91 @@
+import random
+
+from django.conf import settings
+from django.db.models import Max, Min
+
+from .caching import get_or_compute, refresh_cached
+
+from .models import UseCase
+from .serializers import UseCaseListValuesSerializer
+
+
+#===================================
+# Featured use cases (?featured=true on /ideas/list)
+#====================================
+# Instead of ORDER BY random() over the whole table, draw random ids between MIN(id) and
+# MAX(id) (both answered from the primary key index) and fetch just those rows.
+# Ids deleted since (gaps) simply miss, so each round over-draws and retries with a bigger
+# draw if needed. Cost depends on FEATURED_COUNT, not on the size of the table.
+#
+# The payload is rebuilt by refresh_featured_usecases_task ahead of expiry, so requests
+# normally never compute it; if the task is late, get_or_compute() lets a single request rebuild it.
+
+FEATURED_COUNT = 8
+FEATURED_CACHE_KEY = "featured_usecases"
+FEATURED_TTL = 60 * 60 * 25  # Refreshed daily by the task; the extra hour covers a late run
+
+# Weighted mode picks from a larger candidate pool so higher scores actually get an edge
+FEATURED_CANDIDATE_FACTOR = 4
+FEATURED_MAX_ROUNDS = 5
+
+
+def _weighted_pick(candidates, count):
+    """
+    Weighted sample without replacement (Efraimidis-Spirakis):
+    key = u ** (1 / weight), keep the `count` largest keys.
+    """
+    keyed = [
+        (random.random() ** (1.0 / max(score or 1, 1)), use_case_id)
+        for use_case_id, score in candidates.items()
+    ]
+    keyed.sort(reverse=True)
+    return [use_case_id for _, use_case_id in keyed[:count]]
+
+
+def sample_featured_ids(count=FEATURED_COUNT, weighted=None):
+    """
+    Return up to `count` random UseCase ids.
+    weighted=True biases the pick by the parent name's score (default: settings.FEATURED_WEIGHT_BY_SCORE).
+    """
+    if weighted is None:
+        weighted = settings.FEATURED_WEIGHT_BY_SCORE
+
+    bounds = UseCase.objects.aggregate(low=Min("id"), high=Max("id"))
+    low, high = bounds["low"], bounds["high"]
+    if low is None:
+        return []
+
+    pool_size = count * FEATURED_CANDIDATE_FACTOR if weighted else count
+    pool_size = min(pool_size, high - low + 1)
+
+    candidates = {}  # id -> parent name score
+    draw = pool_size * 2
+    for _ in range(FEATURED_MAX_ROUNDS):
+        ids = {random.randint(low, high) for _ in range(draw)} - candidates.keys()
+        if ids:
+            candidates.update(
+                UseCase.objects.filter(id__in=ids).order_by().values_list("id", "domain_name__score")
+            )
+        if len(candidates) >= pool_size:
+            break
+        draw *= 2  # Sparse id range - draw harder next round
+
+    if weighted:
+        return _weighted_pick(candidates, count)
+    return random.sample(list(candidates), min(count, len(candidates)))
+
+
+def build_featured_payload(count=FEATURED_COUNT):
+    ids = sample_featured_ids(count)
+    payload = UseCaseListValuesSerializer().serialize(UseCase.objects.filter(id__in=ids))
+    random.shuffle(payload)  # Rows come back in Meta ordering; keep the tile order random
+    return payload
+
+
+def refresh_featured_usecases():
+    """Rebuild and cache the featured payload (called by the periodic task)."""
+    return refresh_cached(FEATURED_CACHE_KEY, build_featured_payload, FEATURED_TTL)
+
+
+def get_featured_usecases():
+    return get_or_compute(FEATURED_CACHE_KEY, build_featured_payload, FEATURED_TTL)
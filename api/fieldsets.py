@@ -0,0 +1,158 @@
+from django.db.models import Exists, OuterRef, Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .models import SavedName, UseCase
+
+
+#===================================
+# Sparse fieldsets (?fields= / ?expand=)
+#====================================
+# Lets clients ask for only the parts of a payload they render:
+#   ?fields=domain_name,score        -> only those top-level fields
+#   ?expand=suggested_usecase        -> every plain field plus the listed relations
+#   ?fields=domain_name&expand=suggested_usecase
+# With neither param the full payload is returned, exactly as before.
+#
+# The requested set drives both the serializer (unrequested fields are dropped) and the
+# queryset (only() + select_related/prefetch_related), so unrequested relations are never queried.
+
+
+def _split_param(raw):
+    return [part.strip() for part in (raw or "").split(",") if part.strip()]
+
+
+class FieldPlan:
+    """What one output field needs from the database."""
+
+    __slots__ = ("columns", "select_related", "prefetch_related", "annotate")
+
+    def __init__(self, columns=(), select_related=(), prefetch_related=(), annotate=None):
+        self.columns = tuple(columns)                    # model columns for only()
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)  # lookups or Prefetch objects
+        self.annotate = annotate                         # callable(queryset, request) -> queryset
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin. Views declare:
+      - fieldset_fields: every top-level output field, in serializer order
+      - fieldset_expandable: the relation fields (only returned with ?fields= naming them or ?expand=)
+      - fieldset_plans: output field -> FieldPlan; fields without a plan map to the column of the same name
+    """
+    fieldset_fields = ()
+    fieldset_expandable = ()
+    fieldset_plans = {}
+
+    def get_requested_fields(self):
+        """Set of requested top-level fields, or None when the client wants the full payload."""
+        if hasattr(self, "_requested_fields"):
+            return self._requested_fields
+
+        fields = _split_param(self.request.query_params.get("fields"))
+        expand = _split_param(self.request.query_params.get("expand"))
+
+        if not fields and not expand:
+            self._requested_fields = None
+            return None
+
+        errors = {}
+        unknown_fields = [field for field in fields if field not in self.fieldset_fields]
+        if unknown_fields:
+            errors["fields"] = f"Unknown field(s): {', '.join(unknown_fields)}. Allowed: {', '.join(self.fieldset_fields)}."
+        unknown_expand = [field for field in expand if field not in self.fieldset_expandable]
+        if unknown_expand:
+            errors["expand"] = f"Cannot expand: {', '.join(unknown_expand)}. Allowed: {', '.join(self.fieldset_expandable)}."
+        if errors:
+            raise ValidationError(errors)
+
+        if not fields:
+            fields = [field for field in self.fieldset_fields if field not in self.fieldset_expandable]
+
+        self._requested_fields = set(fields) | set(expand)
+        return self._requested_fields
+
+    def apply_fieldset(self, queryset):
+        """
+        Shape the queryset for the requested fields.
+        Without ?fields/?expand every plan is applied (but no only()), so the full payload is still N+1 free.
+        """
+        requested = self.get_requested_fields()
+        wanted = self.fieldset_fields if requested is None else [f for f in self.fieldset_fields if f in requested]
+
+        columns = ["pk"]
+        select_related = []
+        prefetch_related = []
+        for field in wanted:
+            plan = self.fieldset_plans.get(field)
+            if plan is None:
+                columns.append(field)
+                continue
+            columns.extend(plan.columns)
+            select_related.extend(plan.select_related)
+            prefetch_related.extend(plan.prefetch_related)
+            if plan.annotate is not None:
+                queryset = plan.annotate(queryset, self.request)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if requested is not None:
+            queryset = queryset.only(*dict.fromkeys(columns))
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+
+
+
+#===================================
+# Name payload plans (NameSerializer)
+#====================================
+def _annotate_saved(queryset, request):
+    # One EXISTS per row inside the main query instead of one query per row in get_saved()
+    if request is None or not request.user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        is_saved=Exists(SavedName.objects.filter(user=request.user, name=OuterRef("pk")))
+    )
+
+
+NAME_FIELDSET_FIELDS = (
+    'domain_name', 'extension', 'domain_list', 'status', 'score', 'length', 'syllables',
+    'suggested_usecase', 'other_use_cases', 'is_idea_of_the_day', 'is_top_rated',
+    'drop_date', 'created_at', 'updated_at', 'saved', 'slug',
+)
+
+NAME_FIELDSET_EXPANDABLE = ('suggested_usecase', 'other_use_cases')
+
+NAME_FIELDSET_PLANS = {
+    'slug': FieldPlan(columns=['domain_name']),
+    'saved': FieldPlan(annotate=_annotate_saved),
+    'suggested_usecase': FieldPlan(
+        columns=['suggested_usecase'],
+        select_related=['suggested_usecase__category', 'suggested_usecase__domain_name'],
+        prefetch_related=['suggested_usecase__tag', 'suggested_usecase__target_markets'],
+    ),
+    'other_use_cases': FieldPlan(
+        prefetch_related=[
+            Prefetch(
+                'use_cases',
+                queryset=UseCase.objects.exclude(order=1).select_related('category', 'domain_name')
+                .prefetch_related('tag', 'target_markets'),
+                to_attr='prefetched_other_use_cases',
+            ),
+        ],
+    ),
+}
+
+
+class NameFieldsetMixin(SparseFieldsetMixin):
+    fieldset_fields = NAME_FIELDSET_FIELDS
+    fieldset_expandable = NAME_FIELDSET_EXPANDABLE
+    fieldset_plans = NAME_FIELDSET_PLANS
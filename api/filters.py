@@ -1,9 +1,15 @@
+import operator
+from functools import reduce
+
 from django_filters import rest_framework as filters
 from .models import Name, UseCase
+from .reference import CATEGORIES, TARGET_MARKETS
 from django.utils.dateparse import parse_date
 import django_filters.rest_framework as filters
-from rest_framework.filters import BaseFilterBackend
-from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q, Exists, OuterRef
+from django.db.models.constants import LOOKUP_SEP
 
 # class NameFilter(filters.FilterSet):
 #     class Meta:
@@ -37,11 +43,11 @@ class UseCaseFilter(filters.FilterSet):
     # exact matches
     competition = filters.CharFilter(field_name="competition", lookup_expr="iexact")
     difficulty  = filters.CharFilter(field_name="difficulty", lookup_expr="iexact")
-    target_markets = filters.CharFilter(field_name="target_markets__name", lookup_expr="icontains")
+    target_markets = filters.CharFilter(method="filter_target_markets")
 
     # category by id or name
     category = filters.NumberFilter(field_name="category_id")
-    category_name = filters.CharFilter(field_name="category__name", lookup_expr="iexact")
+    category_name = filters.CharFilter(method="filter_category_name")
 
     # created_at range
     created_at_after = filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
@@ -59,6 +65,28 @@ class UseCaseFilter(filters.FilterSet):
             "created_at_before",
         ]
 
+    # Names are resolved to ids from the reference cache, so neither filter joins the lookup table
+    def filter_category_name(self, queryset, name, value):
+        category = CATEGORIES.iget(value, by="name")
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_target_markets(self, queryset, name, value):
+        # Same matching as target_markets__name__icontains, as a semi-join on the through table:
+        # a use case in several matching markets still comes back once, so no DISTINCT is needed
+        needle = value.lower()
+        market_ids = [market.pk for market in TARGET_MARKETS.all() if needle in market.name.lower()]
+        if not market_ids:
+            return queryset.none()
+        return queryset.filter(
+            Exists(
+                UseCase.target_markets.through.objects.filter(
+                    usecase_id=OuterRef("pk"), targetmarket_id__in=market_ids
+                )
+            )
+        )
+
     @staticmethod
     def last_n(queryset, value):
         try:
@@ -70,4 +98,66 @@ class UseCaseFilter(filters.FilterSet):
             pass
         return queryset
 
-#We’ll wire last_n in the view since it’s a convenience shortcut.
\ No newline at end of file
+#We’ll wire last_n in the view since it’s a convenience shortcut.
+
+
+
+
+#===================================
+# Search without DISTINCT
+#====================================
+def exists_condition(model, lookup, value):
+    """
+    Q-like condition for `lookup=value` on `model` that never multiplies rows:
+    if the lookup crosses a many-to-many or reverse foreign key, that part becomes an
+    EXISTS subquery (e.g. tag__name__icontains -> EXISTS(SELECT 1 FROM tag ... WHERE name ILIKE ..)),
+    otherwise it is a plain Q (forward foreign keys join one row at most).
+    """
+    parts = lookup.split(LOOKUP_SEP)
+    opts = model._meta
+    for index, part in enumerate(parts):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            break  # Reached the lookup/transform (icontains, iexact, ...)
+        if field.many_to_many or field.one_to_many:
+            # Filter the related model back to the outer row
+            back = field.field.name if field.auto_created and not field.concrete else field.related_query_name()
+            outer = LOOKUP_SEP.join([*parts[:index], "pk"])
+            rest = parts[index + 1:]
+            try:
+                field.related_model._meta.get_field(rest[0])
+            except (IndexError, FieldDoesNotExist):
+                rest = ["pk", *rest]  # e.g. tag__in=[..] compares the related pk
+            return Exists(
+                field.related_model._default_manager.filter(**{back: OuterRef(outer), LOOKUP_SEP.join(rest): value})
+            )
+        if not field.is_relation:
+            break
+        opts = field.related_model._meta
+    return Q(**{lookup: value})
+
+
+class ExistsSearchFilter(SearchFilter):
+    """
+    DRF SearchFilter whose to-many search fields (e.g. tag__name) are matched with EXISTS,
+    so the base queryset needs no .distinct() and can still be paged straight off an index.
+    Same ?search= semantics: every term must match at least one search field.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        orm_lookups = [
+            self.construct_search(str(search_field), queryset)
+            for search_field in search_fields
+        ]
+        for term in search_terms:
+            queryset = queryset.filter(
+                reduce(operator.or_, (exists_condition(queryset.model, lookup, term) for lookup in orm_lookups))
+            )
+        return queryset
@@ -0,0 +1,30 @@
+from django.db.models import CharField, Lookup, TextField
+
+
+#===================================
+# Custom lookups
+#====================================
+# Registered on import from ApiConfig.ready().
+
+class AnyLookup(Lookup):
+    """
+    field__any=[...]  ->  field = ANY(%s::text[])
+
+    The whole list is bound as ONE array parameter, so the SQL text is identical for 5 or
+    5,000 values (unlike __in, which expands to one placeholder per value). Postgres still
+    uses the btree index on the column (or on the matching expression, e.g. LOWER(col)).
+    """
+    lookup_name = 'any'
+    prepare_rhs = False  # Keep the list as a list; CharField.get_prep_value would str() it
+
+    def get_prep_lookup(self):
+        return list(self.rhs)
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} = ANY({rhs}::text[])", [*lhs_params, *rhs_params]
+
+
+CharField.register_lookup(AnyLookup)
+TextField.register_lookup(AnyLookup)
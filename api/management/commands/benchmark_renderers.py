@@ -0,0 +1,73 @@
+import json
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Name
+from api.renderers import ORJSONRenderer
+from api.serializers import DashboardNameSerializer, NameSerializer
+
+# Example CLI usage:
+#   python manage.py benchmark_renderers
+#   python manage.py benchmark_renderers --iterations 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares render time of DRF's JSONRenderer vs the orjson renderer on real payloads: "
+        "a max-size daily drop response (2 x 500 names) and a 100-row name list page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per renderer per payload')
+
+    def _build_payloads(self):
+        # Same shapes the views produce; serialized once up front so only rendering is timed
+        dashboard_qs = Name.objects.order_by('-score', '-created_at', 'domain_name').select_related('suggested_usecase')
+        daily_drop = {
+            "pending_delete": DashboardNameSerializer(dashboard_qs[:500], many=True).data,
+            "deleted": DashboardNameSerializer(dashboard_qs[500:1000], many=True).data,
+        }
+
+        list_qs = (
+            Name.objects.all()
+            .select_related('suggested_usecase')
+            .prefetch_related('use_cases__tag', 'use_cases__category', 'suggested_usecase__tag', 'suggested_usecase__category')
+            .order_by('-score')[:100]
+        )
+        name_rows = NameSerializer(list_qs, many=True).data
+        name_page = {"count": Name.objects.count(), "next": None, "previous": None, "results": name_rows}
+
+        return [
+            ("daily drop", daily_drop, len(daily_drop["pending_delete"]) + len(daily_drop["deleted"])),
+            ("name list page", name_page, len(name_rows)),
+        ]
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        drf_renderer = JSONRenderer()
+        orjson_renderer = ORJSONRenderer()
+
+        for label, payload, rows in self._build_payloads():
+            if not rows:
+                self.stdout.write(self.style.WARNING(f"{label}: no names in the database, skipping."))
+                continue
+
+            drf_bytes = drf_renderer.render(payload)
+            orjson_bytes = orjson_renderer.render(payload)
+            # Sanity check: both renderers must produce the same document
+            if json.loads(drf_bytes) != json.loads(orjson_bytes):
+                self.stdout.write(self.style.ERROR(f"{label}: renderer outputs differ!"))
+
+            drf_time = timeit.timeit(lambda: drf_renderer.render(payload), number=iterations)
+            orjson_time = timeit.timeit(lambda: orjson_renderer.render(payload), number=iterations)
+
+            self.stdout.write(
+                f"{label} ({rows} rows, {len(drf_bytes) / 1024:.1f} KiB): "
+                f"json {drf_time / iterations * 1000:.3f} ms | "
+                f"orjson {orjson_time / iterations * 1000:.3f} ms | "
+                f"{drf_time / orjson_time:.1f}x faster"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
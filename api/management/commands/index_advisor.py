@@ -0,0 +1,224 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+# Example CLI usage:
+#   python manage.py index_advisor
+#   python manage.py index_advisor --min-scans 10 --top 30 --all-tables
+
+
+#===================================
+# Index advisor
+#====================================
+# Read-only report built from Postgres' own statistics, so the index set can follow the real
+# query mix instead of guesses:
+#   1. Unused indexes      - pg_stat_user_indexes: (almost) never scanned since the stats reset,
+#                            excluding primary keys / unique constraints (those enforce data)
+#   2. Redundant indexes   - a plain index whose columns are a leading prefix of another index
+#                            on the same table (the longer one serves its queries too)
+#   3. Seq-scanned tables  - pg_stat_user_tables: big tables read mostly by sequential scans
+#   4. Expensive queries   - pg_stat_statements (if installed): the top statements by total time,
+#                            EXPLAINed as generic plans (Postgres 16+) to show which large tables
+#                            they scan sequentially, i.e. where an index is probably missing
+#
+# Usage counters are only meaningful after the server has seen normal traffic for a while, and
+# they are per server: run this against the primary AND the replicas before dropping anything.
+
+
+def seq_scanned_tables(plan):
+    """Relation names of every Seq Scan node (parallel ones included) in an EXPLAIN (FORMAT JSON) plan."""
+    tables = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan":
+            tables.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return tables
+
+
+class Command(BaseCommand):
+    help = "Reports unused, redundant and probably-missing indexes from pg_stat_user_indexes / pg_stat_statements."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-scans", type=int, default=0,
+                            help="Report indexes scanned at most this many times as unused (default 0)")
+        parser.add_argument("--min-rows", type=int, default=10000,
+                            help="Tables with fewer (estimated) rows are ignored for seq scan findings (default 10000)")
+        parser.add_argument("--top", type=int, default=20,
+                            help="How many pg_stat_statements entries to analyse (default 20)")
+        parser.add_argument("--all-tables", action="store_true",
+                            help="Include non-app tables (auth, celery beat, ...), not only api_*")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.ERROR("index_advisor needs PostgreSQL statistics views."))
+            return
+
+        self.table_pattern = "%" if options["all_tables"] else "api\\_%"
+        self.statement_pattern = "%" if options["all_tables"] else '%"api\\_%'
+        self.min_rows = options["min_rows"]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+            row = cursor.fetchone()
+        since = row[0] if row and row[0] else "database creation"
+        self.stdout.write(self.style.SUCCESS(f"--- Index advisor (usage counted since {since}) ---"))
+
+        self.report_unused(options["min_scans"])
+        self.report_redundant()
+        self.report_seq_scanned_tables()
+        self.report_statements(options["top"])
+
+        self.stdout.write(self.style.SUCCESS("\n--- Index advisor complete ---"))
+
+    #--- helpers ---
+    def fetch(self, sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params or [])
+            return cursor.fetchall()
+
+    def heading(self, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{title}"))
+
+    #--- 1. unused ---
+    def report_unused(self, min_scans):
+        self.heading(f"Unused indexes (idx_scan <= {min_scans}, not primary/unique)")
+        rows = self.fetch(
+            """
+            SELECT s.relname, s.indexrelname, s.idx_scan, pg_size_pretty(pg_relation_size(s.indexrelid))
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            WHERE s.idx_scan <= %s
+              AND NOT i.indisprimary AND NOT i.indisunique
+              AND s.relname LIKE %s
+            ORDER BY pg_relation_size(s.indexrelid) DESC, s.relname, s.indexrelname
+            """,
+            [min_scans, self.table_pattern],
+        )
+        if not rows:
+            self.stdout.write("  None.")
+        for table, index, scans, size in rows:
+            self.stdout.write(f"  {table}.{index}: {scans} scans, {size}")
+
+    #--- 2. redundant ---
+    def report_redundant(self):
+        self.heading("Redundant indexes (columns are a leading prefix of another index)")
+        # Same columns AND operator classes as the start of the longer index; expression and
+        # partial indexes are skipped because comparing them needs more than indkey
+        rows = self.fetch(
+            """
+            SELECT t.relname, ai.relname, bi.relname, pg_size_pretty(pg_relation_size(a.indexrelid))
+            FROM pg_index a
+            JOIN pg_index b ON b.indrelid = a.indrelid AND b.indexrelid <> a.indexrelid
+            JOIN pg_class t ON t.oid = a.indrelid
+            JOIN pg_class ai ON ai.oid = a.indexrelid
+            JOIN pg_class bi ON bi.oid = b.indexrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
+              AND t.relname LIKE %s
+              AND NOT a.indisprimary AND NOT a.indisunique
+              AND a.indexprs IS NULL AND a.indpred IS NULL
+              AND b.indexprs IS NULL AND b.indpred IS NULL
+              AND b.indnkeyatts > a.indnkeyatts
+              AND (b.indkey::text || ' ') LIKE (a.indkey::text || ' %%')
+              AND (b.indclass::text || ' ') LIKE (a.indclass::text || ' %%')
+            ORDER BY t.relname, ai.relname
+            """,
+            [self.table_pattern],
+        )
+        if not rows:
+            self.stdout.write("  None.")
+        for table, index, covered_by, size in rows:
+            self.stdout.write(f"  {table}.{index} ({size}) is covered by {covered_by}")
+
+    #--- 3. seq-scanned tables ---
+    def report_seq_scanned_tables(self):
+        self.heading(f"Tables read mostly by sequential scans (>= {self.min_rows} rows)")
+        rows = self.fetch(
+            """
+            SELECT relname, n_live_tup, seq_scan, seq_tup_read, COALESCE(idx_scan, 0)
+            FROM pg_stat_user_tables
+            WHERE relname LIKE %s
+              AND n_live_tup >= %s
+              AND seq_scan > COALESCE(idx_scan, 0)
+            ORDER BY seq_tup_read DESC
+            """,
+            [self.table_pattern, self.min_rows],
+        )
+        if not rows:
+            self.stdout.write("  None.")
+        for table, live_rows, seq_scans, seq_rows, idx_scans in rows:
+            self.stdout.write(
+                f"  {table}: {live_rows} rows, {seq_scans} seq scans reading {seq_rows} rows, {idx_scans} index scans"
+            )
+
+    #--- 4. pg_stat_statements ---
+    def report_statements(self, top):
+        self.heading(f"Top {top} statements by total time (pg_stat_statements)")
+        installed = self.fetch("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        if not installed:
+            self.stdout.write(
+                "  pg_stat_statements is not installed (shared_preload_libraries + CREATE EXTENSION) - skipped."
+            )
+            return
+
+        # Column names changed in Postgres 13
+        time_column = "total_exec_time" if connection.pg_version >= 130000 else "total_time"
+        mean_column = "mean_exec_time" if connection.pg_version >= 130000 else "mean_time"
+        try:
+            rows = self.fetch(
+                f"""
+                SELECT s.query, s.calls, s.{time_column}, s.{mean_column}, s.rows
+                FROM pg_stat_statements s
+                WHERE s.dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                  AND s.query ILIKE %s
+                  AND s.query ~* '^\\s*(SELECT|WITH)'
+                ORDER BY s.{time_column} DESC
+                LIMIT %s
+                """,
+                [self.statement_pattern, top],
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"  Could not read pg_stat_statements: {e}"))
+            return
+
+        large_tables = {
+            name for (name,) in self.fetch(
+                "SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= %s", [self.min_rows]
+            )
+        }
+        can_explain = connection.pg_version >= 160000  # EXPLAIN (GENERIC_PLAN) for $n-parameterised text
+
+        for query, calls, total_ms, mean_ms, returned in rows:
+            self.stdout.write(
+                f"\n  {total_ms:.0f} ms total, {calls} calls, {mean_ms:.2f} ms mean, {returned} rows\n"
+                f"    {' '.join(query.split())[:300]}"
+            )
+            if not can_explain:
+                continue
+            scanned = self.seq_scans_for(query, large_tables)
+            if scanned is None:
+                self.stdout.write("    (could not EXPLAIN this statement)")
+            elif scanned:
+                self.stdout.write(self.style.WARNING(
+                    f"    Seq scan on {', '.join(sorted(scanned))} - candidate for an index"
+                ))
+
+        if not can_explain:
+            self.stdout.write("\n  Postgres < 16: no generic plans, so statements are listed without seq scan analysis.")
+
+    def seq_scans_for(self, query, large_tables):
+        try:
+            # Savepoint: a failing EXPLAIN must not poison the rest of the report
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    # No params: the $1, $2 ... placeholders stay in the text for the generic plan
+                    cursor.execute("EXPLAIN (FORMAT JSON, GENERIC_PLAN) " + query)
+                    plan = cursor.fetchone()[0]
+        except Exception:
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return set(seq_scanned_tables(plan[0]["Plan"])) & large_tables
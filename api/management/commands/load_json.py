@@ -4,7 +4,13 @@ from django.utils.dateparse import parse_date
 import traceback
 
 from api.management.validators import validate_domain_data
-from api.models import Name, UseCaseTag, UseCaseCategory, UseCase, IdeaOfTheDay, DomainListOptions, RegStatusOptions, TargetMarket
+from api.models import Name, UseCaseTag, UseCase, IdeaOfTheDay, DomainListOptions, RegStatusOptions
+from api.reference import CATEGORIES, TARGET_MARKETS, TAGS
+from api.search import bump_search_version
+from api.suggest import add_names_to_suggest_index
+from api.conditional import bump_data_version, NAMES
+from api.rollups import refresh_drop_rollups
+from django.db import transaction
 
 import logging
 logger = logging.getLogger(__name__)
@@ -104,15 +110,16 @@ class Command(BaseCommand):
             if not isinstance(data, list):
                 raise CommandError("Top-level JSON must be a list of domains.")
 
-            # Preload allowed category names from DB for validation
-            allowed_categories = set(UseCaseCategory.objects.values_list('name', flat=True))
+            # Allowed category names for validation (reference cache, no query per run)
+            allowed_categories = CATEGORIES.values('name')
             
-            # Preload allowed TargetMarket names
-            allowed_target_markets = set(TargetMarket.objects.values_list('name', flat=True))
+            # Allowed TargetMarket names
+            allowed_target_markets = TARGET_MARKETS.values('name')
 
             # To track domains and their scores
             top_scoring_domains = []
             records_processed = 0 # Count successful inserts
+            loaded_domain_names = [] # For the autocomplete index
 
             # --- Process each domain entry ---
             for index, item in enumerate(data):
@@ -173,7 +180,7 @@ class Command(BaseCommand):
 
                 # --- Create UseCase entries
                 for uc in use_cases_data:
-                    uc_category = UseCaseCategory.objects.get(name=uc['category']['name'])
+                    uc_category = CATEGORIES.get(uc['category']['name'], by='name')
 
                     # Create the use case instance
                     use_case_obj = UseCase.objects.create(
@@ -193,11 +200,11 @@ class Command(BaseCommand):
                     for market_dict in uc.get('target_markets', []):
                         market_name = market_dict.get('name')
                         if market_name:
-                            try:
-                                # Use .get() because we've already validated they exist
-                                market_obj = TargetMarket.objects.get(name=market_name)
+                            # Dict lookup in the reference cache; names were validated above
+                            market_obj = TARGET_MARKETS.get(market_name, by='name')
+                            if market_obj is not None:
                                 market_objs_to_add.append(market_obj)
-                            except TargetMarket.DoesNotExist:
+                            else:
                                 # This should not happen due to the pre-validation, but it's a good safeguard
                                 logger.error(f"Logic error: Could not find pre-validated TargetMarket '{market_name}' for domain '{domain_name}'.")
                     use_case_obj.target_markets.set(market_objs_to_add)
@@ -207,7 +214,9 @@ class Command(BaseCommand):
                     for tag_dict in uc.get('tag', []):
                         tag_name = tag_dict.get('name')
                         if tag_name:
-                            tag_obj, _ = UseCaseTag.objects.get_or_create(name=tag_name)
+                            tag_obj = TAGS.get(tag_name, by='name')
+                            if tag_obj is None:
+                                tag_obj, _ = UseCaseTag.objects.get_or_create(name=tag_name)
                             tag_objs_to_add.append(tag_obj)
                     use_case_obj.tag.set(tag_objs_to_add)
 
@@ -224,6 +233,7 @@ class Command(BaseCommand):
                 
                 #Increment total processed number
                 records_processed += 1
+                loaded_domain_names.append(domain_name)
 
             
             # --- Assign IdeaOfTheDay for 'pending_delete' domains if applicable ---
@@ -271,6 +281,16 @@ class Command(BaseCommand):
                     # ))
                     logger.warning( f"Skipped IdeaOfTheDay creation: no top use case (order=1) found for domain '{selected_domain.domain_name}'.")
 
+            # --- Refresh search caches/indexes once the inserts are committed ---
+            # (the loader can run inside process_file's transaction, so wait for the commit)
+            if records_processed:
+                transaction.on_commit(bump_search_version)
+                transaction.on_commit(lambda: add_names_to_suggest_index(loaded_domain_names))
+                # ...and let polling dashboards for this drop date know it changed (names are created without per-row signals)
+                transaction.on_commit(lambda: bump_data_version(NAMES, drop_date))
+                # ...and count the new names into the /analytics/drops rollup
+                transaction.on_commit(lambda: refresh_drop_rollups([drop_date]))
+
             # --- Final success message ---
             self.stdout.write(self.style.SUCCESS(f'Total domains processed: {records_processed}'))
             logger.info(f'Total domains processed: {records_processed}')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from api.models import Name
+from api.suggest import rebuild_suggest_index
+
+# Example CLI usage: python manage.py rebuild_suggest_index
+
+class Command(BaseCommand):
+    help = "Rebuilds the Redis autocomplete index (/search/names/suggest) from the Name table."
+
+    def handle(self, *args, **options):
+        # Stream domain names with a server-side cursor so large tables don't load into memory
+        domain_names = Name.objects.values_list("domain_name", flat=True).iterator(chunk_size=5000)
+        indexed = rebuild_suggest_index(domain_names)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} domain names for autocomplete."))
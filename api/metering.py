@@ -0,0 +1,169 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction, DatabaseError, DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from .models import AppUser, Subscription, ApiUsage
+
+logger = logging.getLogger(__name__)
+
+
+#===================================
+# Subscription state cache
+#====================================
+# HasActiveSubscription and the plan quota throttle read request.user.subscription on every paid
+# request. The row is cached per user (invalidated by api/signals.py on every Subscription save or
+# delete) and put into the user's relation cache, so user.subscription costs one Redis GET and no
+# query. is_active() is still evaluated per request (expiry is a date), and the plan's api_quota
+# comes from the PLANS reference cache.
+
+SUBSCRIPTION_CACHE_KEY = "subscription:{user_id}"
+_NO_SUBSCRIPTION = "none"  # Cached too: free users are the majority
+_SUBSCRIPTION_FIELDS = tuple(field.attname for field in Subscription._meta.concrete_fields)
+
+
+def load_subscription(user):
+    """Make user.subscription available without a query (raises DoesNotExist as usual when there is none)."""
+    relation = AppUser.subscription.related
+    if relation.is_cached(user):
+        return
+
+    key = SUBSCRIPTION_CACHE_KEY.format(user_id=user.pk)
+    entry = cache.get(key)
+    if entry is None:
+        subscription = Subscription.objects.filter(user_id=user.pk).first()
+        entry = _NO_SUBSCRIPTION if subscription is None else tuple(
+            getattr(subscription, attname) for attname in _SUBSCRIPTION_FIELDS
+        )
+        cache.set(key, entry, settings.SUBSCRIPTION_CACHE_TTL)
+    elif entry == _NO_SUBSCRIPTION:
+        subscription = None
+    else:
+        subscription = Subscription.from_db(DEFAULT_DB_ALIAS, _SUBSCRIPTION_FIELDS, entry)
+
+    if subscription is not None:
+        Subscription.user.field.set_cached_value(subscription, user)
+    relation.set_cached_value(user, subscription)
+
+
+def forget_subscription(user_id):
+    cache.delete(SUBSCRIPTION_CACHE_KEY.format(user_id=user_id))
+
+
+
+
+#===================================
+# Usage counters (Redis)
+#====================================
+# Each metered request adds 1 to a per-user, per-day (UTC) counter and marks it dirty: INCR +
+# EXPIRE + SADD sent as one pipeline, so one round trip and no database work on the request path.
+# Counters are running totals for the day; flush_usage() copies the dirty ones into ApiUsage.
+#
+# Keys (raw Redis, shared by every process):
+#   api_usage:<yyyy-mm-dd>:<user_id>   running total for that day
+#   api_usage:dirty                    set of "<yyyy-mm-dd>:<user_id>" changed since the last flush
+
+USAGE_KEY_PREFIX = "api_usage:"
+USAGE_DIRTY_KEY = "api_usage:dirty"
+USAGE_FLUSH_BATCH_SIZE = 1000
+
+# One advisory lock id for flushes: overlapping runs queue up, so a later flush never writes an
+# older total over a newer one
+_USAGE_FLUSH_LOCK_ID = 410049
+
+
+def _usage_member(user_id, day):
+    return f"{day.isoformat()}:{user_id}"
+
+
+def record_usage(user_id, day=None):
+    """Count one metered request for user_id (today, UTC, unless a day is given)."""
+    member = _usage_member(user_id, day or timezone.now().date())
+    try:
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.incr(USAGE_KEY_PREFIX + member)
+        # Kept well past the day's end, so a late or failed flush can still pick it up
+        pipe.expire(USAGE_KEY_PREFIX + member, settings.API_USAGE_COUNTER_TTL)
+        pipe.sadd(USAGE_DIRTY_KEY, member)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not record API usage for {user_id}: {e}")
+
+
+def flush_usage():
+    """
+    Copy the counters changed since the last flush into ApiUsage (upsert of the running totals,
+    so re-flushing a counter is harmless). Returns the number of rows written.
+    Only what was dirty when the flush started is processed; later changes wait for the next run.
+    """
+    redis = get_redis_connection("default")
+    remaining = redis.scard(USAGE_DIRTY_KEY)
+    written = 0
+
+    while remaining > 0:
+        members = []
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_USAGE_FLUSH_LOCK_ID])
+
+                members = [member.decode() for member in redis.spop(USAGE_DIRTY_KEY, min(remaining, USAGE_FLUSH_BATCH_SIZE))]
+                if not members:
+                    break
+                remaining -= len(members)
+                written += _write_usage(members, redis.mget([USAGE_KEY_PREFIX + member for member in members]))
+        except DatabaseError:
+            if members:
+                redis.sadd(USAGE_DIRTY_KEY, *members)  # Retried by the next flush
+            raise
+
+    if written:
+        logger.info(f"Flushed API usage for {written} user-days")
+    return written
+
+
+def _write_usage(members, counts):
+    totals = {}
+    for member, count in zip(members, counts):
+        if count is None:
+            continue  # Expired without being flushed (flushes stopped for days); nothing left to copy
+        day, user_id = member.split(":", 1)
+        totals[(user_id, day)] = int(count)
+
+    # Users deleted since their requests were counted
+    existing = set(AppUser.objects.filter(pk__in={user_id for user_id, _ in totals}).values_list("pk", flat=True))
+    rows = [
+        ApiUsage(user_id=user_id, date=day, request_count=count)
+        for (user_id, day), count in totals.items()
+        if user_id in existing
+    ]
+    if rows:
+        ApiUsage.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["user", "date"],
+            update_fields=["request_count", "updated_at"],
+        )
+    return len(rows)
+
+
+
+
+#===================================
+# Metered views
+#====================================
+class MeteredViewMixin:
+    """
+    Counts every successful (< 400) response to an authenticated user toward their API usage.
+    Put it first in the bases of an APIView.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code < 400 and request.user.is_authenticated:
+            record_usage(request.user.pk)
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:00
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction; it doesn't block writes to api_name
+    atomic = False
+
+    dependencies = [
+        ('api', '0050_usecase_business_model'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='name',
+            index=models.Index(django.db.models.functions.text.Lower('domain_name'), name='name_domain_name_lower_idx'),
+        ),
+    ]
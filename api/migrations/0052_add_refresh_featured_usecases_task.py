@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:30
+
+from django.db import migrations
+
+def create_refresh_featured_task(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Schedule: Daily at 00:45 UTC (after the midnight transition and idea of the day)
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="45",
+        hour="0",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        timezone="UTC",
+    )
+
+    PeriodicTask.objects.update_or_create(
+        name="refresh_featured_usecases",
+        defaults={
+            "task": "api.tasks.refresh_featured_usecases_task",
+            "crontab": schedule,
+            "enabled": True,
+            "expires": None,
+        },
+    )
+
+def remove_refresh_featured_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name="refresh_featured_usecases").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0051_name_domain_name_lower_idx'),
+        ("django_celery_beat", "0016_alter_crontabschedule_timezone"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_refresh_featured_task, remove_refresh_featured_task),
+    ]
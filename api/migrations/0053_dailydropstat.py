@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0052_add_refresh_featured_usecases_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDropStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('drop_date', models.DateField()),
+                ('extension', models.CharField(max_length=20)),
+                ('domain_list', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('name_count', models.PositiveIntegerField(default=0)),
+                ('scored_count', models.PositiveIntegerField(default=0)),
+                ('score_total', models.PositiveIntegerField(default=0)),
+                ('top_rated_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('drop_date', 'extension', 'domain_list', 'status')},
+            },
+        ),
+    ]
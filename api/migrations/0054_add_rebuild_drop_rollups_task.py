@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:10
+
+from django.db import migrations
+
+def create_rebuild_drop_rollups_task(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Schedule: Daily at 01:30 UTC (after the midnight transition)
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="30",
+        hour="1",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        timezone="UTC",
+    )
+
+    PeriodicTask.objects.update_or_create(
+        name="rebuild_drop_rollups",
+        defaults={
+            "task": "api.tasks.rebuild_drop_rollups_task",
+            "crontab": schedule,
+            "enabled": True,
+            "expires": None,
+        },
+    )
+
+def remove_rebuild_drop_rollups_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name="rebuild_drop_rollups").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0053_dailydropstat'),
+        ("django_celery_beat", "0016_alter_crontabschedule_timezone"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rebuild_drop_rollups_task, remove_rebuild_drop_rollups_task),
+    ]
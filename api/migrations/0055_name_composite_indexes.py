@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction; it doesn't block writes to api_name
+    atomic = False
+
+    dependencies = [
+        ('api', '0054_add_rebuild_drop_rollups_task'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='name',
+            index=models.Index(fields=['drop_date', 'is_top_rated', '-score', '-created_at', 'domain_name'], include=('domain_list', 'status', 'length'), name='name_dashboard_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='name',
+            index=models.Index(fields=['domain_list', 'status', 'drop_time'], name='name_list_status_drop_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='name',
+            index=models.Index(fields=['domain_list', 'status', 'last_checked'], name='name_list_status_checked_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:25
+
+from django.db import migrations
+
+def create_flush_api_usage_task(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Schedule: Every 5 minutes (usage in ApiUsage is at most this far behind)
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="*/5",
+        hour="*",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        timezone="UTC",
+    )
+
+    PeriodicTask.objects.update_or_create(
+        name="flush_api_usage",
+        defaults={
+            "task": "api.tasks.flush_api_usage_task",
+            "crontab": schedule,
+            "enabled": True,
+            "expires": None,
+        },
+    )
+
+def remove_flush_api_usage_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name="flush_api_usage").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_apiusage'),
+        ("django_celery_beat", "0016_alter_crontabschedule_timezone"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_flush_api_usage_task, remove_flush_api_usage_task),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from .utils import process_file, count_syllables_hybrid
@@ -63,12 +64,13 @@ class AppUser(models.Model):
         return f"{self.first_name or self.email} ({self.clerk_id})"
     
     #Method for deriving first and last name from the full_name field
-    def split_full_name(self):
+    def split_full_name(self, save=True):
         if self.full_name:
             parts = self.full_name.strip().split(" ", 1)
             self.first_name = parts[0]
             self.last_name = parts[1] if len(parts) > 1 else ""
-            self.save(update_fields=["first_name", "last_name"])
+            if save:
+                self.save(update_fields=["first_name", "last_name"])
 
 
     @property
@@ -178,6 +180,24 @@ class Name(models.Model):
     last_checked = models.DateTimeField(null=True, blank=True)
 
 
+    class Meta:
+        indexes = [
+            # Case-insensitive exact lookups (batch /names/lookup matches on LOWER(domain_name))
+            models.Index(Lower('domain_name'), name='name_domain_name_lower_idx'),
+            # Dashboards (top-rated + daily drop): one day, top-rated or not, in display order.
+            # INCLUDE carries the rest of the dashboard payload so these can be index-only scans;
+            # domain_list is included rather than a key column because it's an optional filter.
+            models.Index(
+                fields=['drop_date', 'is_top_rated', '-score', '-created_at', 'domain_name'],
+                include=['domain_list', 'status', 'length'],
+                name='name_dashboard_idx',
+            ),
+            # Availability check eligibility (get_eligible_check_domains / second check)
+            models.Index(fields=['domain_list', 'status', 'drop_time'], name='name_list_status_drop_idx'),
+            models.Index(fields=['domain_list', 'status', 'last_checked'], name='name_list_status_checked_idx'),
+        ]
+
+
     # A computed property (method) that generates a slug from the domain_name field
     @property
     def slug(self):
@@ -185,6 +205,14 @@ class Name(models.Model):
 
     def get_absolute_url(self):
         return reverse('name-detail', kwargs={'slug': self.slug})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Drop date as stored, so saving a moved name can invalidate its old date too (api/signals.py).
+        # None when drop_date was deferred.
+        instance._stored_drop_date = instance.__dict__.get('drop_date')
+        return instance
     
 
 
@@ -447,6 +475,35 @@ class ArchivedName(models.Model):
         return f"Archived: {self.domain}{self.extension} (Dropped: {self.original_drop_date})"
 
 
+
+
+# ============================================
+# Daily drop rollup (analytics)
+# ============================================
+class DailyDropStat(models.Model):
+    """
+    Name counts per (drop_date, extension, domain_list, status), recomputed per drop date by the
+    transition/availability tasks and the loader, and rebuilt nightly (see api/rollups.py).
+    Rows outlive the names themselves: archiving a drop date leaves its statistics in place.
+    """
+    drop_date = models.DateField()
+    extension = models.CharField(max_length=20)
+    domain_list = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    name_count = models.PositiveIntegerField(default=0)
+    scored_count = models.PositiveIntegerField(default=0)  # Names with a score (for averages)
+    score_total = models.PositiveIntegerField(default=0)
+    top_rated_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Leading drop_date also serves the date-range reads of /analytics/drops
+        unique_together = ('drop_date', 'extension', 'domain_list', 'status')
+
+    def __str__(self):
+        return f"{self.drop_date} .{self.extension} {self.domain_list}/{self.status}: {self.name_count}"
+
+
     
 
 
@@ -540,6 +597,29 @@ class Subscription(models.Model):
         from django.utils import timezone
         return self.isPaid and self.subscription_expiry and self.subscription_expiry >= timezone.now().date()
 
+
+
+
+# ============================================
+# Metered API usage (billing)
+# ============================================
+class ApiUsage(models.Model):
+    """
+    Metered API requests per user per day (UTC). request_count is the day's running total,
+    copied from the Redis counters by flush_api_usage_task (see api/metering.py).
+    """
+    user = models.ForeignKey(AppUser, on_delete=models.CASCADE, related_name='api_usage')
+    date = models.DateField()
+    request_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Leading user also serves per-user billing-period sums
+        unique_together = ('user', 'date')
+
+    def __str__(self):
+        return f"{self.user_id} {self.date}: {self.request_count}"
+
      
 
 # ============================================
@@ -1,12 +1,139 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+#===================================
+# Approximate counts for large listings
+#====================================
+# PageNumberPagination runs an exact COUNT(*) over the whole filtered queryset on every page,
+# which on the bigger tables (and the DISTINCT multi-join behind /ideas/list) can cost more
+# than fetching the page itself. ApproximateCountPaginator instead:
+#   1. counts at most EXACT_COUNT_THRESHOLD + 1 rows (COUNT over a LIMITed subquery, no ORDER BY);
+#      below the threshold that is the exact count, as before
+#   2. above it, uses the planner's row estimate (EXPLAIN), cached per query for
+#      APPROXIMATE_COUNT_TTL so the total stays stable while a client pages through
+# and the response says which one it got ("count_is_approximate").
+#
+# An estimate can be off either way, so in approximate mode pages are not validated against
+# num_pages and "next" is decided by fetching one extra row, not from the count.
+
+APPROXIMATE_COUNT_KEY = "approx_count:{digest}"
+
+
+class ApproximatePage(Page):
+    has_more = False
+
+    def has_next(self):
+        if self.paginator.count_is_approximate:
+            return self.has_more
+        return super().has_next()
+
+
+class ApproximateCountPaginator(Paginator):
+    exact_count_threshold = settings.EXACT_COUNT_THRESHOLD
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        object_list = self.object_list
+        if not isinstance(object_list, QuerySet):
+            return super().count
+
+        # Ordering doesn't change the count and would force sorting every row before the LIMIT
+        unordered = object_list.order_by()
+        bounded = unordered[:self.exact_count_threshold + 1].count()
+        if bounded <= self.exact_count_threshold:
+            return bounded
+
+        self.count_is_approximate = True
+        return max(self._estimated_count(unordered), bounded)
 
-class StandardResultsSetPagination(PageNumberPagination):
+    def _estimated_count(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.sha1(f"{sql}|{params!r}".encode("utf-8")).hexdigest()
+        key = APPROXIMATE_COUNT_KEY.format(digest=digest)
+
+        estimate = cache.get(key)
+        if estimate is None:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            cache.set(key, estimate, settings.APPROXIMATE_COUNT_TTL)
+        return estimate
+
+    def validate_number(self, number):
+        self.count  # Decides count_is_approximate
+        if not self.count_is_approximate:
+            return super().validate_number(number)
+        # No upper bound: the real total may be past the estimated last page
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+        # One row past the page tells us whether there is a next page
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return ApproximatePage(*args, **kwargs)
+
+
+class ApproximateCountPaginationMixin:
+    """Page number pagination with ApproximateCountPaginator and a count_is_approximate flag."""
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_approximate': self.page.paginator.count_is_approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_approximate'] = {'type': 'boolean', 'example': False}
+        return response_schema
+
+
+
+
+class StandardResultsSetPagination(ApproximateCountPaginationMixin, PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
 
 
-class IdeaPageNumberPagination(PageNumberPagination):
+class IdeaPageNumberPagination(ApproximateCountPaginationMixin, PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
@@ -0,0 +1,29 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+#===================================
+# orjson parser
+#====================================
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with orjson (same media type as DRF's JSONParser).
+    Like DRF's strict parser, NaN/Infinity are rejected.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            body = stream.read()
+            # orjson only reads UTF-8; re-decode anything else first
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .metering import load_subscription
+
 
 
 
@@ -17,6 +19,23 @@ class IsManagerOrReadOnly(BasePermission):
             return True
         return False
 
+
+
+
+
+class HasActiveSubscription(BasePermission):
+    """
+    Paid features: the user must have a paid, unexpired subscription.
+    """
+    message = "An active paid subscription is required for this feature."
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        load_subscription(request.user)  # From the cache (api/metering.py), no query once warm
+        subscription = getattr(request.user, 'subscription', None)  # reverse one-to-one; None if missing
+        return bool(subscription and subscription.is_active())
+
         
 
 # class IsManagerOrReadOnly(BasePermission):
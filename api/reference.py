@@ -0,0 +1,161 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .db_routers import note_write
+from .models import UseCaseCategory, TargetMarket, UseCaseTag, PlanModel, ExtensionDropInfo
+
+
+#===================================
+# Reference data cache (in-process dict + Redis version)
+#====================================
+# Categories, target markets, tags, plans and extension drop rules are tiny tables that are
+# read on almost every loader run, filter and serializer call but change a few times a year.
+# Each table is held as a plain dict per process, keyed by pk and by its natural keys, so a
+# lookup is a dict access instead of a query.
+#
+# Staleness across processes (gunicorn workers, celery) is handled with one version per table
+# in Redis (refdata_version:<model>), bumped by signals on save/delete. A process re-reads the
+# version at most every REFERENCE_CACHE_CHECK_INTERVAL seconds - or immediately when a lookup
+# misses, so rows created in another process are picked up on first use - and reloads the
+# table when it changed. A miss with no version change is confirmed against the database:
+# bumps can be lost (Redis error, bulk_create / raw SQL / migration writes fire no signals,
+# or the row is read between commit and bump), and the table is reloaded if the row exists.
+#
+# Cached instances are shared by every thread in the process: treat them as read-only.
+
+REFERENCE_VERSION_KEY = "refdata_version:{label}"
+REFERENCE_CACHE_CHECK_INTERVAL = settings.REFERENCE_CACHE_CHECK_INTERVAL
+
+
+class ReferenceTable:
+    """
+    Usage:
+        CATEGORIES.get(3)                      # by pk
+        CATEGORIES.get("fintech", by="slug")
+        CATEGORIES.iget("FinTech", by="name")  # case-insensitive (iexact)
+        CATEGORIES.all()
+    """
+
+    def __init__(self, model, keys=()):
+        self.model = model
+        self.keys = ("pk", *keys)
+        self._version_key = REFERENCE_VERSION_KEY.format(label=model._meta.label_lower)
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._rows = []
+        self._index = {}   # key -> {value: instance}
+        self._iindex = {}  # key -> {lowercased value: instance}
+
+    #--- versioning ---
+    def _remote_version(self):
+        version = cache.get(self._version_key)
+        if version is None:
+            # First use or evicted: start a version so every process agrees from here on
+            cache.add(self._version_key, time.time_ns(), timeout=None)
+            version = cache.get(self._version_key)
+        return version
+
+    def bump_version(self):
+        """Tell every process to reload this table (call after the change is committed)."""
+        note_write()  # Reloads must not come from a replica that hasn't seen the change yet
+        cache.set(self._version_key, time.time_ns(), timeout=None)
+
+    def clear_local(self):
+        """Forget this process's copy; the next lookup reloads."""
+        self._version = None
+
+    #--- loading ---
+    def _load(self, version):
+        rows = list(self.model.objects.order_by("pk"))
+        index = {key: {} for key in self.keys}
+        iindex = {key: {} for key in self.keys if key != "pk"}
+        for row in rows:
+            for key in self.keys:
+                value = getattr(row, key)
+                index[key][value] = row
+                if key in iindex and isinstance(value, str):
+                    iindex[key][value.lower()] = row
+        # Readers may be mid-lookup in other threads; swap whole dicts, never mutate in place
+        self._rows, self._index, self._iindex = rows, index, iindex
+        self._version = version
+
+    def _ensure_fresh(self, force_check=False):
+        now = time.monotonic()
+        if self._version is not None and not force_check and now - self._checked_at < REFERENCE_CACHE_CHECK_INTERVAL:
+            return
+        with self._lock:
+            version = self._remote_version()
+            if version != self._version:
+                self._load(version)
+            self._checked_at = now
+
+    def _reload(self):
+        with self._lock:
+            self._load(self._remote_version())
+            self._checked_at = time.monotonic()
+
+    def _in_database(self, index_name, by, value):
+        lookup = by if index_name == "_index" else f"{by}__iexact"
+        return self.model.objects.filter(**{lookup: value}).exists()
+
+    def _lookup(self, index_name, by, value):
+        self._ensure_fresh()
+        found = getattr(self, index_name)[by].get(value)
+        if found is None:
+            # Maybe created elsewhere since our last check - confirm against Redis before giving up
+            self._ensure_fresh(force_check=True)
+            found = getattr(self, index_name)[by].get(value)
+        if found is None and value is not None and self._in_database(index_name, by, value):
+            # Written without a version bump reaching us - reload rather than report it missing
+            self._reload()
+            found = getattr(self, index_name)[by].get(value)
+        return found
+
+    #--- lookups ---
+    def get(self, value, by="pk"):
+        """Instance whose `by` field equals value, or None."""
+        return self._lookup("_index", by, value)
+
+    def iget(self, value, by="name"):
+        """Case-insensitive get for string keys (same semantics as __iexact)."""
+        if value is None:
+            return None
+        return self._lookup("_iindex", by, value.lower())
+
+    def all(self):
+        """Every row, ordered by pk."""
+        self._ensure_fresh()
+        return self._rows
+
+    def values(self, by):
+        """Set of the `by` field over all rows (e.g. allowed category names)."""
+        self._ensure_fresh()
+        return set(self._index[by])
+
+
+CATEGORIES = ReferenceTable(UseCaseCategory, keys=("name", "slug"))
+TARGET_MARKETS = ReferenceTable(TargetMarket, keys=("name",))
+TAGS = ReferenceTable(UseCaseTag, keys=("name",))
+PLANS = ReferenceTable(PlanModel, keys=("plan_type",))
+EXTENSION_DROP_INFO = ReferenceTable(ExtensionDropInfo, keys=("extension",))
+
+REFERENCE_TABLES = {
+    table.model: table
+    for table in (CATEGORIES, TARGET_MARKETS, TAGS, PLANS, EXTENSION_DROP_INFO)
+}
+
+
+def category_name(category_id):
+    """Name of the category, or None if it no longer exists."""
+    category = CATEGORIES.get(category_id)
+    return category.name if category is not None else None
+
+
+def target_market_name(target_market_id):
+    """Name of the target market, or None if it no longer exists."""
+    target_market = TARGET_MARKETS.get(target_market_id)
+    return target_market.name if target_market is not None else None
@@ -0,0 +1,138 @@
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Name, DailyDropStat
+
+logger = logging.getLogger(__name__)
+
+
+#===================================
+# Daily drop rollups (DailyDropStat)
+#====================================
+# /analytics/drops reads only from DailyDropStat: one row per (drop_date, extension, domain_list,
+# status) instead of one per name, so a year of history is a few thousand rows.
+#
+# Maintenance is per drop date: whenever names of a date change (loader, midnight transitions,
+# availability checks) that date's buckets are recomputed from its names with one GROUP BY on the
+# drop_date index and upserted. rebuild_drop_rollups_task redoes every date still in the Name
+# table nightly as a safety net.
+#
+# Dates with no names left (archived after 90 days) are never recomputed, so their rollups -
+# the only remaining record of those drops - are kept.
+
+ROLLUP_REBUILD_DATES_PER_BATCH = 31
+
+# Advisory locks per (rollup, drop date): concurrent writers touching the same date queue up,
+# and each recompute reads the data committed before it. Writers on other dates don't wait.
+# Locks are taken in date order, so two writers with overlapping dates can't deadlock.
+_ROLLUP_LOCK_ID = 410041
+
+_BUCKET_FIELDS = ("drop_date", "extension", "domain_list", "status")
+_COUNT_FIELDS = ("name_count", "scored_count", "score_total", "top_rated_count")
+
+
+def _bucket_rows(dates):
+    return (
+        Name.objects
+        .filter(drop_date__in=dates)
+        .order_by()
+        .values(*_BUCKET_FIELDS)
+        .annotate(
+            name_count=Count("id"),
+            scored_count=Count("score"),
+            score_total=Coalesce(Sum("score"), 0),
+            top_rated_count=Count("id", filter=Q(is_top_rated=True)),
+        )
+    )
+
+
+def refresh_drop_rollups(dates):
+    """Recompute the rollup buckets of the given drop dates from their current names."""
+    dates = sorted(set(dates))
+    if not dates:
+        return 0
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for drop_date in dates:  # Sorted above
+                cursor.execute("SELECT pg_advisory_xact_lock(%s, %s)", [_ROLLUP_LOCK_ID, drop_date.toordinal()])
+
+        stats = [DailyDropStat(**row) for row in _bucket_rows(dates)]
+        if stats:
+            DailyDropStat.objects.bulk_create(
+                stats,
+                update_conflicts=True,
+                unique_fields=list(_BUCKET_FIELDS),
+                update_fields=[*_COUNT_FIELDS, "updated_at"],
+            )
+
+        # Buckets that emptied (e.g. every name moved on to another status); only for dates
+        # that still have names - archived dates keep their history
+        live_dates = {stat.drop_date for stat in stats}
+        current = {tuple(getattr(stat, field) for field in _BUCKET_FIELDS) for stat in stats}
+        stale_ids = [
+            stat_id
+            for stat_id, *bucket in DailyDropStat.objects.filter(drop_date__in=live_dates)
+            .values_list("id", *_BUCKET_FIELDS)
+            if tuple(bucket) not in current
+        ]
+        if stale_ids:
+            DailyDropStat.objects.filter(id__in=stale_ids).delete()
+
+    return len(stats)
+
+
+def rebuild_drop_rollups():
+    """Recompute every drop date still present in the Name table (nightly)."""
+    dates = list(Name.objects.order_by("drop_date").values_list("drop_date", flat=True).distinct())
+    buckets = 0
+    for start in range(0, len(dates), ROLLUP_REBUILD_DATES_PER_BATCH):
+        buckets += refresh_drop_rollups(dates[start:start + ROLLUP_REBUILD_DATES_PER_BATCH])
+    logger.info(f"Rebuilt drop rollups for {len(dates)} dates ({buckets} buckets)")
+    return buckets
+
+
+def drop_statistics(start, end, extension=None, domain_list=None):
+    """
+    Per (drop_date, extension) series for start..end from the rollup table only.
+    domain_lists are summed unless one is selected; statuses are broken out.
+    """
+    stats = DailyDropStat.objects.filter(drop_date__range=(start, end))
+    if extension:
+        stats = stats.filter(extension=extension)
+    if domain_list:
+        stats = stats.filter(domain_list=domain_list)
+
+    series = {}
+    for drop_date, ext, status, name_count, scored_count, score_total, top_rated_count in (
+        stats.order_by("drop_date", "extension")
+        .values_list("drop_date", "extension", "status", *_COUNT_FIELDS)
+    ):
+        entry = series.get((drop_date, ext))
+        if entry is None:
+            entry = series[(drop_date, ext)] = {
+                "drop_date": drop_date.isoformat(),
+                "extension": ext,
+                "total": 0,
+                "top_rated": 0,
+                "statuses": {},
+                "_scored": 0,
+                "_score_total": 0,
+            }
+        entry["total"] += name_count
+        entry["top_rated"] += top_rated_count
+        entry["statuses"][status] = entry["statuses"].get(status, 0) + name_count
+        entry["_scored"] += scored_count
+        entry["_score_total"] += score_total
+
+    results = []
+    for entry in series.values():
+        scored = entry.pop("_scored")
+        score_total = entry.pop("_score_total")
+        entry["avg_score"] = round(score_total / scored, 2) if scored else None
+        entry["available_ratio"] = round(entry["statuses"].get("available", 0) / entry["total"], 4) if entry["total"] else None
+        results.append(entry)
+    return results
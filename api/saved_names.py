@@ -0,0 +1,80 @@
+from django.db import connection
+
+from .models import Name, SavedName
+
+
+#===================================
+# Saving / unsaving names in one statement
+#====================================
+# The toggle and the bulk endpoint each run a single data-modifying CTE instead of
+# lookup -> exists check -> insert/delete. One round trip, and no window between the check and
+# the write for a double click (or a second tab) to fall into:
+#   - saving is INSERT ... ON CONFLICT (user_id, name_id) DO NOTHING (the unique_together constraint)
+#   - unsaving is DELETE ... RETURNING
+#   - the toggle only inserts when its DELETE removed nothing
+# Names are matched on domain_name exactly, like get_object_or_404(Name, domain_name=slug) did.
+
+_NAMES = connection.ops.quote_name(Name._meta.db_table)
+_SAVED = connection.ops.quote_name(SavedName._meta.db_table)
+
+_TOGGLE_SQL = f"""
+    WITH target AS (
+        SELECT id FROM {_NAMES} WHERE domain_name = %(slug)s
+    ),
+    removed AS (
+        DELETE FROM {_SAVED} saved USING target
+        WHERE saved.user_id = %(user_id)s AND saved.name_id = target.id
+        RETURNING saved.name_id
+    ),
+    added AS (
+        INSERT INTO {_SAVED} (user_id, name_id, created_at)
+        SELECT %(user_id)s, target.id, now() FROM target
+        WHERE NOT EXISTS (SELECT 1 FROM removed)
+        ON CONFLICT (user_id, name_id) DO NOTHING
+        RETURNING name_id
+    )
+    SELECT EXISTS (SELECT 1 FROM target), EXISTS (SELECT 1 FROM removed)
+"""
+
+_BULK_SQL = f"""
+    WITH targets AS (
+        SELECT id, domain_name FROM {_NAMES}
+        WHERE domain_name = ANY(%(save)s) OR domain_name = ANY(%(unsave)s)
+    ),
+    added AS (
+        INSERT INTO {_SAVED} (user_id, name_id, created_at)
+        SELECT %(user_id)s, targets.id, now() FROM targets
+        WHERE targets.domain_name = ANY(%(save)s)
+        ON CONFLICT (user_id, name_id) DO NOTHING
+    ),
+    removed AS (
+        DELETE FROM {_SAVED} saved USING targets
+        WHERE saved.user_id = %(user_id)s AND saved.name_id = targets.id
+          AND targets.domain_name = ANY(%(unsave)s)
+    )
+    SELECT domain_name FROM targets
+"""
+
+
+def toggle_saved(user_id, slug):
+    """
+    Flip the saved state of one name for the user.
+    Returns the new state (True = saved), or None when no name has that domain_name.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_TOGGLE_SQL, {"user_id": user_id, "slug": slug})
+        found, removed = cursor.fetchone()
+    if not found:
+        return None
+    # Nothing removed means it's saved now: inserted here, or by a concurrent toggle (conflict)
+    return not removed
+
+
+def set_saved(user_id, save=(), unsave=()):
+    """
+    Save the `save` slugs and unsave the `unsave` slugs for the user (idempotent).
+    Returns the set of slugs that matched a name; unmatched ones were ignored.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_BULK_SQL, {"user_id": user_id, "save": list(save), "unsave": list(unsave)})
+        return {domain_name for (domain_name,) in cursor.fetchall()}
@@ -0,0 +1,274 @@
+import contextvars
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F, Case, When, Value, FloatField, IntegerField
+from django.db.models.functions import Length
+from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+
+from . import async_cache
+from .caching import get_or_compute
+from .db_routers import note_write
+from .models import Name, UseCase
+from .serializers import NameSearchValuesSerializer, UseCaseSearchSerializer
+
+
+#===================================
+# Search result cache
+#====================================
+# Search traffic is heavily repetitive (autocomplete prefixes, popular terms), so each
+# paginated search response is cached in Redis under a key built from the normalized
+# query, page and page size. Every key is written under the current "search version";
+# bumping the version (loader inserts, archival) makes all older entries unreachable
+# without having to scan and delete them.
+
+SEARCH_CACHE_VERSION_KEY = "search_cache_version"
+SEARCH_CACHE_TTL = settings.SEARCH_CACHE_TTL
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(raw_query):
+    """
+    Normalize a raw search term so equivalent queries share a cache entry:
+    - strips and collapses whitespace
+    - lowercases (both search views match case-insensitively)
+    """
+    return _WHITESPACE_RE.sub(" ", (raw_query or "").strip()).lower()
+
+
+def get_search_version():
+    """Current search cache version (created on first use)."""
+    return cache.get_or_set(SEARCH_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+async def aget_search_version():
+    """get_search_version() for async views."""
+    version = await async_cache.get(SEARCH_CACHE_VERSION_KEY)
+    if version is None:
+        await async_cache.add(SEARCH_CACHE_VERSION_KEY, 1)
+        version = await async_cache.get(SEARCH_CACHE_VERSION_KEY, 1)
+    return version
+
+
+def bump_search_version():
+    """
+    Invalidate every cached search page in one step.
+    Called whenever the set of searchable names/use cases changes.
+    """
+    note_write()  # Don't let a lagging replica refill the new version with old rows
+    try:
+        return cache.incr(SEARCH_CACHE_VERSION_KEY)
+    except ValueError:
+        # Key missing (evicted or never set) - start a fresh version sequence
+        cache.set(SEARCH_CACHE_VERSION_KEY, 2, timeout=None)
+        return 2
+
+
+def _cache_key(kind, query, *parts):
+    query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    return ":".join(["search", kind, query_hash, *map(str, parts)])
+
+
+def _page_cache_key(kind, query, request, paginator):
+    page = request.query_params.get(paginator.page_query_param) or 1
+    page_size = paginator.get_page_size(request)
+    return _cache_key(kind, query, page, page_size)
+
+
+def get_cached_search_page(kind, query, request, paginator):
+    """
+    Return a paginated Response for a cached search page, or None on a miss.
+    next/previous links are rebuilt from the current request, so only the
+    count and the serialized results need to live in the cache.
+    """
+    key = _page_cache_key(kind, query, request, paginator)
+    cached = cache.get(key, version=get_search_version())
+    if cached is None:
+        return None
+    return _cached_page_response(cached, request, paginator)
+
+
+async def aget_cached_search_page(kind, query, request, paginator):
+    """get_cached_search_page() for async views."""
+    key = _page_cache_key(kind, query, request, paginator)
+    cached = await async_cache.get(key, version=await aget_search_version())
+    if cached is None:
+        return None
+    return _cached_page_response(cached, request, paginator)
+
+
+def _cached_page_response(cached, request, paginator):
+    # Rebuild the page object from the cached count so the paginator produces
+    # exactly the same links it would have produced from the database.
+    paginator.request = request
+    django_paginator = paginator.django_paginator_class(
+        range(cached["count"]), paginator.get_page_size(request)
+    )
+    django_paginator.count_is_approximate = cached.get("count_is_approximate", False)
+    paginator.page = django_paginator.page(paginator.get_page_number(request, django_paginator))
+    paginator.page.has_more = cached.get("has_more", False)  # "next" for approximate counts
+    return paginator.get_paginated_response(cached["results"])
+
+
+def cache_search_page(kind, query, request, paginator, results):
+    """Store the current page (after paginate_queryset) under the current search version."""
+    key = _page_cache_key(kind, query, request, paginator)
+    django_paginator = paginator.page.paginator
+    payload = {
+        "count": django_paginator.count,
+        "count_is_approximate": django_paginator.count_is_approximate,
+        "has_more": paginator.page.has_next(),
+        "results": results,
+    }
+    cache.set(key, payload, SEARCH_CACHE_TTL, version=get_search_version())
+
+
+
+#===================================
+# Search queries
+#====================================
+# Shared by the per-type search views and the federated /search endpoint.
+
+USE_CASE_SEARCH_MAX_RESULTS = 2000
+
+
+def name_search_queryset(query):
+    """
+    Ranked, case-insensitive containment search over domain names:
+    exact match > starts with > contains, shorter names first within a rank.
+    """
+    return (
+        Name.objects
+        .filter(domain_name__icontains=query)
+        # 1. Annotate each object with a 'rank' and 'domain_length'
+        .annotate(
+            rank=Case(
+                # Exact match = 1.0 (will become 100%)
+                When(domain_name__iexact=query, then=Value(1.0)),
+                # Starts with match = 0.75 (will become 75%)
+                When(domain_name__istartswith=query, then=Value(0.75)),
+                # Contains match = 0.5 (will become 50%)
+                default=Value(0.5),
+                output_field=FloatField(), # Use FloatField for decimal values
+            ),
+            domain_length=Length('domain_name')
+        )
+        # 2. Order by the new rank (highest first), then by length (shortest first)
+        .order_by('-rank', 'domain_length')
+    )
+
+
+def use_case_search_results(query, max_results=USE_CASE_SEARCH_MAX_RESULTS):
+    """
+    PostgreSQL full-text search over use cases.
+    Returns a list sorted by full-match flag (multi-word queries) then rank.
+    """
+    # Check if the search has multiple words
+    is_multi_word = len(query.split()) > 1
+
+    search_vector_obj = (
+        SearchVector("case_title", weight="A") +
+        SearchVector("description", weight="B") +
+        SearchVector("category__name", weight="C") +
+        SearchVector("tag__name", weight="C") +
+        SearchVector("target_markets__name", weight="C") +
+        SearchVector("business_model", weight="C")
+    )
+
+    query_websearch = SearchQuery(query, search_type="websearch")
+    query_plain = SearchQuery(query, search_type="plain")
+
+    base_qs = (
+        UseCase.objects
+        .select_related("category", "domain_name")  # both are read by UseCaseSearchSerializer
+        .annotate(search_vector=search_vector_obj)
+        .annotate(
+            # The true relevance score from the database
+            rank=SearchRank(F('search_vector'), query_websearch),
+            # A flag to prioritize full matches on multi-word searches
+            is_full_match=Case(
+                When(search_vector=query_plain, then=Value(1 if is_multi_word else 0)),
+                default=Value(0),
+                output_field=IntegerField()
+            )
+        )
+        .filter(rank__gt=0.1)
+    )
+
+    # De-duplicate at the DB level, ordering by pk to satisfy the DISTINCT ON rule
+    # We include our real sorting criteria to help the DB pick the best row.
+    final_deduplicated_qs = (
+        base_qs
+        .order_by('pk', '-is_full_match', '-rank')
+        .distinct('pk')
+    )
+
+    # Execute the query
+    results_list = list(final_deduplicated_qs[:max_results])
+
+    # Sort in Python by our desired criteria: full matches first, then by rank.
+    return sorted(results_list, key=lambda item: (item.is_full_match, item.rank), reverse=True)
+
+
+
+
+#===================================
+# Federated search (names + use cases in one request)
+#====================================
+FEDERATED_DEFAULT_LIMIT = 5
+FEDERATED_MAX_LIMIT = 20
+
+# Small process-wide pool; the request thread runs one of the two searches itself,
+# so one worker per in-flight federated request is enough.
+_federated_executor = ThreadPoolExecutor(
+    max_workers=settings.FEDERATED_SEARCH_WORKERS,
+    thread_name_prefix="federated-search",
+)
+
+
+def _top_names(query, limit):
+    return NameSearchValuesSerializer().serialize(name_search_queryset(query)[:limit])
+
+
+def _top_use_cases(query, limit):
+    return UseCaseSearchSerializer(use_case_search_results(query, max_results=limit), many=True).data
+
+
+def _run_in_pool_thread(func, *args):
+    """
+    Pool threads get their own DB connection; apply the same CONN_MAX_AGE/health
+    handling Django applies around a normal request so they don't leak stale connections.
+    """
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def federated_search(query, names_limit, usecases_limit):
+    """
+    Run the name and use-case searches concurrently and return both groups.
+    Latency is the slower of the two queries rather than their sum.
+    Results are cached under the search version like the paginated views.
+    """
+    def compute():
+        # copy_context: the pool thread reads from the same database (replica or primary) as the request
+        names_future = _federated_executor.submit(
+            contextvars.copy_context().run, _run_in_pool_thread, _top_names, query, names_limit
+        )
+        usecases = _top_use_cases(query, usecases_limit)
+        return {
+            "query": query,
+            "names": names_future.result(),
+            "usecases": usecases,
+        }
+
+    # Popular queries are hit concurrently; only one request per key runs the searches
+    key = _cache_key("federated", query, names_limit, usecases_limit)
+    return get_or_compute(key, compute, SEARCH_CACHE_TTL, version=get_search_version())
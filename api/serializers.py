@@ -4,8 +4,11 @@ from django.contrib.auth.models import User
 # from dj_rest_auth.registration.serializers import RegisterSerializer
 # Importing dj-rest default login serializer
 # from dj_rest_auth.serializers import LoginSerializer
+from operator import itemgetter
+
 from rest_framework import serializers
 from .models import AppUser, Name, UseCase, UseCaseTag, UseCaseCategory, IdeaOfTheDay, PlanModel, Subscription, NewsLetter, PublicInquiry, AcquiredName, SavedName
+from .reference import category_name, target_market_name
 import re
 
 
@@ -38,6 +41,7 @@ class AppUserSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "created_at",
+            "subscription",
         ]
         read_only_fields = ["clerk_id", "email", "created_at"]
 
@@ -128,6 +132,19 @@ class UseCaseSerializer(serializers.ModelSerializer):
 
         
 
+# Drops fields the client didn't ask for via ?fields= / ?expand= (see api/fieldsets.py)
+class SparseFieldsSerializerMixin:
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is not None:
+            for field_name in list(fields):
+                if field_name not in requested:
+                    fields.pop(field_name)
+        return fields
+
+
+
 # Suggested use case serializer - For use in the Name serializer
 class SuggestedUseCaseSerializer(serializers.ModelSerializer):
     domain_name = serializers.SlugRelatedField(
@@ -151,7 +168,7 @@ class SuggestedUseCaseSerializer(serializers.ModelSerializer):
 
 
 
-class NameSerializer(serializers.ModelSerializer):
+class NameSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     suggested_usecase = SuggestedUseCaseSerializer(read_only=True)
     other_use_cases = serializers.SerializerMethodField()
     saved = serializers.SerializerMethodField()
@@ -169,14 +186,19 @@ class NameSerializer(serializers.ModelSerializer):
     def get_saved(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            # Annotated by the fieldset-aware views, so no extra query per row
+            if hasattr(obj, 'is_saved'):
+                return obj.is_saved
             return obj.savedname_set.filter(user=request.user).exists()
         return False
 
     # Exclude the suggested one (order=1)
     def get_other_use_cases(self, obj):
-        return UseCaseSerializer(
-            obj.use_cases.exclude(order=1), many=True
-        ).data
+        # Prefetched (already excluding order=1) by the fieldset-aware views
+        use_cases = getattr(obj, 'prefetched_other_use_cases', None)
+        if use_cases is None:
+            use_cases = obj.use_cases.exclude(order=1)
+        return UseCaseSerializer(use_cases, many=True).data
         
 
     def create(self, validated_data):
@@ -302,7 +324,7 @@ class AcquiredNameSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AcquiredName
-        fields = ['id', 'name', 'created_at']
+        fields = ['id', 'name', 'acquired_at']
 
 
 
@@ -486,6 +508,144 @@ class PublicInquirySerializer(serializers.ModelSerializer):
 
 
 
+# ============================================
+# Fast read serializers (values()-based)
+# ============================================
+# Read-only twins of the ModelSerializers used on the hot dashboard/search/idea list endpoints.
+# They read rows with .values_list() - no model instance per row and no walking DRF field
+# objects - and emit exactly the same JSON shape. Parity with the ModelSerializers is
+# checked in api/tests.py, so keep both in sync when a field is added.
+
+def _iso_date(value):
+    return value.isoformat()
+
+
+class ValuesSerializer:
+    """
+    Base class. Subclasses declare `fields` as (output key, ORM lookup, converter) triples;
+    converter=None emits the DB value as-is (None always passes through, like DRF).
+    Several keys may share a lookup (e.g. Name.slug is just domain_name) - it is only selected once.
+    Usage:
+        serializer = DashboardNameValuesSerializer()
+        data = serializer.serialize(queryset)
+    or, when paginating:
+        page = paginator.paginate_queryset(serializer.rows(queryset), request)
+        data = serializer.to_representation(page)
+    """
+    __slots__ = ("_keys", "_lookups", "_pick", "_converters")
+    fields = ()
+
+    def __init__(self, include=None):
+        # include: optional set of output keys to keep (sparse fieldsets); None keeps everything
+        spec = [field for field in self.fields if include is None or field[0] in include]
+        self._keys = tuple(key for key, _, _ in spec)
+        self._lookups = tuple(dict.fromkeys(lookup for _, lookup, _ in spec))
+        positions = tuple(self._lookups.index(lookup) for _, lookup, _ in spec)
+        # Only reorder/duplicate columns when the selected lookups don't line up 1:1 with the keys
+        self._pick = None if positions == tuple(range(len(positions))) else itemgetter(*positions)
+        self._converters = tuple((key, converter) for key, _, converter in spec if converter is not None)
+
+    def rows(self, queryset):
+        """Tuple rows for the queryset. Relations are joined by the lookups, so select/prefetch are dropped."""
+        return queryset.select_related(None).prefetch_related(None).values_list(*self._lookups)
+
+    def to_representation(self, rows):
+        keys = self._keys
+        pick = self._pick
+        converters = self._converters
+        data = []
+        for row in rows:
+            item = dict(zip(keys, pick(row) if pick else row))
+            for key, converter in converters:
+                value = item[key]
+                if value is not None:
+                    item[key] = converter(value)
+            data.append(item)
+        return data
+
+    def serialize(self, queryset):
+        return self.to_representation(self.rows(queryset))
+
+
+class DashboardNameValuesSerializer(ValuesSerializer):
+    """Same output as DashboardNameSerializer."""
+    __slots__ = ()
+    fields = (
+        ("domain_list", "domain_list", None),
+        ("domain_name", "domain_name", None),
+        ("slug", "domain_name", None),
+        ("is_top_rated", "is_top_rated", None),
+        ("drop_date", "drop_date", _iso_date),
+        ("score", "score", None),
+        ("length", "length", None),
+        ("status", "status", None),
+    )
+
+
+class NameSearchValuesSerializer(ValuesSerializer):
+    """Same output as NameSearchSerializer (expects the 'rank' annotation from name_search_queryset)."""
+    __slots__ = ()
+    fields = (
+        ("id", "id", None),
+        ("domain_name", "domain_name", None),
+        ("slug", "domain_name", None),
+        ("rank", "rank", float),
+        ("status", "status", None),
+        ("domain_list", "domain_list", None),
+    )
+
+
+class UseCaseListValuesSerializer(ValuesSerializer):
+    """
+    Same output as UseCaseListSerializer.
+    target_markets is many-to-many, so it is fetched for the whole page in one extra query
+    (instead of one query per row) and attached after the scalar fields.
+    Category and target market names are resolved from the reference cache (api/reference.py).
+    """
+    __slots__ = ("_with_target_markets",)
+    fields = (
+        ("case_title", "case_title", None),
+        ("slug", "slug", None),
+        ("category", "category_id", category_name),  # name comes from the reference cache, no join
+        ("competition", "competition", None),
+        ("difficulty", "difficulty", None),
+    )
+
+    def __init__(self, include=None):
+        super().__init__(include)
+        self._with_target_markets = include is None or "target_markets" in include
+
+    def rows(self, queryset):
+        # pk rides along at the end of each row for the target market lookup
+        return queryset.select_related(None).prefetch_related(None).values_list(*self._lookups, "pk")
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        if not rows:
+            return []
+        if not self._with_target_markets:
+            return super().to_representation(row[:-1] for row in rows)
+        pks = [row[-1] for row in rows]
+
+        target_markets = {}
+        through_rows = (
+            UseCase.target_markets.through.objects
+            .filter(usecase_id__in=pks)
+            .order_by("pk")
+            .values_list("usecase_id", "targetmarket_id")
+        )
+        for usecase_id, market_id in through_rows:
+            target_markets.setdefault(usecase_id, []).append(target_market_name(market_id))
+
+        data = super().to_representation(row[:-1] for row in rows)
+        for item, pk in zip(data, pks):
+            item["target_markets"] = target_markets.get(pk, [])
+        return data
+
+
+
+
+
 # Email validation serializer (To be used in settings.py) - Not in use as Auth is now with Clerk
 # class CustomRegisterSerializer(RegisterSerializer):
 #     email = serializers.EmailField(required=True)
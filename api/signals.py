@@ -2,8 +2,13 @@ from django.core.cache import cache
 from django.contrib.auth.models import User
 
 from django.db.models.signals import post_save, post_delete, pre_delete
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Name, UseCase, UploadedFile 
+from .models import Name, UseCase, UploadedFile, IdeaOfTheDay, AppUser, Subscription
+from .authentication import forget_user
+from .metering import forget_subscription
+from .conditional import bump_data_version, NAMES, IDEAS
+from .reference import REFERENCE_TABLES
 
 from django.conf import settings
 import os
@@ -57,6 +62,73 @@ def clean_up_suggested_usecase(sender, instance, **kwargs):
 
 
 
+# --- Data versions for conditional GET (see api/conditional.py) ---
+# Bumped after commit so a poll can't pick up the new ETag before the new data is visible.
+# Bulk writes (loader, transition and availability tasks) bump explicitly instead.
+
+# Name fields that no polled endpoint renders
+_UNPOLLED_NAME_FIELDS = {"suggested_usecase", "last_checked"}
+
+
+class _NameDatesBump:
+    """on_commit callback: one NAMES bump for every drop date collected during the transaction."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.dates = set()
+
+    def __call__(self):
+        self.connection._pending_name_dates_bump = None
+        bump_data_version(NAMES, *(self.dates - {None}))
+
+
+def _bump_name_dates_on_commit(*dates):
+    # Once per transaction however many names change (archival deletes thousands in one)
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_pending_name_dates_bump", None)
+    # A rollback discards the queued callback; the next change then queues a new one
+    if pending is None or not any(func is pending for _, func, _ in connection.run_on_commit):
+        pending = connection._pending_name_dates_bump = _NameDatesBump(connection)
+        pending.dates.update(dates)
+        transaction.on_commit(pending)  # Runs right away outside a transaction
+    else:
+        pending.dates.update(dates)
+
+
+@receiver(post_save, sender=Name)
+def bump_name_data_version(sender, instance, created, update_fields=None, **kwargs):
+    stored_drop_date = getattr(instance, "_stored_drop_date", None)  # Set by Name.from_db
+    if update_fields is None or "drop_date" in update_fields:
+        instance._stored_drop_date = instance.drop_date
+    # New names come from the loader, which bumps once per batch
+    if created:
+        return
+    if update_fields is not None and set(update_fields) <= _UNPOLLED_NAME_FIELDS:
+        return
+    # A name moved to another drop date changes that date's responses too
+    _bump_name_dates_on_commit(instance.drop_date, stored_drop_date)
+
+
+@receiver(post_delete, sender=Name)
+def bump_deleted_name_data_version(sender, instance, **kwargs):
+    _bump_name_dates_on_commit(instance.__dict__.get("drop_date"))
+
+
+@receiver([post_save, post_delete], sender=IdeaOfTheDay)
+def bump_idea_data_version(sender, instance, **kwargs):
+    drop_date = instance.drop_date
+    transaction.on_commit(lambda: bump_data_version(IDEAS, drop_date))
+
+
+@receiver(post_save, sender=UseCase)
+def bump_idea_content_version(sender, instance, created, **kwargs):
+    # Edited use cases may be embedded in an idea of the day; new ones can't be yet
+    if not created:
+        transaction.on_commit(lambda: bump_data_version(IDEAS))
+
+
+
+
 @receiver(pre_delete, sender=UploadedFile)
 def delete_uploaded_file(sender, instance, **kwargs):
     """
@@ -68,4 +140,43 @@ def delete_uploaded_file(sender, instance, **kwargs):
             os.remove(file_path)
             logger.info(f"Deleted file: {file_path}")
     except Exception as e:
-        logger.error(f"Failed to delete file {instance.filename}: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to delete file {instance.filename}: {str(e)}")
+
+
+
+
+#===================================
+# Reference data cache invalidation (api/reference.py)
+#====================================
+def invalidate_reference_table(sender, **kwargs):
+    """
+    Drop this process's copy right away (later reads in the same transaction see the change),
+    and bump the Redis version once committed so every other process reloads too.
+    """
+    table = REFERENCE_TABLES[sender]
+    table.clear_local()
+    transaction.on_commit(table.bump_version)
+
+
+for _reference_model in REFERENCE_TABLES:
+    post_save.connect(invalidate_reference_table, sender=_reference_model, dispatch_uid=f"refdata_save_{_reference_model.__name__}")
+    post_delete.connect(invalidate_reference_table, sender=_reference_model, dispatch_uid=f"refdata_delete_{_reference_model.__name__}")
+
+
+
+
+# Authenticated user cache (api/authentication.py): any change to an AppUser drops its cached copy
+@receiver([post_save, post_delete], sender=AppUser)
+def forget_cached_app_user(sender, instance, **kwargs):
+    clerk_id = instance.pk
+    forget_user(clerk_id)
+    # Again after commit, in case a request re-cached the old row in between
+    transaction.on_commit(lambda: forget_user(clerk_id))
+
+
+# Subscription state cache (api/metering.py): same idea, keyed by the subscription's user
+@receiver([post_save, post_delete], sender=Subscription)
+def forget_cached_subscription(sender, instance, **kwargs):
+    user_id = instance.user_id
+    forget_subscription(user_id)
+    transaction.on_commit(lambda: forget_subscription(user_id))
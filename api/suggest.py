@@ -0,0 +1,116 @@
+import re
+
+from django_redis import get_redis_connection
+
+
+#===================================
+# Domain name autocomplete index
+#====================================
+# A single Redis sorted set where every member has score 0, so ZRANGEBYLEX walks the
+# members in lexicographic order and a prefix lookup is one O(log N + k) call.
+#
+# Member format: "<term>|<domain_name>"
+#   - term: lowercased text the user may type (full domain, or a word stem inside it)
+#   - domain_name: the original, display-cased domain returned to the client
+#
+# e.g. GreenPulse.co is indexed as "greenpulse.co|GreenPulse.co" and "pulse.co|GreenPulse.co",
+# so both "gre" and "pul" complete to it.
+
+SUGGEST_INDEX_KEY = "suggest:names"
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 25
+
+_TERM_SEPARATOR = "|"
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_VALID_PREFIX_RE = re.compile(r"^[a-z0-9.\-]+$")
+
+
+def _index_terms(domain_name):
+    """
+    Terms a domain is reachable by: the full lowercased domain plus one term per
+    CamelCase word boundary in the name part (keeping the extension attached).
+    """
+    name_part, _, extension = domain_name.partition(".")
+    suffix = f".{extension.lower()}" if extension else ""
+
+    terms = [domain_name.lower()]
+    for boundary in _CAMEL_BOUNDARY_RE.finditer(name_part):
+        terms.append(name_part[boundary.start():].lower() + suffix)
+    return terms
+
+
+def _members(domain_names):
+    return [
+        f"{term}{_TERM_SEPARATOR}{domain_name}"
+        for domain_name in domain_names
+        for term in _index_terms(domain_name)
+    ]
+
+
+def add_names_to_suggest_index(domain_names):
+    """Index newly loaded domains (single ZADD round trip)."""
+    members = _members(domain_names)
+    if members:
+        get_redis_connection("default").zadd(SUGGEST_INDEX_KEY, {member: 0 for member in members})
+
+
+def remove_names_from_suggest_index(domain_names):
+    """Prune archived/deleted domains from the index."""
+    members = _members(domain_names)
+    if members:
+        get_redis_connection("default").zrem(SUGGEST_INDEX_KEY, *members)
+
+
+def rebuild_suggest_index(domain_names, chunk_size=5000):
+    """
+    Replace the whole index with the given domains.
+    Built under a temporary key and swapped in with RENAME so readers never see a partial index.
+    """
+    redis_conn = get_redis_connection("default")
+    tmp_key = f"{SUGGEST_INDEX_KEY}:rebuild"
+    redis_conn.delete(tmp_key)
+
+    chunk = []
+    indexed = 0
+    for domain_name in domain_names:
+        chunk.append(domain_name)
+        if len(chunk) >= chunk_size:
+            redis_conn.zadd(tmp_key, {member: 0 for member in _members(chunk)})
+            indexed += len(chunk)
+            chunk = []
+    if chunk:
+        redis_conn.zadd(tmp_key, {member: 0 for member in _members(chunk)})
+        indexed += len(chunk)
+
+    if indexed:
+        redis_conn.rename(tmp_key, SUGGEST_INDEX_KEY)
+    else:
+        redis_conn.delete(SUGGEST_INDEX_KEY)
+    return indexed
+
+
+def suggest_names(prefix, limit=SUGGEST_DEFAULT_LIMIT):
+    """
+    Return up to `limit` display-cased domain names whose full name or a word stem
+    starts with `prefix`. Never touches the database.
+    """
+    prefix = (prefix or "").strip().lower()
+    if not prefix or not _VALID_PREFIX_RE.match(prefix):
+        return []
+
+    # A domain can match through more than one term, so over-fetch and de-duplicate
+    raw_members = get_redis_connection("default").zrangebylex(
+        SUGGEST_INDEX_KEY, f"[{prefix}", f"[{prefix}\xff", start=0, num=limit * 2
+    )
+
+    results = []
+    seen = set()
+    for raw in raw_members:
+        member = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        domain_name = member.split(_TERM_SEPARATOR, 1)[1]
+        if domain_name not in seen:
+            seen.add(domain_name)
+            results.append(domain_name)
+            if len(results) >= limit:
+                break
+    return results
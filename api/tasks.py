@@ -2,16 +2,24 @@ from celery import shared_task, chain
 from celery.exceptions import Retry
 
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.db.models import Q
 from django.db import transaction, models
 
-from .models import Name, ArchivedName, IdeaOfTheDay, UseCase, UploadedFile
+from .models import Name, ArchivedName, IdeaOfTheDay, UseCase, UploadedFile, AppUser
 from .handlers.services import RapidAPIBulkDomainAPI
+from .search import bump_search_version
+from .suggest import remove_names_from_suggest_index
+from .conditional import bump_data_version, NAMES
+from .featured import refresh_featured_usecases
+from .rollups import refresh_drop_rollups, rebuild_drop_rollups
+from .metering import flush_usage
 
 from pathlib import Path
 from django.conf import settings
 import subprocess
+import requests
 # from datetime import date
 import logging
 
@@ -67,10 +75,11 @@ def archive_old_domains_task(self):
             qs = Name.objects.filter(drop_date__lt=cutoff.date()).order_by('id')
 
             try:
+                archived_domain_names = []
                 with transaction.atomic():
                     # Single-pass batch processing
                     for ids in batch(qs.values_list('id', flat=True), BATCH_SIZE):
-                        batch_domains = Name.objects.filter(id__in=ids)
+                        batch_domains = list(Name.objects.filter(id__in=ids))
                         ArchivedName.objects.bulk_create(
                             [ArchivedName(**{
                                 f.name: getattr(d, f.name)
@@ -78,8 +87,14 @@ def archive_old_domains_task(self):
                                 if hasattr(d, f.name)
                             }) for d in batch_domains]
                         )
-                        batch_domains.delete()
+                        Name.objects.filter(id__in=ids).delete()
+                        archived_domain_names.extend(d.domain_name for d in batch_domains)
                         logger.info(f"Archived batch {ids[0]}-{ids[-1]}")
+
+                # Archived names must drop out of cached search pages and the autocomplete index
+                if archived_domain_names:
+                    bump_search_version()
+                    remove_names_from_suggest_index(archived_domain_names)
             except Exception as e:
                 logger.exception("Archival failed at batch")
                 raise self.retry(exc=e, countdown=300)
@@ -122,6 +137,8 @@ def transition_pending_to_deleting_today_task(self, **kwargs):
         # Update in bulk
         with transaction.atomic():
             qs.update(domain_list=DomainListOptions.DELETING_TODAY)
+        bump_data_version(NAMES, current_date)
+        refresh_drop_rollups([current_date])
 
         logger.info(f"Moved {ready_count} domains to deleting_today at {current_date}")
 
@@ -217,10 +234,13 @@ def transition_deleting_today_to_deleted_task(self, **kwargs):
 
         # Prepare data for processing
         all_ready_ids = ready_qs.values_list('id', flat=True)
+        affected_dates = list(ready_qs.order_by().values_list('drop_date', flat=True).distinct())
 
         # Execute updates in single transaction
         with transaction.atomic():
             process_bulk_transitions(all_ready_ids)
+        bump_data_version(NAMES, *affected_dates)
+        refresh_drop_rollups(affected_dates)
 
         # 7. FINAL LOGGING ===================================================
         logger.info(
@@ -391,6 +411,9 @@ def check_domain_availability_subtask(self, domain_ids):
         ],
         fields=['status', 'last_checked']
     )
+    affected_dates = {domain.drop_date for domain in domains}
+    bump_data_version(NAMES, *affected_dates)
+    refresh_drop_rollups(affected_dates)
 
     # Detailed logging
     counts = {
@@ -545,6 +568,7 @@ def second_check_subtask(self, batch):
     status_api = RapidAPIBulkDomainAPI()
     now = timezone.now()
     updates = []
+    affected_dates = set()
 
     try:
         results = status_api.check_bulk_domain_availability(batch)
@@ -552,9 +576,12 @@ def second_check_subtask(self, batch):
             availability = results.get(domain.domain, 'unknown')
             new_status = 'taken' if availability == 'taken' else domain.status
             updates.append(Name(id=domain.id, status=new_status, last_checked=now))
+            affected_dates.add(domain.drop_date)
 
         if updates:
             Name.objects.bulk_update(updates, fields=['status', 'last_checked'])
+            bump_data_version(NAMES, *affected_dates)
+            refresh_drop_rollups(affected_dates)
 
         logger.debug("Batch of %d domains rechecked", len(batch))
 
@@ -581,6 +608,77 @@ def daily_maintenance_task(self):
 
 
 
+# Featured use cases refresh (keeps the ?featured=true cache warm)
+@shared_task(bind=True, ignore_result=True, time_limit=120)
+def refresh_featured_usecases_task(self):
+    """
+    Rebuilds the featured use case payload ahead of its cache expiry,
+    so /ideas/list?featured=true never computes it on the request path.
+    """
+    payload = refresh_featured_usecases()
+    logger.info(f"Featured use cases refreshed ({len(payload)} items)")
+
+
+
+# Nightly rebuild of the drop rollups behind /analytics/drops
+@shared_task(bind=True, ignore_result=True, time_limit=1800)
+def rebuild_drop_rollups_task(self):
+    """
+    Recomputes DailyDropStat for every drop date still in the Name table.
+    The tasks above keep touched dates current during the day; this catches
+    anything they missed (admin edits, manual fixes).
+    """
+    rebuild_drop_rollups()
+
+
+
+# Clerk created_at backfill for new users (queued by ClerkJWTAuthentication)
+@shared_task(bind=True, ignore_result=True, time_limit=60, max_retries=3)
+def backfill_clerk_created_at_task(self, clerk_id):
+    """
+    Replaces a new AppUser's created_at (the time we first saw them) with the account's
+    real creation time from the Clerk Management API. Runs here so logins never wait on Clerk.
+    """
+    try:
+        response = requests.get(
+            f"{settings.CLERK_API_BASE_URL}/users/{clerk_id}",
+            headers={"Authorization": f"Bearer {settings.CLERK_SECRET_KEY}"},
+            timeout=10,
+        )
+        logger.debug(f"Clerk Management API status: {response.status_code}")
+        response.raise_for_status()
+        created_raw = response.json().get("created_at")
+    except requests.RequestException as e:
+        raise self.retry(exc=e, countdown=60)
+
+    # Clerk sends epoch milliseconds; ISO strings are accepted too
+    if isinstance(created_raw, (int, float)):
+        true_created = datetime.fromtimestamp(created_raw / 1000, tz=dt_timezone.utc)
+    else:
+        true_created = parse_datetime(created_raw) if created_raw else None
+    if true_created is None:
+        logger.warning(f"Failed to parse Clerk created_at for {clerk_id}: {created_raw!r}")
+        return
+
+    user = AppUser.objects.filter(clerk_id=clerk_id).first()
+    if user is None:
+        return
+    user.created_at = true_created
+    user.save(update_fields=["created_at"])  # post_save drops the cached copy (api/signals.py)
+
+
+
+# Metered API usage: Redis day counters -> ApiUsage (billing)
+@shared_task(bind=True, ignore_result=True, time_limit=300)
+def flush_api_usage_task(self):
+    """
+    Copies the usage counters changed since the last run into ApiUsage (see api/metering.py).
+    Runs every few minutes; the counters stay in Redis for days, so missed runs lose nothing.
+    """
+    flush_usage()
+
+
+
 # Auto-Loader Task
 @shared_task(bind=True, ignore_result=True, time_limit=300)
 def process_pending_files(self):
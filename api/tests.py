@@ -1,3 +1,710 @@
-from django.test import TestCase
+import json
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import export, metering, search
+from .authentication import ClerkJWTAuthentication
+from .data.helpers import DROP_TIMES
+from .models import (
+    AppUser, Name, UseCase, UseCaseCategory, UseCaseTag, TargetMarket, IdeaOfTheDay,
+    SavedName, AcquiredName, PlanModel, Subscription, DomainListOptions, ApiUsage,
+)
+from .reference import REFERENCE_TABLES
+from .rollups import rebuild_drop_rollups
+from .search import name_search_queryset
+from .urls import urlpatterns
+from .async_urls import urlpatterns as async_urlpatterns, ASYNC_VIEWS
+from .serializers import (
+    DashboardNameSerializer, NameSearchSerializer, UseCaseListSerializer,
+    DashboardNameValuesSerializer, NameSearchValuesSerializer, UseCaseListValuesSerializer,
+)
+
+
+#===================================
+# Shared fixtures
+#====================================
+class NameFixturesMixin:
+    @classmethod
+    def setUpTestData(cls):
+        fintech = UseCaseCategory.objects.create(name="Fintech", slug="fintech")
+        health = UseCaseCategory.objects.create(name="Health", slug="health")
+        ai_tag = UseCaseTag.objects.create(name="AI")
+        smb = TargetMarket.objects.create(name="Small businesses")
+        freelancers = TargetMarket.objects.create(name="Freelancers")
+
+        today = date.today()
+        for i, domain in enumerate(["Voyance.co", "VoyBot.io", "GreenPulse.co", "FlowFit.ai", "Cene.io"]):
+            name = Name.objects.create(
+                domain_name=domain,
+                drop_date=today - timedelta(days=i % 2),
+                score=4 + i,
+                is_top_rated=(4 + i) >= 8,
+            )
+            for order in (1, 2):
+                use_case = UseCase.objects.create(
+                    domain_name=name,
+                    case_title=f"Idea {domain} {order}",
+                    description="Invoicing and payments for small teams",
+                    difficulty="easy",
+                    competition="low",
+                    revenue_potential="high",
+                    order=order,
+                    category=fintech if order == 1 else health,
+                    business_model="B2B",
+                )
+                use_case.tag.add(ai_tag)
+                # Mix of zero, one and two target markets
+                if i % 3 == 1:
+                    use_case.target_markets.add(smb)
+                elif i % 3 == 2:
+                    use_case.target_markets.add(smb, freelancers)
+
+
+
+
+#===================================
+# values()-based serializer parity
+#====================================
+class ValuesSerializerParityTests(NameFixturesMixin, TestCase):
+    """The fast read serializers must emit exactly what their ModelSerializer twins emit."""
+
+    def assertSameOutput(self, expected, actual):
+        self.assertEqual(list(expected), actual)
+        # Same rendered bytes too (types, key order)
+        self.assertEqual(JSONRenderer().render(expected), JSONRenderer().render(actual))
+
+    def test_dashboard_names(self):
+        qs = Name.objects.order_by('-score', '-created_at', 'domain_name')
+        self.assertSameOutput(
+            DashboardNameSerializer(qs, many=True).data,
+            DashboardNameValuesSerializer().serialize(qs),
+        )
+
+    def test_name_search(self):
+        qs = name_search_queryset("voy")
+        self.assertSameOutput(
+            NameSearchSerializer(qs, many=True).data,
+            NameSearchValuesSerializer().serialize(qs),
+        )
+
+    def test_use_case_list(self):
+        qs = UseCase.objects.select_related("domain_name", "category").order_by("-created_at", "order")
+        self.assertSameOutput(
+            UseCaseListSerializer(qs, many=True).data,
+            UseCaseListValuesSerializer().serialize(qs),
+        )
+
+    def test_use_case_list_category_written_without_signals(self):
+        for table in REFERENCE_TABLES.values():
+            table.clear_local()
+        UseCaseListValuesSerializer().serialize(UseCase.objects.all())  # Reference cache loaded
+        # bulk_create fires no post_save, so the reference version is never bumped
+        [legal] = UseCaseCategory.objects.bulk_create([UseCaseCategory(name="Legal", slug="legal")])
+        UseCase.objects.filter(order=1).update(category=legal)
+
+        qs = UseCase.objects.select_related("domain_name", "category").order_by("-created_at", "order")
+        self.assertSameOutput(
+            UseCaseListSerializer(qs, many=True).data,
+            UseCaseListValuesSerializer().serialize(qs),
+        )
+
+    def test_empty_querysets(self):
+        self.assertEqual(UseCaseListValuesSerializer().serialize(UseCase.objects.none()), [])
+        self.assertEqual(DashboardNameValuesSerializer().serialize(Name.objects.none()), [])
+
+
+
+
+#===================================
+# Performance contract: query budgets and query plans per endpoint
+#====================================
+# Seeds a dataset shaped like a few days of production drops, then
+#   - calls every route in api/urls.py and fails if it runs more queries than its budget
+#     (N+1 regressions show up as a count that grows with the page size)
+#   - EXPLAINs the queries of the hot read endpoints with enable_seqscan=off and fails if a
+#     sequential scan is still chosen on a large table (= no usable index for that query)
+# Caches are cleared before every request, so budgets are for the cold path.
+# New route? Add it to ENDPOINT_BUDGETS - test_every_route_has_a_budget insists.
+
+PERF_DROP_DAYS = 3
+PERF_NAMES_PER_DAY = 200
+PERF_USE_CASES_PER_NAME = 2
+
+# Tables with at least this many rows (after ANALYZE) count as large for the plan checks
+SEQ_SCAN_MIN_ROWS = 500
+
+_PREFIXES = ["Green", "Voy", "Flow", "Tech", "Nova", "Bright", "Swift", "Cloud", "Pixel", "Astro"]
+_SUFFIXES = ["Pulse", "Bot", "Fit", "Guru", "Hub", "Lab", "Nest", "Wave", "Forge", "Mint"]
+_EXTENSIONS = ["com", "co", "io", "ai"]
+
+# Isolated Redis db for these tests: the cache is flushed between requests
+PERF_TEST_CACHES = {
+    "default": {**settings.CACHES["default"], "LOCATION": f"{settings.REDIS_URL}/15"},
+}
+
+
+class _InlineExecutor:
+    """Runs federated search's pool work on the test's own connection (and inside its transaction)."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class PerformanceFixturesMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create(clerk_id="user_perf", email="perf@example.com", full_name="Perf User")
+        plan = PlanModel.objects.create(plan_type="paid", api_quota=1000)
+        Subscription.objects.create(
+            user=cls.user, plan=plan, isPaid=True, payment_status="paid",
+            subscription_expiry=date.today() + timedelta(days=30),
+        )
+
+        categories = [
+            UseCaseCategory.objects.create(name=name, slug=name.lower())
+            for name in ["Fintech", "Health", "Education", "Travel", "Retail"]
+        ]
+        tags = [UseCaseTag.objects.create(name=name) for name in ["AI", "SaaS", "Mobile", "B2B", "Marketplace"]]
+        markets = [
+            TargetMarket.objects.create(name=name)
+            for name in ["Small businesses", "Freelancers", "Students", "Developers", "Creators"]
+        ]
+
+        # Bulk-created, so fill in what Name.save() would compute
+        today = date.today()
+        names = []
+        for day in range(PERF_DROP_DAYS):
+            drop_date = today - timedelta(days=day)
+            domain_list = [DomainListOptions.PENDING_DELETE, DomainListOptions.DELETING_TODAY, DomainListOptions.DELETED][day % 3]
+            for i in range(PERF_NAMES_PER_DAY):
+                label = f"{_PREFIXES[i % 10]}{_SUFFIXES[(i // 10) % 10]}{day}{i // 100}"
+                extension = _EXTENSIONS[i % 4]
+                score = 1 + (i * 7) % 10
+                names.append(Name(
+                    domain_name=f"{label}.{extension}",
+                    extension=extension,
+                    length=len(label),
+                    syllables=3,
+                    drop_date=drop_date,
+                    drop_time=datetime.combine(drop_date, DROP_TIMES[extension], tzinfo=dt_timezone.utc),
+                    domain_list=domain_list,
+                    status=["pending", "available", "taken", "unverified"][i % 4],
+                    score=score,
+                    is_top_rated=score >= settings.TOP_RATED_THRESHOLD,
+                ))
+        names = Name.objects.bulk_create(names)
+
+        use_cases = []
+        for index, name in enumerate(names):
+            for order in range(1, PERF_USE_CASES_PER_NAME + 1):
+                title = f"Idea {name.domain_name} {order}"
+                use_cases.append(UseCase(
+                    domain_name=name,
+                    case_title=title,
+                    slug=f"idea-{name.domain_name.replace('.', '')}-{order}".lower(),
+                    description="Invoicing and payments for small teams",
+                    difficulty="easy", competition="low", revenue_potential="high",
+                    order=order,
+                    category=categories[(index + order) % len(categories)],
+                    business_model="B2B",
+                ))
+        use_cases = UseCase.objects.bulk_create(use_cases)
+
+        Tag = UseCase.tag.through
+        Market = UseCase.target_markets.through
+        Tag.objects.bulk_create(
+            [Tag(usecase_id=use_case.pk, usecasetag_id=tags[i % len(tags)].pk) for i, use_case in enumerate(use_cases)]
+        )
+        Market.objects.bulk_create(
+            [Market(usecase_id=use_case.pk, targetmarket_id=markets[i % len(markets)].pk) for i, use_case in enumerate(use_cases)]
+            + [Market(usecase_id=use_case.pk, targetmarket_id=markets[(i + 1) % len(markets)].pk) for i, use_case in enumerate(use_cases) if i % 2 == 0]
+        )
+        for name, use_case in zip(names, use_cases[::PERF_USE_CASES_PER_NAME]):
+            name.suggested_usecase = use_case
+        Name.objects.bulk_update(names, ["suggested_usecase"])
+
+        IdeaOfTheDay.objects.create(use_case=use_cases[0], drop_date=today, domain_list="deleting_today")
+        IdeaOfTheDay.objects.create(use_case=use_cases[2], drop_date=today - timedelta(days=1), domain_list="pending_delete")
+        SavedName.objects.bulk_create([SavedName(user=cls.user, name=name) for name in names[:40]])
+        AcquiredName.objects.bulk_create([AcquiredName(user=cls.user, name=name) for name in names[40:60]])
+        rebuild_drop_rollups()
+
+        # A name nobody has saved yet, so toggle-save takes the "create" branch
+        cls.name = names[100]
+        cls.use_case = use_cases[0]
+        cls.lookup_domains = [name.domain_name.lower() for name in names[:50]] + ["missing.com"]
+        # Bulk save/unsave: saved ones to unsave, unsaved ones to save
+        cls.bulk_saved = {
+            "save": [name.domain_name for name in names[100:150]] + ["missing.com"],
+            "unsave": [name.domain_name for name in names[:20]],
+        }
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= %s",
+                [SEQ_SCAN_MIN_ROWS],
+            )
+            cls.large_tables = {row[0] for row in cursor.fetchall()}
+
+    def setUp(self):
+        cache.clear()
+        for table in REFERENCE_TABLES.values():
+            table.clear_local()
+        # No thread hop for federated search; no broker round trip for the health check
+        for patcher in (
+            mock.patch.object(search, "_federated_executor", _InlineExecutor()),
+            mock.patch.object(search, "_run_in_pool_thread", lambda func, *args: func(*args)),
+            mock.patch("api.views.current_app"),
+        ):
+            started = patcher.start()
+            self.addCleanup(patcher.stop)
+        started.control.inspect.return_value.active.return_value = {"worker@perf": []}
+
+
+    def request(self, route):
+        """Issue the budgeted request for `route`; returns (response, captured queries)."""
+        spec = ENDPOINT_BUDGETS[route]
+        client = APIClient()
+        if spec.get("auth", True):
+            # Fresh instance per request, like the auth backend gives (no relations cached from earlier calls)
+            client.force_authenticate(AppUser.objects.get(pk=self.user.pk))
+        url = "/api/" + spec.get("path", route).format(name=self.name.domain_name, use_case=self.use_case.slug)
+        data = spec.get("data", {})
+        if callable(data):
+            data = data(self)
+        cache.clear()
+        for table in REFERENCE_TABLES.values():
+            table.clear_local()
+        with CaptureQueriesContext(connection) as queries:
+            if spec.get("method", "get") == "post":
+                response = client.post(url, data, format="json")
+            else:
+                response = client.get(url, spec.get("params", {}))
+            if response.streaming:
+                b"".join(response.streaming_content)  # Export queries run while streaming
+        return response, queries
+
+
+# route (as written in api/urls.py) -> request to make and its query budget
+ENDPOINT_BUDGETS = {
+    "names": {"params": {"page_size": 50}, "max_queries": 7},
+    "names/export": {"params": {"export_format": "ndjson"}, "max_queries": 3},  # + plan table load for the quota throttle (cold)
+    "names/lookup": {"method": "post", "data": lambda test: {"domains": test.lookup_domains}, "max_queries": 1},
+    "names/<str:slug>": {"path": "names/{name}", "max_queries": 6},
+    "dashboard/top-rated-names": {"params": {"last_n": 50}, "max_queries": 2},
+    "dashboard/daily-drop": {"params": {"last_n": 100}, "max_queries": 2},
+    "search": {"params": {"q": "pulse"}, "max_queries": 2},
+    "search/names": {"params": {"q": "pulse", "page_size": 50}, "max_queries": 2},
+    "search/names/suggest": {"params": {"q": "gre"}, "max_queries": 0},
+    "search/usecases": {"params": {"q": "payments", "page_size": 50}, "max_queries": 1},
+    "names/<str:slug>/toggle-save": {"method": "post", "path": "names/{name}/toggle-save", "status": 201, "max_queries": 1},
+    "domains/saved": {"params": {"limit": 40}, "max_queries": 2},
+    "domains/saved/bulk": {"method": "post", "data": lambda test: test.bulk_saved, "max_queries": 1},
+    "domains/acquired": {"params": {"limit": 20}, "max_queries": 7},
+    "ideas/idea-of-the-day": {"max_queries": 10},
+    "ideas/idea-of-the-day/list": {"max_queries": 10},
+    "ideas/list": {"params": {"page_size": 50}, "max_queries": 5},
+    "ideas/detail/<slug:slug>": {"path": "ideas/detail/{use_case}", "max_queries": 4},
+    "facets/names": {"max_queries": 1},
+    "facets/ideas": {"params": {"search": "ai"}, "max_queries": 2},
+    "analytics/drops": {"max_queries": 1},
+    "user/profile": {"max_queries": 2},
+    "newsletter": {"method": "post", "auth": False, "data": {"email": "reader@example.com"}, "status": 201, "max_queries": 2},
+    "public/support": {
+        "method": "post", "auth": False, "status": 201,
+        "data": {"name": "Ada", "email": "ada@example.com", "message": "Hello there"}, "max_queries": 1,
+    },
+    "health/": {"max_queries": 1},
+}
+
+
+@override_settings(CACHES=PERF_TEST_CACHES)
+class EndpointQueryBudgetTests(PerformanceFixturesMixin, TestCase):
+    def test_every_route_has_a_budget(self):
+        routes = {str(pattern.pattern) for pattern in urlpatterns}
+        self.assertEqual(routes - set(ENDPOINT_BUDGETS), set(), "Routes without a query budget")
+        self.assertEqual(set(ENDPOINT_BUDGETS) - routes, set(), "Budgets for routes that no longer exist")
+
+    def test_async_urls_match_sync_urls(self):
+        # The ASGI URLconf is derived from api/urls.py; same routes, same order, every async view used
+        self.assertEqual(
+            [(str(p.pattern), p.name) for p in async_urlpatterns],
+            [(str(p.pattern), p.name) for p in urlpatterns],
+        )
+        swapped = {getattr(p.callback, "view_class", None) for p in async_urlpatterns} & set(ASYNC_VIEWS.values())
+        self.assertEqual(swapped, set(ASYNC_VIEWS.values()))
+
+    def test_query_counts_within_budget(self):
+        for route, spec in ENDPOINT_BUDGETS.items():
+            with self.subTest(route=route):
+                response, queries = self.request(route)
+                self.assertEqual(response.status_code, spec.get("status", 200), getattr(response, "content", b"")[:500])
+                self.assertLessEqual(
+                    len(queries), spec["max_queries"],
+                    f"{route} ran {len(queries)} queries (budget {spec['max_queries']}):\n"
+                    + "\n".join(query["sql"] for query in queries.captured_queries),
+                )
+
+
+
+# Routes whose queries are EXPLAINed (the read endpoints that see real traffic)
+PLAN_CHECKED_ROUTES = (
+    "names", "names/export", "names/lookup", "names/<str:slug>",
+    "dashboard/top-rated-names", "dashboard/daily-drop",
+    "search", "search/names", "search/usecases",
+    "domains/saved", "domains/acquired",
+    "ideas/idea-of-the-day", "ideas/idea-of-the-day/list", "ideas/list", "ideas/detail/<slug:slug>",
+    "facets/names", "facets/ideas", "analytics/drops",
+)
+
+# (route, table) -> why a seq scan is accepted there for now. Shrink this, don't grow it.
+KNOWN_SEQ_SCANS = {
+    ("search", "api_name"): "name search is a leading-wildcard icontains; no trigram index on domain_name yet",
+    ("search/names", "api_name"): "name search is a leading-wildcard icontains; no trigram index on domain_name yet",
+    ("facets/names", "api_name"): "unfiltered facets count every name; a full scan is the right plan",
+}
+
+
+def _seq_scanned_tables(plan):
+    """Relation names of every Seq Scan node (parallel ones included) in an EXPLAIN (FORMAT JSON) plan."""
+    tables = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan":
+            tables.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return tables
+
+
+@override_settings(CACHES=PERF_TEST_CACHES)
+class EndpointQueryPlanTests(PerformanceFixturesMixin, TestCase):
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    def test_no_seq_scans_on_large_tables(self):
+        for route in PLAN_CHECKED_ROUTES:
+            with self.subTest(route=route):
+                _, queries = self.request(route)
+                selects = [
+                    query["sql"] for query in queries.captured_queries
+                    if query["sql"].lstrip().upper().startswith(("SELECT", "WITH"))
+                ]
+                # With seq scans priced out, the planner only picks one when no index can serve the query
+                with connection.cursor() as cursor:
+                    cursor.execute("SET enable_seqscan = off")
+                try:
+                    for sql in selects:
+                        plan = self.explain(sql)
+                        for table in _seq_scanned_tables(plan):
+                            if table not in self.large_tables or (route, table) in KNOWN_SEQ_SCANS:
+                                continue
+                            self.fail(
+                                f"{route}: sequential scan on {table}\n{sql}\n{json.dumps(plan, indent=2)}"
+                            )
+                finally:
+                    with connection.cursor() as cursor:
+                        cursor.execute("RESET enable_seqscan")
+
+
+
+
+
+#===================================
+# API usage metering (api/metering.py)
+#====================================
+@override_settings(CACHES=PERF_TEST_CACHES)
+class ApiUsageMeteringTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        plan = PlanModel.objects.create(plan_type="paid", api_quota=0)
+        cls.users = [
+            AppUser.objects.create(clerk_id=f"user_meter_{i}", email=f"meter{i}@example.com", full_name="Meter")
+            for i in range(3)
+        ]
+        for user in cls.users:
+            Subscription.objects.create(
+                user=user, plan=plan, isPaid=True, payment_status="paid",
+                subscription_expiry=date.today() + timedelta(days=30),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def usage(self, user):
+        return ApiUsage.objects.filter(user=user, date=date.today()).values_list("request_count", flat=True).first()
+
+    def test_counts_are_exact_under_concurrent_requests_and_flushes(self):
+        threads, per_thread = 24, 150
+        start = threading.Barrier(threads + 1)
+
+        def hammer(index):
+            start.wait()
+            user_id = self.users[index % len(self.users)].pk
+            for _ in range(per_thread):
+                metering.record_usage(user_id)
+
+        workers = [threading.Thread(target=hammer, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        start.wait()
+        # Flush while the counters are moving: nothing may be lost or counted twice
+        while any(worker.is_alive() for worker in workers):
+            metering.flush_usage()
+        for worker in workers:
+            worker.join()
+        metering.flush_usage()
+
+        per_user = threads * per_thread // len(self.users)
+        for user in self.users:
+            self.assertEqual(self.usage(user), per_user)
+        self.assertEqual(metering.flush_usage(), 0)  # Nothing left dirty
+
+    def test_export_is_metered_and_subscription_cached(self):
+        user = self.users[0]
+        client = APIClient()
+
+        def export():
+            client.force_authenticate(AppUser.objects.get(pk=user.pk))
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get("/api/names/export", {"export_format": "ndjson"})
+                b"".join(response.streaming_content)
+            self.assertEqual(response.status_code, 200)
+            return [query["sql"] for query in queries.captured_queries if "api_subscription" in query["sql"]]
+
+        self.assertEqual(len(export()), 1)  # Cold
+        self.assertEqual(export(), [])      # Served from the cache
+        metering.flush_usage()
+        self.assertEqual(self.usage(user), 2)
+
+        # Expiring the subscription takes effect on the next request
+        subscription = Subscription.objects.get(user=user)
+        subscription.subscription_expiry = date.today() - timedelta(days=1)
+        subscription.save()
+        client.force_authenticate(AppUser.objects.get(pk=user.pk))
+        self.assertEqual(client.get("/api/names/export").status_code, 403)
+        metering.flush_usage()
+        self.assertEqual(self.usage(user), 2)  # Rejected requests aren't metered
+
+    def test_rejected_export_uses_no_quota(self):
+        user = self.users[1]
+        Subscription.objects.filter(user=user).update(plan=PlanModel.objects.create(plan_type="metered", api_quota=1))
+        client = APIClient()
+        client.force_authenticate(AppUser.objects.get(pk=user.pk))
+
+        self.assertEqual(client.get("/api/names/export", {"export_format": "xlsx"}).status_code, 400)
+        self.assertEqual(client.get("/api/names/export", {"drop_date": "not-a-date"}).status_code, 400)
+        self.assertEqual(client.get("/api/names/export", {"export_format": "csv"}).status_code, 200)
+        self.assertEqual(client.get("/api/names/export", {"export_format": "csv"}).status_code, 429)
+
+
+
+
+
+#===================================
+# Saving names (api/saved_names.py)
+#====================================
+class SavedNamesTests(NameFixturesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = AppUser.objects.create(clerk_id="user_saver", email="saver@example.com", full_name="Saver")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def saved(self):
+        return set(SavedName.objects.filter(user=self.user).values_list("name__domain_name", flat=True))
+
+    def test_toggle(self):
+        self.assertEqual(self.client.post("/api/names/Voyance.co/toggle-save").json(), {"saved": True})
+        self.assertEqual(self.saved(), {"Voyance.co"})
+        response = self.client.post("/api/names/Voyance.co/toggle-save")
+        self.assertEqual((response.status_code, response.json()), (200, {"saved": False}))
+        self.assertEqual(self.saved(), set())
+        self.assertEqual(self.client.post("/api/names/nope.com/toggle-save").status_code, 404)
+
+    def test_bulk(self):
+        SavedName.objects.create(user=self.user, name=Name.objects.get(domain_name="Cene.io"))
+        response = self.client.post(
+            "/api/domains/saved/bulk",
+            {"save": ["Voyance.co", "VoyBot.io", "Voyance.co", "nope.com"], "unsave": ["Cene.io", "FlowFit.ai"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "count": 5,
+            "found": 4,
+            "results": [
+                {"domain": "Voyance.co", "found": True, "saved": True},
+                {"domain": "VoyBot.io", "found": True, "saved": True},
+                {"domain": "nope.com", "found": False},
+                {"domain": "Cene.io", "found": True, "saved": False},
+                {"domain": "FlowFit.ai", "found": True, "saved": False},
+            ],
+        })
+        self.assertEqual(self.saved(), {"Voyance.co", "VoyBot.io"})
+
+        # Repeating it changes nothing
+        self.client.post("/api/domains/saved/bulk", {"save": ["Voyance.co"], "unsave": ["Cene.io"]}, format="json")
+        self.assertEqual(self.saved(), {"Voyance.co", "VoyBot.io"})
+
+    def test_bulk_rejects_bad_input(self):
+        for body in ({}, {"save": "Voyance.co"}, {"save": ["Voyance.co"], "unsave": ["Voyance.co"]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post("/api/domains/saved/bulk", body, format="json").status_code, 400)
+
+
+
+
+#===================================
+# Clerk user sync (api/authentication.py)
+#====================================
+@override_settings(CACHES=PERF_TEST_CACHES)
+class UserSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def sync(self, clerk_id, email, full_name):
+        with CaptureQueriesContext(connection) as queries:
+            user = ClerkJWTAuthentication()._get_or_create_user(clerk_id, email, full_name, "fingerprint")
+        return user, [query["sql"] for query in queries if query["sql"].startswith("UPDATE")]
+
+    def test_name_split_on_first_sync(self):
+        user, updates = self.sync("user_named", "named@example.com", "Ada Lovelace")
+        self.assertEqual((user.first_name, user.last_name), ("Ada", "Lovelace"))
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.sync("user_named", "named@example.com", "Ada Lovelace")[1], [])
+
+    def test_no_update_without_a_name_claim(self):
+        self.sync("user_unnamed", "unnamed@example.com", "")
+        self.assertEqual(self.sync("user_unnamed", "unnamed@example.com", "")[1], [])
+
+
+
+
+#===================================
+# Conditional GET data versions (api/conditional.py)
+#====================================
+@override_settings(CACHES=PERF_TEST_CACHES)
+class DataVersionInvalidationTests(NameFixturesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = AppUser.objects.create(clerk_id="user_poller", email="poller@example.com", full_name="Poller")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def poll(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get("/api/dashboard/daily-drop", **headers)
+
+    def assertChangeSeen(self, change):
+        etag = self.poll()["ETag"]
+        self.assertEqual(self.poll(etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertEqual(self.poll(etag).status_code, 200)
+
+    def test_drop_date_moved_off_polled_day(self):
+        name = Name.objects.get(domain_name="Voyance.co")  # Drops today
+        self.assertEqual(name.drop_date, date.today())
+
+        def move():
+            name.drop_date = date.today() - timedelta(days=10)
+            name.save()
+
+        self.assertChangeSeen(move)
+
+    def test_name_deleted(self):
+        self.assertChangeSeen(lambda: Name.objects.get(domain_name="VoyBot.io").delete())  # Dropped yesterday
+
+    def test_facets_for_non_iso_drop_date(self):
+        params = {"drop_date": date.today().strftime("%m/%d/%Y")}  # Any DATE_INPUT_FORMATS spelling
+
+        def counted():
+            response = self.client.get("/api/facets/names", params)
+            return sum(bucket["count"] for bucket in response.data["extension"])
+
+        before = counted()
+        with self.captureOnCommitCallbacks(execute=True):
+            Name.objects.get(domain_name="Voyance.co").delete()  # Drops today
+        self.assertEqual(counted(), before - 1)
+
+    def test_one_bump_per_transaction(self):
+        # Archival deletes every old name in one transaction: one bump for all their dates
+        with mock.patch("api.signals.bump_data_version") as bump:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    Name.objects.all().delete()
+        self.assertEqual(len(callbacks), 1)
+        bump.assert_called_once()
+        self.assertEqual(set(bump.call_args.args[1:]), {date.today(), date.today() - timedelta(days=1)})
+
+    def test_save_reads_no_stored_drop_date(self):
+        name = Name.objects.get(domain_name="Voyance.co")
+        with self.assertNumQueries(1):  # Just the UPDATE
+            name.save()
+
+
+
+
+#===================================
+# Name export under ASGI (api/export.py)
+#====================================
+@override_settings(CACHES=PERF_TEST_CACHES)
+class AsyncNameExportTests(NameFixturesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = AppUser.objects.create(clerk_id="user_exporter", email="exporter@example.com", full_name="Exporter")
+        Subscription.objects.create(
+            user=cls.user, plan=PlanModel.objects.create(plan_type="paid"), isPaid=True, payment_status="paid",
+            subscription_expiry=date.today() + timedelta(days=30),
+        )
+
+    async def export(self, export_format):
+        user = await AppUser.objects.aget(pk=self.user.pk)
+        with mock.patch.object(ClerkJWTAuthentication, "authenticate", return_value=(user, None)), \
+                mock.patch.object(export, "EXPORT_CHUNK_SIZE", 2):
+            response = await AsyncClient().get("/api/names/export", {"export_format": export_format})
+            self.assertEqual(response.status_code, 200)
+            # An async iterator, consumed batch by batch - not a sync one Django would list() up front
+            self.assertTrue(response.is_async)
+            return [chunk async for chunk in response.streaming_content]
+
+    async def test_ndjson_streams_in_batches(self):
+        chunks = await self.export("ndjson")
+        self.assertEqual(len(chunks), 3)  # 5 names, 2 lines per chunk
+        lines = b"".join(chunks).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual({json.loads(line)["domain_name"] for line in lines}, {
+            "Voyance.co", "VoyBot.io", "GreenPulse.co", "FlowFit.ai", "Cene.io",
+        })
+
+    async def test_csv_streams_in_batches(self):
+        rows = b"".join(await self.export("csv")).decode().splitlines()
+        self.assertEqual(rows[0].split(","), list(export.EXPORT_FIELDS))
+        self.assertEqual(len(rows), 6)
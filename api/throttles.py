@@ -1,8 +1,107 @@
 import hashlib
-from rest_framework.throttling import UserRateThrottle
+import logging
+import uuid
 
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
 
-class PostRequestThrottle(UserRateThrottle):
+from .reference import PLANS
+
+logger = logging.getLogger(__name__)
+
+
+#===================================
+# Redis sliding-window throttle
+#====================================
+# DRF's SimpleRateThrottle keeps each client's request history as a list in the cache and does
+# get -> trim -> set per request: several round trips, and two concurrent requests can both read
+# the same history and both get through. Here the whole check runs inside Redis as one Lua
+# script (one round trip, atomic), over a sorted set of request timestamps per client:
+#
+#   1. drop entries older than the window        (ZREMRANGEBYSCORE)
+#   2. under the limit -> record this request     (ZADD, PEXPIRE) and allow
+#      at the limit    -> deny, with the time until the oldest entry leaves the window
+#
+# Same semantics as DRF ("N requests in any rolling <duration>"), exact under concurrency.
+# The clock is Redis' own (TIME), so app servers with drifting clocks agree.
+#
+# Subclasses work like DRF throttles: set `scope` (rate from DEFAULT_THROTTLE_RATES) and
+# implement get_cache_key(), or override get_request_rate() for per-request limits.
+
+SLIDING_WINDOW_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, now .. ':' .. ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+_sliding_window_script = None
+
+
+def _sliding_window(key, limit, window_ms):
+    """(allowed, retry_after_ms) - one EVALSHA round trip."""
+    global _sliding_window_script
+    if _sliding_window_script is None:
+        _sliding_window_script = get_redis_connection("default").register_script(SLIDING_WINDOW_LUA)
+    # Unique member: two requests in the same millisecond must both be counted
+    allowed, retry_after_ms = _sliding_window_script(keys=[key], args=[limit, window_ms, uuid.uuid4().hex])
+    return bool(allowed), retry_after_ms
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Drop-in base for SimpleRateThrottle subclasses (same scope / rate / get_cache_key API),
+    with the check done atomically in Redis. Fails open (logs and allows) if Redis is unreachable.
+    """
+
+    def get_request_rate(self, request, view):
+        """Rate string ("5/day") for this request, or None for no limit."""
+        return self.rate
+
+    def allow_request(self, request, view):
+        self._wait = None
+        rate = self.get_request_rate(request, view)
+        if rate is None:
+            return True
+        num_requests, duration = self.parse_rate(rate)
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        try:
+            allowed, retry_after_ms = _sliding_window(key, num_requests, duration * 1000)
+        except RedisError as e:
+            logger.warning(f"Throttle check failed for scope {self.scope}, allowing request: {e}")
+            return True
+
+        if not allowed:
+            self._wait = retry_after_ms / 1000
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+
+
+#===================================
+# Public form submissions (newsletter, support)
+#====================================
+class PostRequestThrottle(RedisSlidingWindowThrottle):
     scope = 'post_request'
 
     def get_ident(self, request):
@@ -12,7 +111,7 @@ class PostRequestThrottle(UserRateThrottle):
 
         # Fallback for anonymous users
         ip = (
-            request.META.get("HTTP_X_FORWARDED_FOR") or 
+            request.META.get("HTTP_X_FORWARDED_FOR") or
             request.META.get("REMOTE_ADDR", "")
         ).split(",")[0].strip()
 
@@ -22,14 +121,46 @@ class PostRequestThrottle(UserRateThrottle):
             # Use static fallback to group unknown anonymous users
             return "anonymous-unknown"
 
-        # Use a stable hash for consistent throttling
+        # Short stable hash keeps the Redis key small (blake2b: faster than SHA-256, plenty for a key)
         ident_raw = f"{ip}:{ua}"
-        ident_hash = hashlib.sha256(ident_raw.encode("utf-8")).hexdigest()
+        return hashlib.blake2b(ident_raw.encode("utf-8"), digest_size=16).hexdigest()
 
-        return ident_hash
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
 
     #If I only want to throttle POST requests (and not GET, PUT, etc.)
     def allow_request(self, request, view):
         if request.method != 'POST':
             return True  # Do not throttle non-POST requests
-        return super().allow_request(request, view)
\ No newline at end of file
+        return super().allow_request(request, view)
+
+
+
+
+#===================================
+# Per-plan API quota
+#====================================
+class PlanQuotaThrottle(RedisSlidingWindowThrottle):
+    """
+    PlanModel.api_quota requests per PLAN_QUOTA_PERIOD, per user, shared by every view that uses it.
+    Users without a subscription, and plans with api_quota 0 (the default), are not limited.
+    """
+    scope = 'plan_quota'
+
+    def get_rate(self):
+        return None  # Comes from the user's plan, see get_request_rate()
+
+    def get_request_rate(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return None
+        subscription = getattr(user, 'subscription', None)  # Already loaded by HasActiveSubscription
+        if subscription is None:
+            return None
+        plan = PLANS.get(subscription.plan_id)  # Reference cache, no query
+        if plan is None or plan.api_quota <= 0:
+            return None
+        return f"{plan.api_quota}/{settings.PLAN_QUOTA_PERIOD}"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
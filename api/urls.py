@@ -7,6 +7,8 @@ from . import views
 urlpatterns = [
     # Name endpoints
     path('names', views.NameListAPIView.as_view(), name='name-list'),
+    path('names/export', views.NameExportView.as_view(), name='name-export'),  # before names/<slug>
+    path('names/lookup', views.NameLookupView.as_view(), name='name-lookup'),
     path('names/<str:slug>', views.NameDetailAPIView.as_view(), name='name-detail'),
     # path('names/create/', views.NameCreateAPIView.as_view(), name='name-create'),
     # path('names/<int:pk>/update', views.NameUpdateAPIView.as_view(), name='name-update'),
@@ -15,12 +17,15 @@ urlpatterns = [
     path('dashboard/daily-drop', views.DailyDropAPIView.as_view(), name='dashboard-daily-drop'),
 
     # Search endpoints
+    path("search", views.FederatedSearchView.as_view(), name="search"),
     path("search/names", views.NameSearchView.as_view(), name="name-search"),
+    path("search/names/suggest", views.NameSuggestView.as_view(), name="name-suggest"),
     path("search/usecases", views.UseCaseSearchView.as_view(), name="usecase-search"),
 
     # Toggling saved status
     path('names/<str:slug>/toggle-save', views.ToggleSavedNameView.as_view(), name='toggle-saved-name'),    # Full saved name list
     path('domains/saved', views.SavedNameListView.as_view(), name='saved-names'),
+    path('domains/saved/bulk', views.BulkSavedNamesView.as_view(), name='saved-names-bulk'),
     path('domains/acquired', views.AcquiredNameView.as_view(), name='saved-names'),
 
     #Idea of the day
@@ -31,6 +36,13 @@ urlpatterns = [
     path("ideas/list", views.UseCaseListView.as_view(), name="ideas-list"),
     path("ideas/detail/<slug:slug>", views.UseCaseDetailView.as_view(), name="ideas-detail"),
 
+    # Facet counts for filter sidebars
+    path("facets/names", views.NameFacetsView.as_view(), name="facets-names"),
+    path("facets/ideas", views.UseCaseFacetsView.as_view(), name="facets-ideas"),
+
+    # Analytics (rollup tables)
+    path("analytics/drops", views.DropAnalyticsView.as_view(), name="analytics-drops"),
+
     # User profile
     path('user/profile', views.UserProfileView.as_view(), name='user-profile'),
 
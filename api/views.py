@@ -2,24 +2,34 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.throttling import UserRateThrottle
-from .throttles import PostRequestThrottle
+from rest_framework.exceptions import ParseError
+from .throttles import PostRequestThrottle, PlanQuotaThrottle
+from .metering import MeteredViewMixin
 from .authentication import ClerkJWTAuthentication
 from .management.validators import validate_domain_data
 from django.shortcuts import get_object_or_404
 from .models import Name, NewsLetter, PublicInquiry, SavedName, AcquiredName, UploadedFile, IdeaOfTheDay, UseCase
-from .serializers import NameSerializer, AppUserSerializer, SavedNameLightSerializer, AcquiredNameSerializer, UseCaseSerializer, IdeaOfTheDayListSerializer, IdeaOfTheDaySerializer, NewsletterSerializer, PublicInquirySerializer, UseCaseListSerializer, UseCaseDetailSerializer, DashboardNameSerializer, NameSearchSerializer, UseCaseSearchSerializer
-from .permissions import IsManagerOrReadOnly
+from .serializers import NameSerializer, AppUserSerializer, SavedNameLightSerializer, AcquiredNameSerializer, UseCaseSerializer, IdeaOfTheDayListSerializer, IdeaOfTheDaySerializer, NewsletterSerializer, PublicInquirySerializer, UseCaseListSerializer, UseCaseDetailSerializer, DashboardNameSerializer, UseCaseSearchSerializer, DashboardNameValuesSerializer, NameSearchValuesSerializer, UseCaseListValuesSerializer
+from .permissions import IsManagerOrReadOnly, HasActiveSubscription
 from .pagination import StandardResultsSetPagination, IdeaPageNumberPagination
-from .filters import UseCaseFilter
+from .filters import UseCaseFilter, ExistsSearchFilter
+from .search import (
+    normalize_query, get_cached_search_page, cache_search_page,
+    name_search_queryset, use_case_search_results,
+    federated_search, FEDERATED_DEFAULT_LIMIT, FEDERATED_MAX_LIMIT,
+)
+from .suggest import suggest_names, SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT
+from .fieldsets import SparseFieldsetMixin, NameFieldsetMixin
+from .conditional import data_version_condition, NAMES, IDEAS, ALL
+from .export import EXPORT_FORMATS, EXPORT_STREAMS, as_async_stream
+from .featured import get_featured_usecases
+from .facets import cached_facet_counts, NAME_FACETS, IDEA_FACETS
+from .rollups import drop_statistics
+from .saved_names import toggle_saved, set_saved
+
+from django.db.models import OuterRef, Max, Exists, Prefetch
+from django.db.models.functions import Lower
 
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-# For search functionality
-from django.db.models import F, Case, When, Value, FloatField, IntegerField, OuterRef, Subquery, Max
-from django.db.models.functions import Least
-
-
-# Cache import
-from django.core.cache import cache
 
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -43,7 +53,8 @@ from django.utils.timezone import now
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.files.storage import FileSystemStorage
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.core.management import call_command
 import os
 from pathlib import Path
@@ -383,24 +394,18 @@ class UserProfileView(APIView):
 #===================================
 # Name list view
 #====================================
-class NameListAPIView(generics.ListAPIView):
+class NameListAPIView(NameFieldsetMixin, generics.ListAPIView):
     """
     Full tabular endpoint for names with extensive filters, search, and ordering.
     - Pagination: StandardResultsSetPagination (10 per page by default)
     - Filters: extension, is_top_rated, is_idea_of_the_day, drop_date, domain_list, status, score, length
     - Ordering: score, length, created_at (use '?ordering=-score' etc.)
     - Search: by 'domain_name' (use '?search=foo')
+    - Sparse fieldsets: ?fields=domain_name,score / ?expand=suggested_usecase (see api/fieldsets.py);
+      joins and prefetches are only done for the relations actually returned
     """
-    queryset = (
-        Name.objects.all()
-        .select_related('suggested_usecase')
-        .prefetch_related(
-            'use_cases__tag',
-            'use_cases__category',
-            'suggested_usecase__tag',
-            'suggested_usecase__category',
-        )
-    )
+    replica_reads = True  # Safe to serve from a read replica (api/db_routers.py)
+    queryset = Name.objects.all()
     serializer_class = NameSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
@@ -418,6 +423,10 @@ class NameListAPIView(generics.ListAPIView):
     ordering_fields = ['score', 'length', 'created_at']
     search_fields = ['domain_name',] #removed 'tag__name', 'category__name'
 
+    def get_queryset(self):
+        # select_related/prefetch_related/only() are derived from the requested fields
+        return self.apply_fieldset(super().get_queryset())
+
     def get_serializer_context(self):
         # Keeping request in context
         context = super().get_serializer_context()
@@ -428,12 +437,117 @@ class NameListAPIView(generics.ListAPIView):
 
 
 
-class NameDetailAPIView(APIView):
+#===================================
+# Batch name lookup view
+#====================================
+class NameLookupView(APIView):
+    """
+    Resolve many domains in one request (for partner integrations).
+    POST body: {"domains": ["greenpulse.co", "voybot.io", ...]}   (max settings.NAME_LOOKUP_MAX_DOMAINS)
+    - Matching is case-insensitive; results come back in request order (duplicates collapsed)
+    - One query for the whole batch: LOWER(domain_name) = ANY(array), served by the LOWER() index
+    - Unknown domains are returned with "found": false
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        domains = request.data.get("domains") if isinstance(request.data, dict) else None
+        if not isinstance(domains, list) or not domains or not all(isinstance(d, str) for d in domains):
+            return Response(
+                {"detail": "'domains' must be a non-empty list of domain name strings."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(domains) > settings.NAME_LOOKUP_MAX_DOMAINS:
+            return Response(
+                {"detail": f"Too many domains — max {settings.NAME_LOOKUP_MAX_DOMAINS} per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Normalize + de-duplicate while keeping the caller's order
+        keys = list(dict.fromkeys(d.strip().lower() for d in domains if d.strip()))
+
+        rows = (
+            Name.objects
+            .annotate(
+                lookup_key=Lower('domain_name'),
+                is_saved=Exists(SavedName.objects.filter(user=request.user, name=OuterRef('pk'))),
+            )
+            .filter(lookup_key__any=keys)
+            .values_list('lookup_key', 'domain_name', 'status', 'domain_list', 'drop_date', 'score', 'is_saved')
+        )
+        found = {
+            key: {
+                "found": True,
+                "domain_name": domain_name,
+                "status": name_status,
+                "domain_list": domain_list,
+                "drop_date": drop_date,
+                "score": score,
+                "saved": is_saved,
+            }
+            for key, domain_name, name_status, domain_list, drop_date, score, is_saved in rows
+        }
+
+        results = [{"domain": key, **found.get(key, {"found": False})} for key in keys]
+        return Response({"count": len(results), "found": len(found), "results": results})
+
+
+
+
+#===================================
+# Name export view (paid)
+#====================================
+class NameExportView(MeteredViewMixin, generics.GenericAPIView):
+    """
+    Streams every name matching the list view's filters as NDJSON (default) or CSV.
+    - ?export_format=ndjson|csv   ('format' is reserved by DRF for renderer selection)
+    - Same filters / search / ordering params as /names
+    - No pagination and no COUNT(*): rows come off a server-side cursor as they are written out
+    """
+    queryset = Name.objects.all()
+    permission_classes = [IsAuthenticated, HasActiveSubscription]
+    throttle_classes = [PlanQuotaThrottle]  # Counts against the plan's api_quota
+    # MeteredViewMixin: successful exports are recorded in ApiUsage for billing
+    filter_backends = NameListAPIView.filter_backends
+    filterset_fields = NameListAPIView.filterset_fields
+    ordering_fields = NameListAPIView.ordering_fields
+    search_fields = NameListAPIView.search_fields
+    ordering = ['-drop_date', '-score', 'domain_name']  # Stable default order for spreadsheets
+
+    def check_throttles(self, request):
+        # Validate before the quota throttle counts the request: a rejected (400) export
+        # uses up no api_quota, just as MeteredViewMixin doesn't bill it
+        self.export_format = request.query_params.get('export_format', 'ndjson').lower()
+        if self.export_format not in EXPORT_FORMATS:
+            raise ParseError(f"Invalid 'export_format' — choose one of: {', '.join(EXPORT_FORMATS)}.")
+        self.export_queryset = self.filter_queryset(self.get_queryset())  # Invalid filters raise here; no query yet
+        super().check_throttles(request)
+
+    def get(self, request, *args, **kwargs):
+        content_type, extension = EXPORT_FORMATS[self.export_format]
+
+        stream = EXPORT_STREAMS[self.export_format](self.export_queryset)
+        if isinstance(request._request, ASGIRequest):
+            stream = as_async_stream(stream)  # Keeps the export streaming under ASGI (see api/export.py)
+
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="names-{now():%Y%m%d}.{extension}"'
+        response['X-Accel-Buffering'] = 'no'  # Don't let a reverse proxy buffer the whole export
+        return response
+
+
+
+
+class NameDetailAPIView(NameFieldsetMixin, APIView):
+    """
+    Single name by slug. Supports the same ?fields= / ?expand= params as the list view.
+    """
+    replica_reads = True
     permission_classes = [IsAuthenticated]
 
     def get(self, request, slug):
-        name = get_object_or_404(Name, domain_name=slug)
-        serializer = NameSerializer(name, context={'request': request})
+        name = get_object_or_404(self.apply_fieldset(Name.objects.all()), domain_name=slug)
+        serializer = NameSerializer(name, context={'request': request, 'fields': self.get_requested_fields()})
         return Response(serializer.data)
 
 
@@ -475,25 +589,58 @@ class ToggleSavedNameView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, slug):  # Keep parameter named 'slug' for URL consistency
-        name = get_object_or_404(Name, domain_name=slug)  # Lookup by domain_name but using slug parameter
-        user = request.user
-
-        saved_obj = SavedName.objects.filter(user=user, name=name).first()
+        # Lookup, check and insert/delete in one atomic statement (see api/saved_names.py)
+        saved = toggle_saved(request.user.pk, slug)
+        if saved is None:
+            raise Http404("No Name matches the given query.")  # Same message as get_object_or_404
 
-        if saved_obj:
-            saved_obj.delete()
-            return Response({'saved': False}, status=status.HTTP_200_OK)
-        else:
-            SavedName.objects.create(user=user, name=name)
+        if saved:
             return Response({'saved': True}, status=status.HTTP_201_CREATED)
+        return Response({'saved': False}, status=status.HTTP_200_OK)
 
 
 
 
             
+#===============================================================================
+# Conditional GET (ETag / Last-Modified -> 304) for the polled dashboard endpoints
+#===============================================================================
+# Each function returns the data versions a response depends on (see api/conditional.py)
+
+def _dashboard_versions(request, *args, **kwargs):
+    # Both dashboard tiles show today's and yesterday's drops
+    today = now().date()
+    return [(NAMES, today), (NAMES, today - timedelta(days=1))]
+
+
+def _idea_of_the_day_versions(request, *args, **kwargs):
+    date_str = request.GET.get("date")
+    if date_str:
+        try:
+            drop_date = timezone.datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            return None  # The view answers with a 400
+    else:
+        drop_date = timezone.now().date()
+    yesterday = drop_date - timedelta(days=1)
+    return [
+        (IDEAS, drop_date), (IDEAS, yesterday),
+        (IDEAS, ALL),  # edits to the underlying use cases
+        # domain_status comes from the ideas' names, which drop on the idea date or the day before
+        (NAMES, drop_date), (NAMES, yesterday), (NAMES, yesterday - timedelta(days=1)),
+    ]
+
+
+def _idea_of_the_day_list_versions(request, *args, **kwargs):
+    return [(IDEAS, ALL)]
+
+
+
+
 #===============================================================================
 # TopRatedNames View
 #===============================================================================
+@method_decorator(data_version_condition(_dashboard_versions), name='get')
 class TopRatedNamesAPIView(generics.GenericAPIView):
     """
     Dashboard endpoint that returns two groups: 'today' and 'yesterday' top-rated names.
@@ -504,12 +651,14 @@ class TopRatedNamesAPIView(generics.GenericAPIView):
       - Uses timezone-aware "today" per server TZ. If you want request/user-TZ based,
         we can adjust once you specify the TZ source.
       - Deterministic ordering by: score DESC, created_at DESC, domain_name ASC
+      - ETag/Last-Modified; unchanged polls get a 304 without touching the DB
     Response shape:
     {
       "today": [... TopRatedNamesAPIView ...],
       "yesterday": [... TopRatedNamesAPIView ...]
     }
     """
+    replica_reads = True
     permission_classes = [IsAuthenticated]
     serializer_class = DashboardNameSerializer
 
@@ -517,28 +666,24 @@ class TopRatedNamesAPIView(generics.GenericAPIView):
     DEFAULT_LAST_N = 12
     MAX_LAST_N = 100
 
-    def get(self, request, *args, **kwargs):
+    @classmethod
+    def day_querysets(cls, query_params):
+        """(today_qs, yesterday_qs) for the query params; shared with the async view (api/async_views.py)."""
         # 1) Parse & validate query params
-        last_n_raw = request.query_params.get('last_n', None)
-        domain_list = request.query_params.get('domain_list', None)
+        last_n_raw = query_params.get('last_n', None)
+        domain_list = query_params.get('domain_list', None)
 
         if last_n_raw is None:
-            last_n = self.DEFAULT_LAST_N
+            last_n = cls.DEFAULT_LAST_N
         else:
             try:
                 last_n = int(last_n_raw)
             except (TypeError, ValueError):
-                return Response(
-                    {"detail": "Invalid 'last_n' — must be an integer."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+                raise ParseError("Invalid 'last_n' — must be an integer.")
             if last_n <= 0:
-                return Response(
-                    {"detail": "'last_n' must be a positive integer."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if last_n > self.MAX_LAST_N:
-                last_n = self.MAX_LAST_N  # clamp instead of erroring
+                raise ParseError("'last_n' must be a positive integer.")
+            if last_n > cls.MAX_LAST_N:
+                last_n = cls.MAX_LAST_N  # clamp instead of erroring
 
         # 2) Resolve dates (timezone-aware, date part only)
         today = now().date()
@@ -557,12 +702,15 @@ class TopRatedNamesAPIView(generics.GenericAPIView):
             base_qs = base_qs.filter(domain_list=domain_list)
 
         # 4) Split per date and limit to last_n items each
-        today_qs = base_qs.filter(drop_date=today)[:last_n]
-        yesterday_qs = base_qs.filter(drop_date=yesterday)[:last_n]
+        return base_qs.filter(drop_date=today)[:last_n], base_qs.filter(drop_date=yesterday)[:last_n]
+
+    def get(self, request, *args, **kwargs):
+        today_qs, yesterday_qs = self.day_querysets(request.query_params)
 
-        # 5) Serialize with the lean dashboard serializer
-        today_data = DashboardNameSerializer(today_qs, many=True).data
-        yesterday_data = DashboardNameSerializer(yesterday_qs, many=True).data
+        # 5) Serialize with the lean dashboard serializer (values()-based fast path, same shape as DashboardNameSerializer)
+        serializer = DashboardNameValuesSerializer()
+        today_data = serializer.serialize(today_qs)
+        yesterday_data = serializer.serialize(yesterday_qs)
 
         return Response({"pending_delete": today_data, "deleted": yesterday_data}, status=status.HTTP_200_OK)
 
@@ -574,6 +722,7 @@ class TopRatedNamesAPIView(generics.GenericAPIView):
 # Daily Drop Names View
 #=======================================================
 
+@method_decorator(data_version_condition(_dashboard_versions), name='get')
 class DailyDropAPIView(generics.GenericAPIView):
     """
     Dashboard endpoint for 'daily drop list', returning both 'today' and 'yesterday'.
@@ -584,42 +733,45 @@ class DailyDropAPIView(generics.GenericAPIView):
         - ?include_top_rated=true -> include top-rated names (defaults to False)
         - ?include_counts=true    -> include counts (useful for debugging empty responses)
     - Ordering: score DESC, created_at DESC, domain_name ASC (deterministic).
+    - Sends ETag/Last-Modified; unchanged polls get a 304 without touching the DB.
     """
+    replica_reads = True
     permission_classes = [IsAuthenticated]
     serializer_class = DashboardNameSerializer
 
     DEFAULT_LAST_N = 50
     MAX_LAST_N = 500
 
-    def _parse_bool(self, raw, default=False):
+    @staticmethod
+    def _parse_bool(raw, default=False):
         """Normalize common truthy strings to True; else False."""
         if raw is None:
             return default
         return str(raw).lower() in ("1", "true", "yes", "y", "t")
 
-    def get(self, request, *args, **kwargs):
+    @classmethod
+    def day_querysets(cls, query_params):
+        """(today_qs, yesterday_qs) for the query params; shared with the async view (api/async_views.py)."""
         # ----------------------------
         # 1) Parse and validate params
         # ----------------------------
         # last_n (limit per day)
-        last_n_raw = request.query_params.get('last_n')
+        last_n_raw = query_params.get('last_n')
         if last_n_raw is None:
-            last_n = self.DEFAULT_LAST_N
+            last_n = cls.DEFAULT_LAST_N
         else:
             try:
                 last_n = int(last_n_raw)
             except (TypeError, ValueError):
-                return Response({"detail": "Invalid 'last_n' — must be an integer."},
-                                status=status.HTTP_400_BAD_REQUEST)
+                raise ParseError("Invalid 'last_n' — must be an integer.")
             if last_n <= 0:
-                return Response({"detail": "'last_n' must be a positive integer."},
-                                status=status.HTTP_400_BAD_REQUEST)
-            if last_n > self.MAX_LAST_N:
-                last_n = self.MAX_LAST_N  # clamp
+                raise ParseError("'last_n' must be a positive integer.")
+            if last_n > cls.MAX_LAST_N:
+                last_n = cls.MAX_LAST_N  # clamp
 
-        domain_list = request.query_params.get('domain_list')
-        include_top_rated = self._parse_bool(request.query_params.get('include_top_rated'), default=False)
-        include_counts = self._parse_bool(request.query_params.get('include_counts'), default=False)
+        domain_list = query_params.get('domain_list')
+        include_top_rated = cls._parse_bool(query_params.get('include_top_rated'), default=False)
+        include_counts = cls._parse_bool(query_params.get('include_counts'), default=False)
 
         # ----------------------------
         # 2) Resolve UTC dates (matches frontend T00:00:00Z approach)
@@ -643,12 +795,15 @@ class DailyDropAPIView(generics.GenericAPIView):
         # ----------------------------
         # 3) Fetch & slice (apply last_n)
         # ----------------------------
-        today_qs = build_queryset_for_date(today)[:last_n]
-        yesterday_qs = build_queryset_for_date(yesterday)[:last_n]
+        return build_queryset_for_date(today)[:last_n], build_queryset_for_date(yesterday)[:last_n]
+
+    def get(self, request, *args, **kwargs):
+        today_qs, yesterday_qs = self.day_querysets(request.query_params)
 
-        # 4) Serialize
-        today_data = DashboardNameSerializer(today_qs, many=True).data
-        yesterday_data = DashboardNameSerializer(yesterday_qs, many=True).data
+        # 4) Serialize (values()-based fast path, same shape as DashboardNameSerializer)
+        serializer = DashboardNameValuesSerializer()
+        today_data = serializer.serialize(today_qs)
+        yesterday_data = serializer.serialize(yesterday_qs)
 
         # 5) Build response
         response_payload = {
@@ -664,122 +819,134 @@ class DailyDropAPIView(generics.GenericAPIView):
 #===================================
 # Name Search View
 #====================================
-
-# At the top of your views.py, add these imports
-from django.db.models import Case, When, Value, IntegerField
-from django.db.models.functions import Length
-
-# ... your other imports ...
-
 class NameSearchView(APIView):
     """
     Search for domain names using a ranked, case-insensitive containment search.
     - Ranks results based on match type (exact, starts with, contains)
     - Uses domain name length as a tie-breaker
+    - Pages are cached per normalized query/page/page_size (see api/search.py)
     """
+    replica_reads = True
 
     def get(self, request):
-        query = request.GET.get("q", "").strip()
+        query = normalize_query(request.GET.get("q", ""))
 
         if not query:
             return Response({"results": []})
 
-        qs = (
-            Name.objects
-            .filter(domain_name__icontains=query)
-            # 1. Annotate each object with a 'rank' and 'domain_length'
-        .annotate(
-            rank=Case(
-                # Exact match = 1.0 (will become 100%)
-                When(domain_name__iexact=query, then=Value(1.0)),      
-                # Starts with match = 0.75 (will become 75%)
-                When(domain_name__istartswith=query, then=Value(0.75)), 
-                # Contains match = 0.5 (will become 50%)
-                default=Value(0.5),                                   
-                output_field=FloatField(), # Use FloatField for decimal values
-            ),
-            domain_length=Length('domain_name')
-        )
-            # 2. Order by the new rank (highest first), then by length (shortest first)
-            .order_by('-rank', 'domain_length')
-        )
-
         paginator = StandardResultsSetPagination()
-        page = paginator.paginate_queryset(qs, request, view=self)
-        
-        # Your existing serializer will now find the 'rank' attribute and include it
-        return paginator.get_paginated_response(NameSearchSerializer(page, many=True).data)
+
+        # Serve repeated queries straight from the search cache
+        cached_response = get_cached_search_page("names", query, request, paginator)
+        if cached_response is not None:
+            return cached_response
+
+        qs = name_search_queryset(query)
+
+        # Paginate plain value rows; the fast serializer emits the same shape as NameSearchSerializer
+        serializer = NameSearchValuesSerializer()
+        page = paginator.paginate_queryset(serializer.rows(qs), request, view=self)
+        results = serializer.to_representation(page)
+        cache_search_page("names", query, request, paginator, results)
+        return paginator.get_paginated_response(results)
         
 
+#===================================
+# Name Suggest (autocomplete) View
+#====================================
+class NameSuggestView(APIView):
+    """
+    Prefix autocomplete for domain names, served from the Redis suggest index (api/suggest.py).
+    - ?q=<prefix>   : matched against full domain names and word stems (e.g. 'pul' -> GreenPulse.co)
+    - ?limit=<int>  : number of completions (default 10, capped at 25)
+    Never touches the database, so it is safe to call on every keystroke.
+    """
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", SUGGEST_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "Invalid 'limit' — must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), SUGGEST_MAX_LIMIT)
+
+        return Response({"results": suggest_names(request.query_params.get("q", ""), limit)})
+
+
+
 #===================================
 # Use Case Search View
 #====================================
 class UseCaseSearchView(APIView):
     """
     Search across use cases using PostgreSQL full-text search.
+    Pages are cached per normalized query/page/page_size (see api/search.py).
     """
+    replica_reads = True
 
     def get(self, request):
-        query = request.GET.get("q", "").strip()
+        query = normalize_query(request.GET.get("q", ""))
 
         if not query:
             return Response({"results": []})
 
-        # Check if the search has multiple words
-        is_multi_word = len(query.split()) > 1
-
-        search_vector_obj = (
-            SearchVector("case_title", weight="A") +
-            SearchVector("description", weight="B") +
-            SearchVector("category__name", weight="C") +
-            SearchVector("tag__name", weight="C") +
-            SearchVector("target_markets__name", weight="C") + 
-            SearchVector("business_model", weight="C")   
-        )
-
-        query_websearch = SearchQuery(query, search_type="websearch")
-        query_plain = SearchQuery(query, search_type="plain")
-
-        base_qs = (
-            UseCase.objects
-            .annotate(search_vector=search_vector_obj)
-            .annotate(
-                # The true relevance score from the database
-                rank=SearchRank(F('search_vector'), query_websearch),
-                # A flag to prioritize full matches on multi-word searches
-                is_full_match=Case(
-                    When(search_vector=query_plain, then=Value(1 if is_multi_word else 0)),
-                    default=Value(0),
-                    output_field=IntegerField()
-                )
-            )
-            .filter(rank__gt=0.1)
-        )
+        paginator = StandardResultsSetPagination()
 
-        # De-duplicate at the DB level, ordering by pk to satisfy the DISTINCT ON rule
-        # We include our real sorting criteria to help the DB pick the best row.
-        final_deduplicated_qs = (
-            base_qs
-            .order_by('pk', '-is_full_match', '-rank')
-            .distinct('pk')
-        )
+        # Serve repeated queries straight from the search cache
+        cached_response = get_cached_search_page("usecases", query, request, paginator)
+        if cached_response is not None:
+            return cached_response
 
-        # Execute the query
-        results_list = list(final_deduplicated_qs[:2000])
-        
-        # Sort in Python by our desired criteria: full matches first, then by rank.
-        sorted_results = sorted(results_list, key=lambda item: (item.is_full_match, item.rank), reverse=True)
+        sorted_results = use_case_search_results(query)
 
-        paginator = StandardResultsSetPagination()
         page = paginator.paginate_queryset(sorted_results, request, view=self)
 
         if page is None:
              return Response({"results": []})
 
         # The serializer will receive the true 'rank' value
-        return paginator.get_paginated_response(
-            UseCaseSearchSerializer(page, many=True).data
-        )
+        results = UseCaseSearchSerializer(page, many=True).data
+        cache_search_page("usecases", query, request, paginator, results)
+        return paginator.get_paginated_response(results)
+
+
+
+#===================================
+# Federated Search View
+#====================================
+class FederatedSearchView(APIView):
+    """
+    One request for both search groups (instead of calling /search/names and /search/usecases separately).
+    - ?q=<term>               : search term (same matching rules as the individual endpoints)
+    - ?names_limit=<int>      : top names to return (default 5, capped at 20)
+    - ?usecases_limit=<int>   : top use cases to return (default 5, capped at 20)
+    Both searches run concurrently and no pagination counts are computed.
+    """
+    replica_reads = True
+
+    def _parse_limit(self, raw):
+        if raw is None:
+            return FEDERATED_DEFAULT_LIMIT
+        return min(max(int(raw), 1), FEDERATED_MAX_LIMIT)
+
+    def get(self, request):
+        query = normalize_query(request.GET.get("q", ""))
+
+        if not query:
+            return Response({"query": "", "names": [], "usecases": []})
+
+        try:
+            names_limit = self._parse_limit(request.query_params.get("names_limit"))
+            usecases_limit = self._parse_limit(request.query_params.get("usecases_limit"))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "Invalid limit — 'names_limit' and 'usecases_limit' must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(federated_search(query, names_limit, usecases_limit))
 
 
 
@@ -841,6 +1008,52 @@ class SavedNameListView(APIView, DateRangePaginationMixin):
         return self.paginate(saved_qs, request, self.serializer_class)
 
 
+
+class BulkSavedNamesView(APIView):
+    """
+    Save and/or unsave many names in one request (list curation).
+    POST body: {"save": ["GreenPulse.co", ...], "unsave": ["VoyBot.io", ...]}   (either may be omitted)
+    - Slugs are domain names, as in /names/<slug>/toggle-save; at most settings.SAVED_NAMES_BULK_MAX in total
+    - Idempotent: saving a saved name or unsaving an unsaved one is a no-op
+    - One statement for the whole batch; returns the resulting state per slug, in request order
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        body = request.data if isinstance(request.data, dict) else {}
+        save, unsave = body.get("save", []), body.get("unsave", [])
+        if not all(isinstance(slugs, list) and all(isinstance(s, str) for s in slugs) for slugs in (save, unsave)):
+            return Response(
+                {"detail": "'save' and 'unsave' must be lists of domain name strings."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # De-duplicate while keeping the caller's order
+        save = list(dict.fromkeys(s.strip() for s in save if s.strip()))
+        unsave = list(dict.fromkeys(s.strip() for s in unsave if s.strip()))
+        if not save and not unsave:
+            return Response({"detail": "Nothing to save or unsave."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(save) + len(unsave) > settings.SAVED_NAMES_BULK_MAX:
+            return Response(
+                {"detail": f"Too many names — max {settings.SAVED_NAMES_BULK_MAX} per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        conflicting = set(save) & set(unsave)
+        if conflicting:
+            return Response(
+                {"detail": f"Names both saved and unsaved: {', '.join(sorted(conflicting))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        found = set_saved(request.user.pk, save=save, unsave=unsave)
+
+        results = [
+            {"domain": slug, "found": True, "saved": slug in save} if slug in found else {"domain": slug, "found": False}
+            for slug in save + unsave
+        ]
+        return Response({"count": len(results), "found": len(found), "results": results})
+
+
 #===================================
 # AcquiredNames views
 #====================================
@@ -862,7 +1075,21 @@ class AcquiredNameView(APIView, DateRangePaginationMixin):
 
 
     def get(self, request):
-        acquired_qs = AcquiredName.objects.filter(user=request.user).select_related("name")
+        # Each row embeds a full NameSerializer payload - load its use cases up front, not per row
+        acquired_qs = (
+            AcquiredName.objects.filter(user=request.user)
+            .select_related("name__suggested_usecase__category", "name__suggested_usecase__domain_name")
+            .prefetch_related(
+                "name__suggested_usecase__tag",
+                "name__suggested_usecase__target_markets",
+                Prefetch(
+                    "name__use_cases",
+                    queryset=UseCase.objects.exclude(order=1).select_related("category", "domain_name")
+                    .prefetch_related("tag", "target_markets"),
+                    to_attr="prefetched_other_use_cases",
+                ),
+            )
+        )
         acquired_qs = self.filter_by_date_range(acquired_qs, request)
         return self.paginate(acquired_qs, request, AcquiredNameSerializer)
 
@@ -873,18 +1100,21 @@ class AcquiredNameView(APIView, DateRangePaginationMixin):
 # Ideas
 #====================================
 
-FEATURED_COUNT = 8
-FEATURED_CACHE_KEY = "featured_usecases"
-FEATURED_TTL = 60 * 60 * 24               # 24 hours
 
-
-class UseCaseListView(generics.ListAPIView):
+class UseCaseListView(SparseFieldsetMixin, generics.ListAPIView):
+    replica_reads = True
     serializer_class = UseCaseListSerializer
+    # Reads go through the values()-based twin of UseCaseListSerializer (same JSON shape)
+    values_serializer_class = UseCaseListValuesSerializer
+
+    # ?fields= / ?expand= (target_markets costs an extra query, so it can be left out)
+    fieldset_fields = ("case_title", "slug", "category", "competition", "difficulty", "target_markets")
+    fieldset_expandable = ("target_markets",)
     pagination_class = IdeaPageNumberPagination
 
     filter_backends = [
         DjangoFilterBackend,
-        drf_filters.SearchFilter,
+        ExistsSearchFilter,  # tag__name is matched with EXISTS, not a join
         drf_filters.OrderingFilter,
     ]
     filterset_class = UseCaseFilter
@@ -893,12 +1123,13 @@ class UseCaseListView(generics.ListAPIView):
     ordering = ["-created_at", "order"]
 
     def get_queryset(self):
+        # No .distinct(): the to-many filters/search use EXISTS, so every use case appears once
+        # and a page can be read straight off the created_at index with a LIMIT
         return (
             UseCase.objects
             .select_related("domain_name", "category")
             .prefetch_related("tag")
             .all()
-            .distinct()
         )
 
     def list(self, request: Request, *args, **kwargs):
@@ -910,19 +1141,21 @@ class UseCaseListView(generics.ListAPIView):
           - Pagination
           - last_n (?last_n=10 → last 10 by created_at)
           - Featured (?featured=true → 8 random cached items)
+          - Sparse fieldsets (?fields=case_title,slug / ?expand=target_markets)
         """
+        requested_fields = self.get_requested_fields()
+
         featured = request.query_params.get("featured")
         if featured and featured.lower() in ("1", "true", "yes"):
-            payload = cache.get(FEATURED_CACHE_KEY)
-            if payload is None:
-                base_qs = self.get_queryset()
-                featured_qs = base_qs.order_by("?")[:FEATURED_COUNT]
-                serializer = self.get_serializer(featured_qs, many=True)
-                payload = serializer.data
-                cache.set(FEATURED_CACHE_KEY, payload, FEATURED_TTL)
+            # Sampled from random ids and kept warm by refresh_featured_usecases_task (api/featured.py)
+            payload = get_featured_usecases()
+            # The cached set is shared by everyone, so prune per request
+            if requested_fields is not None:
+                payload = [{key: value for key, value in item.items() if key in requested_fields} for item in payload]
             return Response(payload)
 
         queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.values_serializer_class(include=requested_fields)
 
         # last_n shortcut (handled here instead of FilterSet)
         last_n = request.query_params.get("last_n")
@@ -933,16 +1166,104 @@ class UseCaseListView(generics.ListAPIView):
                 n = 0
             if n > 0:
                 queryset = queryset.order_by("-created_at")[:n]
-                serializer = self.get_serializer(queryset, many=True)
-                return Response(serializer.data)
+                return Response(serializer.serialize(queryset))
 
-        page = self.paginate_queryset(queryset)
+        page = self.paginate_queryset(serializer.rows(queryset))
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(serializer.to_representation(page))
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serializer.serialize(queryset))
+
+
+
+
+#===================================
+# Facet counts (filter sidebars)
+#====================================
+class NameFacetsView(NameListAPIView):
+    """
+    Counts per extension / status / length / score for the names matching the same
+    filters and ?search= as /names (one GROUPING SETS query, see api/facets.py).
+    Cached per filter set until names on the filtered drop_date (or any date) change.
+    """
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(Name.objects.all())
+        # Version the cache by the parsed date: ?drop_date= takes any DATE_INPUT_FORMATS spelling,
+        # and only the ISO-keyed version is ever bumped
+        filterset = DjangoFilterBackend().get_filterset(request, Name.objects.all(), self)
+        drop_date = filterset.form.cleaned_data.get("drop_date") if filterset.is_valid() else None
+        version_pairs = [(NAMES, drop_date or ALL)]
+        return Response(cached_facet_counts("names", queryset, NAME_FACETS, request.query_params, version_pairs))
+
+
+class UseCaseFacetsView(UseCaseListView):
+    """
+    Counts per category / business model / competition / difficulty for the use cases
+    matching the same filters and ?search= as /ideas/list.
+    """
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(UseCase.objects.all())
+        # New use cases arrive with names (loader bumps NAMES); edits bump IDEAS
+        version_pairs = [(NAMES, ALL), (IDEAS, ALL)]
+        return Response(cached_facet_counts("ideas", queryset, IDEA_FACETS, request.query_params, version_pairs))
+
+
+
+
+#===================================
+# Drop analytics (rollup-backed)
+#====================================
+DROP_ANALYTICS_DEFAULT_DAYS = 30
+DROP_ANALYTICS_MAX_DAYS = 366
+
+
+class DropAnalyticsView(APIView):
+    """
+    Daily drop statistics per extension, read only from the DailyDropStat rollup
+    (a few rows per day - never scans the name table). See api/rollups.py.
+    - ?start=YYYY-MM-DD&end=YYYY-MM-DD : drop date range (default: last 30 days, max 366 days)
+    - ?extension=ai                     : one extension only
+    - ?domain_list=deleted              : one list only (default: all lists summed)
+    """
+    replica_reads = True
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def _parse_date(raw):
+        try:
+            return parse_date(raw)
+        except ValueError:  # Well-formed but impossible dates (2025-02-30)
+            return None
+
+    def get(self, request):
+        end_param = request.query_params.get("end")
+        start_param = request.query_params.get("start")
+        end = self._parse_date(end_param) if end_param else now().date()
+        if start_param:
+            start = self._parse_date(start_param)
+        else:
+            start = end - timedelta(days=DROP_ANALYTICS_DEFAULT_DAYS - 1) if end else None
+        if start is None or end is None:
+            return Response(
+                {"detail": "Invalid date — 'start' and 'end' must be YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end or (end - start).days >= DROP_ANALYTICS_MAX_DAYS:
+            return Response(
+                {"detail": f"'start' must be on or before 'end', at most {DROP_ANALYTICS_MAX_DAYS} days apart."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = drop_statistics(
+            start, end,
+            extension=request.query_params.get("extension"),
+            domain_list=request.query_params.get("domain_list"),
+        )
+        return Response({"start": start, "end": end, "results": results})
 
 
 
@@ -951,6 +1272,7 @@ class UseCaseListView(generics.ListAPIView):
 # Use case detail view
 #====================================
 class UseCaseDetailView(generics.RetrieveAPIView):
+    replica_reads = True
     queryset = (
         UseCase.objects
         .select_related("domain_name", "category")
@@ -967,42 +1289,51 @@ class UseCaseDetailView(generics.RetrieveAPIView):
 #===================================
 # Idea of the day
 #====================================
+@method_decorator(data_version_condition(_idea_of_the_day_versions), name='get')
 class IdeaOfTheDayView(APIView):
     """
     Return today's idea-of-the-day entries:
     - pending_delete = today's entry
     - deleted = yesterday's entry (since that's when it was pending_delete)
+    Sends ETag/Last-Modified; If-None-Match / If-Modified-Since polls get a 304 without touching the DB.
     """
+    replica_reads = True
 
-    def get(self, request):
-        # Parse ?date=YYYY-MM-DD if provided, else use today
-        date_str = request.query_params.get("date")
-        if date_str:
-            try:
-                drop_date = timezone.datetime.strptime(date_str, "%Y-%m-%d").date()
-            except ValueError:
-                return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
-        else:
-            drop_date = timezone.now().date()
-
+    @staticmethod
+    def entry_querysets(drop_date):
+        """(today's, yesterday's) entry querysets; shared with the async view (api/async_views.py)."""
         # Yesterday's date
         yesterday = drop_date - timezone.timedelta(days=1)
 
-        # Fetch today's pending_delete
-        today_obj = (
+        # Today's pending_delete
+        today_qs = (
             IdeaOfTheDay.objects
             .filter(drop_date=drop_date, domain_list="deleting_today") # Use deleting_today for prod
             .select_related("use_case")
-            .first()
         )
 
-        # Fetch yesterday's deleted
-        yesterday_obj = (
+        # Yesterday's deleted
+        yesterday_qs = (
             IdeaOfTheDay.objects
             .filter(drop_date=yesterday, domain_list="pending_delete") # Use deleted for prod
             .select_related("use_case")
-            .first()
         )
+        return today_qs, yesterday_qs
+
+    def get(self, request):
+        # Parse ?date=YYYY-MM-DD if provided, else use today
+        date_str = request.query_params.get("date")
+        if date_str:
+            try:
+                drop_date = timezone.datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
+        else:
+            drop_date = timezone.now().date()
+
+        today_qs, yesterday_qs = self.entry_querysets(drop_date)
+        today_obj = today_qs.first()
+        yesterday_obj = yesterday_qs.first()
 
         pending_delete_data = IdeaOfTheDaySerializer(today_obj).data if today_obj else None
         deleted_data = IdeaOfTheDaySerializer(yesterday_obj).data if yesterday_obj else None
@@ -1019,11 +1350,14 @@ class IdeaOfTheDayView(APIView):
 #===================================
 # IdeaOfTheDay List View
 #====================================
+@method_decorator(data_version_condition(_idea_of_the_day_list_versions), name='get')
 class IdeaOfTheDayListView(generics.ListAPIView):
     """
     Paginated, filterable list of all IdeaOfTheDay entries.
     Useful for history, analytics, browsing.
+    Sends ETag/Last-Modified (304 on unchanged polls).
     """
+    replica_reads = True
     queryset = IdeaOfTheDay.objects.select_related("use_case").order_by("-drop_date")
     serializer_class = IdeaOfTheDayListSerializer
     pagination_class = StandardResultsSetPagination
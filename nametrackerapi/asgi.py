@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nametrackerapi.settings')
+os.environ.setdefault('DJANGO_ASGI', 'true')  # Async read endpoints, see ASGI_DEPLOYMENT in settings.py
 
 application = get_asgi_application()
@@ -0,0 +1,15 @@
+"""
+URL configuration for the ASGI deployment (nametrackerapi/asgi.py).
+
+Same routes as nametrackerapi/urls.py, except that /api/ is served by api/async_urls.py,
+which swaps the hot read endpoints for their async versions.
+"""
+from django.urls import path, include
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+
+urlpatterns = [
+    path('api/', include('api.async_urls')) if str(pattern.pattern) == 'api/' else pattern
+    for pattern in wsgi_urlpatterns
+]
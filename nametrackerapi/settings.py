@@ -156,11 +156,22 @@ REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [],
     'DEFAULT_THROTTLE_RATES': {
         'post_request': '5/day',  # Allow 5 POST requests per day for public submissions
+        # 'plan_quota' has no entry: its rate is the user's PlanModel.api_quota per PLAN_QUOTA_PERIOD
         # 'anon': '10000/day',  # basically unlimited
     },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
+    # orjson-backed JSON in/out (see api/renderers.py for the few differences from DRF's JSONRenderer).
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
  
 
@@ -175,6 +186,31 @@ APPEND_SLASH = False
 # For is_top_rated flag on the Name model
 TOP_RATED_THRESHOLD = 8
 
+# Search result cache lifetime (seconds). Kept short because name statuses change during drop windows;
+# loader inserts and archival invalidate it immediately by bumping the search version.
+SEARCH_CACHE_TTL = 60 * 2
+
+# Threads per process for the federated /search endpoint (each pool thread holds its own DB connection)
+FEDERATED_SEARCH_WORKERS = int(os.getenv("FEDERATED_SEARCH_WORKERS", 4))
+
+# Max domains per POST /names/lookup request
+NAME_LOOKUP_MAX_DOMAINS = 5000
+
+# Max names (save + unsave) per POST /domains/saved/bulk request
+SAVED_NAMES_BULK_MAX = 500
+
+# Bias featured use cases towards higher-scoring names (uniform random when False)
+FEATURED_WEIGHT_BY_SCORE = os.getenv("FEATURED_WEIGHT_BY_SCORE", "").lower() == "true"
+
+# How often (seconds) each process re-checks the Redis version of cached reference tables
+# (categories, target markets, tags, plans, extension rules). Lookup misses always re-check.
+REFERENCE_CACHE_CHECK_INTERVAL = 5
+
+# Paginated listings count exactly up to this many rows; above it the planner's estimate is used
+# (cached per query for APPROXIMATE_COUNT_TTL seconds) and flagged with count_is_approximate
+EXACT_COUNT_THRESHOLD = 5000
+APPROXIMATE_COUNT_TTL = 60 * 10
+
 
 
 #Site ID
@@ -214,11 +250,20 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.db_routers.ReplicaRoutingMiddleware',  # Read replica routing for views with replica_reads = True
 ]
 
+# ASGI deployment (nametrackerapi/asgi.py sets DJANGO_ASGI=true): the hot read endpoints are
+# served by their async versions (api/async_views.py, routed by nametrackerapi/asgi_urls.py)
+ASGI_DEPLOYMENT = os.getenv('DJANGO_ASGI', '').lower() == 'true'
+# WhiteNoise stays in the chain there too - it's the only thing serving static files (admin).
+# It is sync-only, so Django adapts around it with a thread hop per request; measured in-process
+# on the async dashboard endpoint (304 path) that costs ~0.03-0.25 ms per request and 3-7% of
+# throughput at 50 concurrent requests.
+
 
 
-ROOT_URLCONF = 'nametrackerapi.urls'
+ROOT_URLCONF = 'nametrackerapi.asgi_urls' if ASGI_DEPLOYMENT else 'nametrackerapi.urls'
 
 TEMPLATES = [
     {
@@ -260,6 +305,23 @@ else:
         }
 }
 
+# Read replicas (comma-separated database URLs, same format as DATABASE_URL). Registered as
+# replica_1, replica_2, ... and used by api.db_routers for read-only views; empty = primary only.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(filter(None, (url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(","))), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = dj_database_url.parse(replica_url, conn_max_age=600, ssl_require=bool(os.getenv("DATABASE_URL")))
+    DATABASES[alias].setdefault("OPTIONS", {})["connect_timeout"] = 3  # A dead replica must not stall requests
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["api.db_routers.ReplicaRouter"]
+
+# Replicas further behind than this (seconds) are skipped; lag is re-checked per process every
+# REPLICA_LAG_CHECK_INTERVAL seconds
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_LAG_CHECK_INTERVAL = 2
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -372,6 +434,20 @@ CLERK_AUDIENCE=os.getenv("CLERK_AUDIENCE") or None
 CLERK_API_BASE_URL = os.getenv("CLERK_API_BASE_URL")
 CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY")
 
+# Clerk token verification caches (api/authentication.py)
+CLERK_JWKS_CACHE_TTL = 60 * 60          # Signing keys are re-read after this; unknown kids refresh immediately
+CLERK_JWKS_MIN_REFETCH_INTERVAL = 30    # Per process: tokens with junk kids can't make us hammer Clerk's JWKS URL
+CLERK_TOKEN_CACHE_TTL = 60              # Verified claims are reused up to this long (never past the token's exp)
+CLERK_TOKEN_CACHE_MAX_ENTRIES = 10000   # Per process
+APP_USER_CACHE_TTL = 60 * 60            # Cached AppUser per clerk_id (dropped on every AppUser save)
+
+# Throttling (api/throttles.py): sliding windows kept in the "default" Redis
+PLAN_QUOTA_PERIOD = "day"               # PlanModel.api_quota is requests per this (second/minute/hour/day)
+
+# Metering (api/metering.py)
+SUBSCRIPTION_CACHE_TTL = 60 * 60        # Cached Subscription row per user (dropped on every Subscription save)
+API_USAGE_COUNTER_TTL = 60 * 60 * 24 * 3  # Redis day counters outlive the day by this much for late flushes
+
 
 
 # Upload directory